@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query
 
-from app.services.data.track2 import ensure_game_id_exists, list_game_ids
+from app.services.data.track2 import describe_game, list_game_ids
 
 router = APIRouter()
 
@@ -17,5 +17,4 @@ async def games(recommend: bool = Query(default=False)) -> dict:
 
 @router.get("/games/{game_id}")
 async def game_exists(game_id: str) -> dict:
-    ensure_game_id_exists(game_id)
-    return {"game_id": game_id, "exists": True}
+    return describe_game(game_id)
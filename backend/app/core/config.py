@@ -24,6 +24,14 @@ class Settings(BaseSettings):
     frontend_origin: str = Field(default="http://localhost:3000")
     events_data_path: str = Field(default=str(_BASE_PATH / "00_data" / "Track2" / "raw_data.csv"))
     match_info_path: str = Field(default=str(_BASE_PATH / "00_data" / "Track2" / "match_info.csv"))
+    event_cache_path: str = Field(
+        default=str(_BASE_PATH / "storage" / "event_cache"),
+        description="경기별 컬럼형 이벤트 캐시(.npz) 디렉터리",
+    )
+    game_store_max_idle_games: int = Field(
+        default=4,
+        description="참조하는 세션이 없어도 메모리에 유지할 최대 경기 수 (LRU)",
+    )
     demo_mode: bool = Field(default=True)
     # ML 모델 설정
     enable_will_have_shot: bool = Field(default=True, description="will_have_shot ML 모델 활성화 여부")
@@ -35,6 +43,14 @@ class Settings(BaseSettings):
         default=None,
         description="will_have_shot 알림 threshold (None이면 모델 파일에서 읽음)",
     )
+    will_have_shot_batch_wait_ms: float = Field(
+        default=5.0,
+        description="세션들의 will_have_shot 예측 요청을 한 배치로 모으는 최대 대기 시간 (ms)",
+    )
+    will_have_shot_batch_max_rows: int = Field(
+        default=64,
+        description="will_have_shot 예측 배치 최대 행 수 (채워지면 대기 없이 바로 예측)",
+    )
 
     class Config:
         env_file = ".env"
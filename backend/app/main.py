@@ -9,7 +9,9 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import sessions, track2, uploads, ws
 from app.core.config import get_settings
+from app.services.alerts.inference import get_inference_service
 from app.services.alerts.will_have_shot import get_will_have_shot_predictor
+from app.services.data.game_store import get_game_store
 from app.services.data.track2 import validate_track2_data
 
 settings = get_settings()
@@ -77,6 +79,7 @@ async def health() -> Dict[str, Any]:
         "loaded": predictor.model is not None,
         "model_path": predictor.model_path,
         "error": predictor.error,
+        "inference": get_inference_service().stats(),
     }
     return {
         "status": "ok" if track2_error is None else "degraded",
@@ -84,6 +87,7 @@ async def health() -> Dict[str, Any]:
         "track2_error": track2_error,
         "demo_mode": settings.demo_mode,
         "ml": ml_status,
+        "game_store": get_game_store().stats(),
     }
 
 
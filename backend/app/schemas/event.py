@@ -1,5 +1,16 @@
-from dataclasses import dataclass
-from typing import Optional
+import hashlib
+from dataclasses import dataclass, field, fields, replace
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+INT_MISSING = -1
+
+FLOAT32_COLUMNS = ("start_x", "start_y", "end_x", "end_y", "dx", "dy")
+INT32_COLUMNS = ("game_episode", "action_id", "team_id", "player_id", "period_id")
+CATEGORICAL_COLUMNS = ("type_name", "result_name")
+# 컬럼 딕셔너리에서 extras 컬럼을 구분하는 접두어
+EXTRA_PREFIX = "extra_"
 
 
 @dataclass
@@ -21,3 +32,186 @@ class EventRecord:
     dx: Optional[float] = None
     dy: Optional[float] = None
 
+
+@dataclass(frozen=True)
+class EventBatch:
+    """이벤트 묶음의 컬럼형(struct-of-arrays) 표현
+
+    - time_seconds: float64 (시간순 정렬)
+    - 좌표/dx/dy: float32, 결측은 NaN
+    - id 계열: int32, 결측은 INT_MISSING
+    - type_name/result_name: int16 코드 + vocab
+    - extras: 선택 컬럼 (StatsBomb 압박 피처 등, 이름 → 배열)
+
+    slice/time_range는 배열 뷰만 만들어 복사 없이 부분 구간을 돌려준다.
+    """
+
+    game_id: str
+    time_seconds: np.ndarray
+    start_x: np.ndarray
+    start_y: np.ndarray
+    end_x: np.ndarray
+    end_y: np.ndarray
+    dx: np.ndarray
+    dy: np.ndarray
+    game_episode: np.ndarray
+    action_id: np.ndarray
+    team_id: np.ndarray
+    player_id: np.ndarray
+    period_id: np.ndarray
+    type_codes: np.ndarray
+    type_vocab: np.ndarray
+    result_codes: np.ndarray
+    result_vocab: np.ndarray
+    extras: Mapping[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_columns(cls, game_id: str, columns: Mapping[str, np.ndarray]) -> "EventBatch":
+        """event_cache 형식의 컬럼 딕셔너리로 생성 (배열 공유, 복사 없음)"""
+        return cls(
+            game_id=game_id,
+            time_seconds=columns["time_seconds"],
+            **{col: columns[col] for col in FLOAT32_COLUMNS + INT32_COLUMNS},
+            type_codes=columns["type_name_codes"],
+            type_vocab=columns["type_name_vocab"],
+            result_codes=columns["result_name_codes"],
+            result_vocab=columns["result_name_vocab"],
+            extras={
+                key[len(EXTRA_PREFIX):]: values for key, values in columns.items() if key.startswith(EXTRA_PREFIX)
+            },
+        )
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """from_columns의 역변환 (extras는 EXTRA_PREFIX를 붙여 함께 담는다)"""
+        columns: Dict[str, np.ndarray] = {"time_seconds": self.time_seconds}
+        for col in FLOAT32_COLUMNS + INT32_COLUMNS:
+            columns[col] = getattr(self, col)
+        columns["type_name_codes"] = self.type_codes
+        columns["type_name_vocab"] = self.type_vocab
+        columns["result_name_codes"] = self.result_codes
+        columns["result_name_vocab"] = self.result_vocab
+        for name, values in self.extras.items():
+            columns[f"{EXTRA_PREFIX}{name}"] = values
+        return columns
+
+    def digest(self) -> str:
+        """game_id와 모든 컬럼(dtype·값) 내용의 해시 (캐시 키용)"""
+        h = hashlib.sha1(self.game_id.encode("utf-8"))
+        for name, values in sorted(self.to_columns().items()):
+            values = np.ascontiguousarray(values)
+            h.update(f"{name}:{values.dtype.str}:{values.shape}".encode("utf-8"))
+            h.update(values.tobytes())
+        return h.hexdigest()
+
+    @classmethod
+    def from_records(cls, records: Sequence[EventRecord], game_id: str = "") -> "EventBatch":
+        game_id = game_id or (records[0].game_id if records else "")
+        floats = {
+            col: np.asarray(
+                [np.nan if getattr(ev, col) is None else getattr(ev, col) for ev in records], dtype=np.float32
+            )
+            for col in FLOAT32_COLUMNS
+        }
+        ints = {
+            col: np.asarray(
+                [INT_MISSING if getattr(ev, col) is None else getattr(ev, col) for ev in records], dtype=np.int32
+            )
+            for col in INT32_COLUMNS
+        }
+        type_vocab, type_codes = _encode([ev.type_name or "" for ev in records])
+        result_vocab, result_codes = _encode([ev.result_name or "" for ev in records])
+        return cls(
+            game_id=game_id,
+            time_seconds=np.asarray([ev.time_seconds for ev in records], dtype=np.float64),
+            **floats,
+            **ints,
+            type_codes=type_codes,
+            type_vocab=type_vocab,
+            result_codes=result_codes,
+            result_vocab=result_vocab,
+        )
+
+    @classmethod
+    def empty(cls, game_id: str = "") -> "EventBatch":
+        return cls.from_records([], game_id=game_id)
+
+    def __len__(self) -> int:
+        return len(self.time_seconds)
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        return (self.record(i) for i in range(len(self)))
+
+    def slice(self, start: int, stop: int) -> "EventBatch":
+        """행 [start, stop) 구간 뷰"""
+        return self._select(np.s_[start:stop])
+
+    def take(self, indices: np.ndarray) -> "EventBatch":
+        """지정 행만 골라낸 사본 (재정렬 등에 사용)"""
+        return self._select(np.asarray(indices, dtype=np.intp))
+
+    def _select(self, rows) -> "EventBatch":
+        return replace(
+            self,
+            **{
+                f.name: getattr(self, f.name)[rows]
+                for f in fields(self)
+                if f.name not in ("game_id", "type_vocab", "result_vocab", "extras")
+            },
+            extras={name: values[rows] for name, values in self.extras.items()},
+        )
+
+    def time_range(self, start_ts: float, end_ts: float) -> "EventBatch":
+        """start_ts <= time_seconds <= end_ts 구간 뷰 (정렬된 시간 기준 이진 탐색)"""
+        lo = int(np.searchsorted(self.time_seconds, start_ts, side="left"))
+        hi = int(np.searchsorted(self.time_seconds, end_ts, side="right"))
+        return self.slice(lo, max(lo, hi))
+
+    def record(self, idx: int) -> EventRecord:
+        values: Dict[str, Optional[float]] = {}
+        for col in FLOAT32_COLUMNS:
+            value = float(getattr(self, col)[idx])
+            values[col] = None if value != value else value
+        for col in INT32_COLUMNS:
+            value = int(getattr(self, col)[idx])
+            values[col] = None if value == INT_MISSING else value
+        return EventRecord(
+            game_id=self.game_id,
+            time_seconds=float(self.time_seconds[idx]),
+            type_name=str(self.type_vocab[self.type_codes[idx]]),
+            result_name=str(self.result_vocab[self.result_codes[idx]]),
+            **values,
+        )
+
+    def records(self) -> List[EventRecord]:
+        return list(self)
+
+    @property
+    def type_names(self) -> np.ndarray:
+        return self.type_vocab[self.type_codes]
+
+    @property
+    def result_names(self) -> np.ndarray:
+        return self.result_vocab[self.result_codes]
+
+    def type_mask(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """vocab 단위로 predicate를 평가한 뒤 코드로 펼친 bool 마스크"""
+        return _vocab_mask(self.type_vocab, self.type_codes, predicate)
+
+    def result_mask(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        return _vocab_mask(self.result_vocab, self.result_codes, predicate)
+
+    def team_float(self) -> np.ndarray:
+        """team_id를 결측 NaN의 float64로 (pandas diff 규칙과 맞추기 위함)"""
+        return np.where(self.team_id == INT_MISSING, np.nan, self.team_id.astype(np.float64))
+
+
+def _encode(labels: Sequence[str]):
+    vocab, codes = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    return vocab, codes.astype(np.int16)
+
+
+def _vocab_mask(vocab: np.ndarray, codes: np.ndarray, predicate: Callable[[str], bool]) -> np.ndarray:
+    matches = np.fromiter((bool(predicate(str(v))) for v in vocab), dtype=bool, count=len(vocab))
+    if not len(codes):
+        return np.zeros(0, dtype=bool)
+    return matches[codes]
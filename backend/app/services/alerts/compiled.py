@@ -0,0 +1,179 @@
+"""
+will_have_shot 모델의 배열 기반 추론
+
+학습 스크립트가 scikit-learn 모델(StandardScaler/KBinsDiscretizer + LogisticRegression/
+SGDClassifier/HistGradientBoostingClassifier)을 평평한 NumPy 배열로 내보내 .npz로 저장하면,
+서버는 scikit-learn 없이 이 모듈만으로 같은 확률을 계산한다.
+
+트리는 모든 노드를 한 배열에 이어 붙이고 leaf의 자식을 자기 자신으로 둔다.
+한두 행(세션 tick)은 모든 노드의 다음 노드를 한 번에 구한 뒤 포인터를 두 배씩 건너뛰어
+log2(깊이)번의 gather로 leaf에 닿고, 큰 배치는 깊이만큼 트리별 현재 노드를 한 칸씩 내린다.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+import numpy as np
+
+# 배열 구성이나 해석 방식이 바뀌면 올린다
+COMPILED_FORMAT_VERSION = 1
+# 행 수 × 노드 수가 이 이하면 모든 노드를 한꺼번에 평가하는 포인터 점프, 넘으면 깊이별 순회
+JUMP_BUDGET = 1 << 18
+
+
+def _sigmoid(raw: np.ndarray) -> np.ndarray:
+    # scipy.special.expit과 같은 식 (큰 음수에서 exp가 inf가 되면 0)
+    with np.errstate(over="ignore"):
+        return 1.0 / (1.0 + np.exp(-raw))
+
+
+def _export_transform(scaler) -> Dict[str, np.ndarray]:
+    if scaler is None:
+        return {"transform": np.array("none")}
+    if hasattr(scaler, "bin_edges_"):
+        # KBinsDiscretizer(encode="ordinal"): 피처별 내부 경계 개수가 달라 +inf로 채운다
+        inner = [np.asarray(edges[1:-1], dtype=np.float64) for edges in scaler.bin_edges_]
+        edges = np.full((len(inner), max(len(e) for e in inner)), np.inf)
+        for j, e in enumerate(inner):
+            edges[j, : len(e)] = e
+        return {"transform": np.array("bins"), "bin_edges": edges}
+    if hasattr(scaler, "mean_") and hasattr(scaler, "scale_"):
+        mean = scaler.mean_ if scaler.with_mean else np.zeros_like(scaler.scale_)
+        scale = scaler.scale_ if scaler.with_std else np.ones_like(scaler.mean_)
+        return {"transform": np.array("standard"), "mean": np.asarray(mean, np.float64), "scale": np.asarray(scale, np.float64)}
+    raise ValueError(f"Unsupported transform: {type(scaler).__name__}")
+
+
+def _export_trees(model) -> Dict[str, np.ndarray]:
+    """HistGradientBoostingClassifier(이진)의 predictor 노드 → 이어 붙인 노드 배열"""
+    if model.n_trees_per_iteration_ != 1:
+        raise ValueError("Only binary HistGradientBoostingClassifier is supported")
+    nodes = [predictors[0].nodes for predictors in model._predictors]
+    if any(tree["is_categorical"].any() for tree in nodes):
+        raise ValueError("Categorical splits are not supported")
+
+    offsets = np.cumsum([0] + [len(tree) for tree in nodes[:-1]])
+    flat = np.concatenate(nodes)
+    own = np.arange(len(flat))
+    leaf = flat["is_leaf"].astype(bool)
+    shift = np.repeat(offsets, [len(tree) for tree in nodes])
+    return {
+        "kind": np.array("trees"),
+        "roots": offsets.astype(np.int64),
+        "feature": np.where(leaf, 0, flat["feature_idx"]).astype(np.int64),
+        "threshold": flat["num_threshold"].astype(np.float64),
+        "missing_left": flat["missing_go_to_left"].astype(bool),
+        "left": np.where(leaf, own, flat["left"] + shift).astype(np.int64),
+        "right": np.where(leaf, own, flat["right"] + shift).astype(np.int64),
+        "value": np.where(leaf, flat["value"], 0.0).astype(np.float64),
+        "depth": np.array(int(flat["depth"].max()) if len(flat) else 0),
+        "baseline": np.asarray(model._baseline_prediction, np.float64).ravel(),
+    }
+
+
+def export_model(model, scaler=None) -> Dict[str, np.ndarray]:
+    """학습된 scikit-learn 모델(+scaler)을 CompiledModel 배열로 (지원하지 않으면 ValueError)
+
+    scikit-learn을 import하지 않고 학습된 속성만 읽는다.
+    """
+    if hasattr(model, "_predictors") and hasattr(model, "_baseline_prediction"):
+        arrays = _export_trees(model)
+    elif hasattr(model, "coef_") and hasattr(model, "intercept_") and np.shape(model.coef_)[0] == 1:
+        if getattr(model, "loss", "log_loss") != "log_loss":
+            raise ValueError(f"Unsupported loss for probabilities: {model.loss}")
+        arrays = {
+            "kind": np.array("linear"),
+            "coef": np.asarray(model.coef_, np.float64).ravel(),
+            "intercept": np.asarray(model.intercept_, np.float64).ravel(),
+        }
+    else:
+        raise ValueError(f"Unsupported model: {type(model).__name__}")
+    return {**arrays, **_export_transform(scaler), "version": np.array(COMPILED_FORMAT_VERSION)}
+
+
+def save_compiled(path: Union[str, Path], arrays: Mapping[str, np.ndarray], meta: Optional[dict] = None) -> None:
+    """배열 + 메타데이터(JSON)를 .npz로 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays, meta=np.array(json.dumps(meta or {})))
+    os.replace(tmp_path, path)
+
+
+class CompiledModel:
+    """export_model 배열로 predict_proba를 계산하는 순수 NumPy 평가기"""
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]) -> None:
+        version = int(arrays["version"])
+        if version != COMPILED_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model version: {version}")
+        self.kind = str(arrays["kind"])
+        self.transform_kind = str(arrays["transform"])
+        self.arrays = {name: np.asarray(value) for name, value in arrays.items()}
+        self.meta = json.loads(str(arrays["meta"])) if "meta" in arrays else {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CompiledModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        if self.transform_kind == "standard":
+            return (X - a["mean"]) / a["scale"]
+        if self.transform_kind == "bins":
+            # KBinsDiscretizer.transform: 피처별 searchsorted(inner_edges, x, side="right")
+            return (a["bin_edges"] <= X[:, :, None]).sum(axis=2).astype(np.float64)
+        return X
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        X = self.transform(np.atleast_2d(np.asarray(X, dtype=np.float64)))
+        if self.kind == "linear":
+            return X @ a["coef"] + a["intercept"][0]
+
+        if len(X) * len(a["feature"]) <= JUMP_BUDGET:
+            leaves = self._jump_leaves(X)
+        else:
+            leaves = self._walk_leaves(X)
+        return a["baseline"][0] + a["value"][leaves].sum(axis=1)
+
+    def _next_nodes(self, X: np.ndarray, node: np.ndarray) -> np.ndarray:
+        """행마다 node에서 한 단계 내려간 노드 (leaf는 그대로, node는 (행, k))"""
+        a = self.arrays
+        # take_along_axis 대신 평평한 인덱스로 gather (한 행 호출에서 오버헤드가 크다)
+        x = X.ravel()[np.arange(0, X.size, X.shape[1])[:, None] + a["feature"][node]]
+        go_right = x > a["threshold"][node]
+        missing = np.isnan(x)
+        if missing.any():
+            # NaN은 비교가 항상 False라서 missing_left가 아닌 노드에서만 오른쪽으로 보낸다
+            go_right |= missing & ~a["missing_left"][node]
+        return np.where(go_right, a["right"][node], a["left"][node])
+
+    def _jump_leaves(self, X: np.ndarray) -> np.ndarray:
+        """작은 입력: 모든 노드의 다음 노드를 한 번에 구하고 포인터를 두 배씩 건너뛴다 (log2 깊이 번)"""
+        a = self.arrays
+        n_nodes = len(a["feature"])
+        step = self._next_nodes(X, np.arange(n_nodes)[None, :])
+        row_offsets = np.arange(0, step.size, n_nodes)[:, None]
+        for _ in range(int(a["depth"]).bit_length()):
+            step = step.ravel()[row_offsets + step]
+        return step[:, a["roots"]]
+
+    def _walk_leaves(self, X: np.ndarray) -> np.ndarray:
+        """큰 입력: (행, 트리)별 현재 노드를 깊이만큼 한 칸씩 내린다 (leaf는 자기 자신을 가리킴)"""
+        a = self.arrays
+        node = np.broadcast_to(a["roots"], (len(X), len(a["roots"])))
+        for _ in range(int(a["depth"])):
+            node = self._next_nodes(X, node)
+        return node
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """(n, 2) 확률 (scikit-learn predict_proba와 같은 모양)"""
+        positive = _sigmoid(self.decision_function(X))
+        proba = np.empty((len(positive), 2))
+        proba[:, 1] = positive
+        proba[:, 0] = 1.0 - positive
+        return proba
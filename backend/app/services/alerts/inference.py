@@ -0,0 +1,119 @@
+"""
+세션 공용 will_have_shot 추론 서비스
+
+세션마다 이벤트 루프에서 한 행씩 predict_proba를 부르는 대신, submit()으로 들어온
+요청을 짧은 시간(`will_have_shot_batch_wait_ms`) 또는 최대 행 수
+(`will_have_shot_batch_max_rows`)까지 모아 worker thread에서 한 번에 예측하고
+결과를 각 호출자에게 돌려준다. 배치가 도는 동안 들어온 요청은 다음 배치로 모인다.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.alerts.will_have_shot import WillHaveShotPredictor, get_will_have_shot_predictor
+
+_Request = Tuple[np.ndarray, asyncio.Future]
+
+
+class InferenceService:
+    def __init__(
+        self,
+        predictor: WillHaveShotPredictor,
+        max_wait_ms: float = 5.0,
+        max_batch_rows: int = 64,
+    ) -> None:
+        self.predictor = predictor
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_rows = max(1, max_batch_rows)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batches = 0
+        self._rows = 0
+        self._last_batch_rows = 0
+        self._max_batch_rows_seen = 0
+
+    async def submit(self, features: np.ndarray) -> Optional[float]:
+        """(1, n) 피처 벡터 하나의 확률 (모델 비활성/예측 실패 시 None)"""
+        if not self.predictor.is_active:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        self._ensure_worker().put_nowait((features, future))
+        return await future
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # 큐와 worker는 현재 이벤트 루프에 묶인다 (루프가 바뀌면 새로 만든다)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _collect(self, queue: asyncio.Queue) -> List[_Request]:
+        """첫 요청을 기다린 뒤 max_wait 또는 max_batch_rows까지 모은다"""
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch_rows:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = await self._collect(queue)
+            requests = [(features, future) for features, future in batch if not future.done()]
+            if not requests:
+                continue
+            try:
+                matrix = np.vstack([features for features, _ in requests])
+                proba = await asyncio.to_thread(self.predictor.predict_batch, matrix)
+            except Exception as e:  # 배치 하나가 실패해도 worker는 계속 돈다
+                print(f"InferenceService: Batch prediction error: {e}")
+                proba = None
+            self._record(len(requests))
+            for i, (_, future) in enumerate(requests):
+                if not future.done():
+                    future.set_result(None if proba is None else float(proba[i]))
+
+    def _record(self, rows: int) -> None:
+        self._batches += 1
+        self._rows += rows
+        self._last_batch_rows = rows
+        self._max_batch_rows_seen = max(self._max_batch_rows_seen, rows)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._batches,
+            "rows": self._rows,
+            "mean_batch_rows": self._rows / self._batches if self._batches else 0.0,
+            "last_batch_rows": self._last_batch_rows,
+            "max_batch_rows": self._max_batch_rows_seen,
+        }
+
+
+_INFERENCE_SERVICE: InferenceService | None = None
+
+
+def get_inference_service() -> InferenceService:
+    global _INFERENCE_SERVICE
+    if _INFERENCE_SERVICE is None:
+        settings = get_settings()
+        _INFERENCE_SERVICE = InferenceService(
+            get_will_have_shot_predictor(),
+            max_wait_ms=settings.will_have_shot_batch_wait_ms,
+            max_batch_rows=settings.will_have_shot_batch_max_rows,
+        )
+    return _INFERENCE_SERVICE
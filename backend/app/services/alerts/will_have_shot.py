@@ -3,6 +3,9 @@ will_have_shot 예측기 모듈
 
 서버 시작 시 모델 로드, 예측 수행
 모델 파일이 없으면 비활성 상태로 동작 (예외 발생 안 함)
+
+학습 스크립트가 모델 옆에 저장한 배열 모델(.npz, app.services.alerts.compiled)이 있으면
+그쪽을 우선 쓴다: scikit-learn을 import하지 않고 한 행 예측의 호출 오버헤드도 작다.
 """
 
 import os
@@ -13,6 +16,8 @@ import joblib
 import numpy as np
 
 from app.core.config import get_settings
+from app.services.alerts.compiled import CompiledModel
+from app.services.features.kernel import feature_vector
 
 
 class WillHaveShotPredictor:
@@ -50,15 +55,22 @@ class WillHaveShotPredictor:
                 )
             self.model_path = model_path
             
-            if not os.path.exists(model_path):
+            compiled_path = _compiled_path(model_path)
+            if compiled_path is not None:
+                # 배열 모델: scaler까지 포함되어 있어 joblib/scikit-learn이 필요 없다
+                self.model = CompiledModel.load(compiled_path)
+                self.scaler = None
+                model_data = self.model.meta
+                model_path = self.model_path = str(compiled_path)
+            elif not os.path.exists(model_path):
                 self.error = f"Model file not found at {model_path}"
                 print(f"WillHaveShotPredictor: {self.error}, predictor disabled")
                 self.is_active = False
                 return
-            
-            model_data = joblib.load(model_path)
-            self.model = model_data["model"]
-            self.scaler = model_data.get("scaler")
+            else:
+                model_data = joblib.load(model_path)
+                self.model = model_data["model"]
+                self.scaler = model_data.get("scaler")
             self.feature_columns = model_data.get("feature_columns", [])
             
             # threshold 결정: 설정 > 모델 파일 > 기본값
@@ -88,22 +100,45 @@ class WillHaveShotPredictor:
         if not self.is_active or self.model is None:
             return None
         
-        try:
-            # 피처 벡터 생성 (순서 중요)
-            feature_vector = np.array([
-                features.get(col, 0.0) for col in self.feature_columns
-            ]).reshape(1, -1)
+        # 피처 벡터 생성 (순서 중요)
+        return self.predict_vector(feature_vector(features, self.feature_columns))
+    
+    def predict_vector(self, features: np.ndarray) -> Optional[float]:
+        """
+        feature_columns 순서로 이미 정렬된 (1, n) 벡터로 예측
+        
+        Args:
+            features: 피처 벡터
+            
+        Returns:
+            확률 (0~1) 또는 None (모델 비활성 시)
+        """
+        proba = self.predict_batch(features)
+        return None if proba is None else float(proba[0])
+    
+    def predict_batch(self, features: np.ndarray) -> Optional[np.ndarray]:
+        """
+        (rows, n) 행렬을 한 번의 predict_proba로 예측 (여러 세션의 요청을 모은 배치)
+        
+        Args:
+            features: feature_columns 순서의 피처 행렬
             
+        Returns:
+            행별 확률 배열 또는 None (모델 비활성/예측 실패 시)
+        """
+        if not self.is_active or self.model is None:
+            return None
+        
+        try:
             # 결측치 처리
-            feature_vector = np.nan_to_num(feature_vector, nan=0.0, posinf=0.0, neginf=0.0)
+            matrix = np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
             
             # 표준화
             if self.scaler:
-                feature_vector = self.scaler.transform(feature_vector)
+                matrix = self.scaler.transform(matrix)
             
             # 예측
-            proba = self.model.predict_proba(feature_vector)[0, 1]
-            return float(proba)
+            return self.model.predict_proba(matrix)[:, 1]
         except Exception as e:
             print(f"WillHaveShotPredictor: Prediction error: {e}")
             return None
@@ -123,6 +158,18 @@ class WillHaveShotPredictor:
         return proba >= self.threshold
 
 
+def _compiled_path(model_path: str) -> Optional[Path]:
+    """모델 경로 자체가 .npz이거나, joblib 옆에 그보다 오래되지 않은 .npz가 있으면 그 경로"""
+    path = Path(model_path)
+    compiled = path if path.suffix == ".npz" else path.with_suffix(".npz")
+    if not compiled.exists():
+        return None
+    # joblib만 새로 학습된 경우 이전 모델의 .npz를 쓰지 않는다
+    if compiled != path and path.exists() and compiled.stat().st_mtime_ns < path.stat().st_mtime_ns:
+        return None
+    return compiled
+
+
 # 싱글톤 인스턴스
 _predictor: Optional[WillHaveShotPredictor] = None
 
@@ -0,0 +1,181 @@
+"""
+경기별 컬럼형 이벤트 캐시
+
+raw_data.csv를 한 번만 스캔해 game_id별 `.npz` 파일로 나눠 저장한다.
+- 수치 컬럼: time_seconds(float64), 좌표/dx/dy(float32, 결측은 NaN)
+- 정수 컬럼: id 계열(int32, 결측은 INT_MISSING)
+- type_name/result_name: 사전 인코딩(codes + vocab)
+
+캐시가 없는 경기는 game_index의 바이트 구간만 읽어 그때그때 만들고,
+원본 CSV의 mtime/size가 바뀌면 해당 경기 캐시를 다시 만든다.
+"""
+
+import csv
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.schemas.event import CATEGORICAL_COLUMNS, FLOAT32_COLUMNS, INT32_COLUMNS, INT_MISSING
+from app.services.data.game_index import cache_dir_for, get_game_index, source_signature
+
+CACHE_VERSION = 1
+
+
+def to_float(value: Optional[str]) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def to_int(value: Optional[str]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class _GameColumnsBuilder:
+    """CSV 행을 받아 컬럼 리스트로 누적"""
+
+    def __init__(self) -> None:
+        self.time_seconds: List[float] = []
+        self.floats: Dict[str, List[float]] = {col: [] for col in FLOAT32_COLUMNS}
+        self.ints: Dict[str, List[int]] = {col: [] for col in INT32_COLUMNS}
+        self.labels: Dict[str, List[str]] = {col: [] for col in CATEGORICAL_COLUMNS}
+
+    def add_row(self, row: Dict[str, str]) -> None:
+        try:
+            ts = float(row.get("time_seconds", 0.0))
+        except ValueError:
+            return
+        start_x = to_float(row.get("start_x"))
+        start_y = to_float(row.get("start_y"))
+        end_x = to_float(row.get("end_x"))
+        end_y = to_float(row.get("end_y"))
+        # dx, dy 계산 (Track2에 있으면 사용, 없으면 계산)
+        dx = to_float(row.get("dx"))
+        dy = to_float(row.get("dy"))
+        if dx is None and start_x is not None and end_x is not None:
+            dx = end_x - start_x
+        if dy is None and start_y is not None and end_y is not None:
+            dy = end_y - start_y
+        values = {"start_x": start_x, "start_y": start_y, "end_x": end_x, "end_y": end_y, "dx": dx, "dy": dy}
+
+        self.time_seconds.append(ts)
+        for col in FLOAT32_COLUMNS:
+            value = values[col]
+            self.floats[col].append(np.nan if value is None else value)
+        for col in INT32_COLUMNS:
+            value = to_int(row.get(col))
+            self.ints[col].append(INT_MISSING if value is None else value)
+        for col in CATEGORICAL_COLUMNS:
+            self.labels[col].append(row.get(col) or "")
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        time_seconds = np.asarray(self.time_seconds, dtype=np.float64)
+        action_id = np.asarray(self.ints["action_id"], dtype=np.int32)
+        # 기존 정렬 규칙 유지: (time_seconds, action_id or 0)
+        order = np.lexsort((np.where(action_id == INT_MISSING, 0, action_id), time_seconds))
+
+        arrays: Dict[str, np.ndarray] = {"time_seconds": time_seconds[order]}
+        for col in FLOAT32_COLUMNS:
+            arrays[col] = np.asarray(self.floats[col], dtype=np.float32)[order]
+        for col in INT32_COLUMNS:
+            arrays[col] = np.asarray(self.ints[col], dtype=np.int32)[order]
+        for col in CATEGORICAL_COLUMNS:
+            vocab, codes = np.unique(np.asarray(self.labels[col], dtype=str), return_inverse=True)
+            arrays[f"{col}_vocab"] = vocab
+            arrays[f"{col}_codes"] = codes.astype(np.int16)[order]
+        return arrays
+
+
+def _game_cache_path(csv_path: str, game_id: str) -> str:
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in game_id)
+    return os.path.join(cache_dir_for(csv_path), f"game_{safe}.npz")
+
+
+def _signature_array(source: Dict[str, int]) -> np.ndarray:
+    return np.asarray([CACHE_VERSION, source["mtime_ns"], source["size"]], dtype=np.int64)
+
+
+def _write_npz(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def build_event_cache(csv_path: str) -> Dict:
+    """raw_data.csv를 한 번 스캔해 전체 경기의 .npz 캐시를 생성하고 경기별 요약을 반환
+
+    서버는 요약 없이 .npz마다 저장된 `_source` 서명으로 신선도를 확인하므로 파일로 남기지 않는다.
+    """
+    source = source_signature(csv_path)
+
+    builders: Dict[str, _GameColumnsBuilder] = {}
+    with open(csv_path, "r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            gid = row.get("game_id")
+            if not gid:
+                continue
+            builder = builders.get(gid)
+            if builder is None:
+                builder = builders[gid] = _GameColumnsBuilder()
+            builder.add_row(row)
+
+    games: Dict[str, Dict] = {}
+    for gid, builder in builders.items():
+        path = _game_cache_path(csv_path, gid)
+        arrays = builder.to_arrays()
+        _write_npz(path, {**arrays, "_source": _signature_array(source)})
+        games[gid] = {"file": os.path.basename(path), "rows": int(len(arrays["time_seconds"]))}
+
+    return {
+        "version": CACHE_VERSION,
+        "source_path": os.path.abspath(csv_path),
+        "source": source,
+        "games": games,
+    }
+
+
+def _load_fresh(path: str, source: Dict[str, int]) -> Optional[Dict[str, np.ndarray]]:
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if "_source" not in data.files or data["_source"].tolist() != _signature_array(source).tolist():
+                return None
+            return {key: data[key] for key in data.files if key != "_source"}
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+
+
+def load_game_columns(csv_path: str, game_id: str) -> Optional[Dict[str, np.ndarray]]:
+    """경기 하나의 컬럼 배열 로드 (없는 game_id면 None)
+
+    캐시가 없거나 원본보다 오래됐으면 인덱스의 바이트 구간만 읽어 다시 만든다.
+    """
+    source = source_signature(csv_path)
+    path = _game_cache_path(csv_path, game_id)
+    columns = _load_fresh(path, source)
+    if columns is not None:
+        return columns
+
+    rows = get_game_index(csv_path).read_rows(game_id)
+    if rows is None:
+        return None
+    builder = _GameColumnsBuilder()
+    for row in rows:
+        builder.add_row(row)
+    columns = builder.to_arrays()
+    try:
+        _write_npz(path, {**columns, "_source": _signature_array(source)})
+    except OSError:  # pragma: no cover - 캐시 저장 실패해도 이번 로드는 계속 진행
+        pass
+    return columns
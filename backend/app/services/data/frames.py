@@ -0,0 +1,184 @@
+"""
+pandas DataFrame ↔ EventBatch 변환, Track2 typed loader
+
+오프라인 스크립트(데이터셋 빌더, EDA, 압박 통합 등)가 이벤트 DataFrame을 읽고
+서버와 같은 컬럼형 EventBatch로 바꿔 피처 엔진을 공유하기 위한 모듈.
+dtype 규칙은 event_cache와 같다 (좌표 float32, id int32, 라벨은 category/코드).
+
+load_track2_frame은 필요한 컬럼만 compact dtype으로 읽는다. CSV는 처음 한 번
+전체를 typed Parquet(CSV 옆 `<이름>.typed.<키>.parquet`)으로 변환해 두고,
+이후에는 그 Parquet에서 요청한 컬럼만 읽는다. 원본 mtime/size가 바뀌면 다시 만든다.
+pyarrow가 없는 환경(서버 requirements만 설치된 CI 등)에서는 캐시 없이 CSV를 직접 읽는다.
+"""
+
+import hashlib
+import os
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.event import CATEGORICAL_COLUMNS, FLOAT32_COLUMNS, INT32_COLUMNS, INT_MISSING, EventBatch
+from app.services.data.game_index import source_signature
+
+# StatsBomb 압박 통합 데이터(track2_with_pressure)에만 있는 컬럼
+PRESSURE_COLUMNS = (
+    "pressure_event_count",
+    "under_pressure_count",
+    "counterpress_count",
+    "pressure_rate",
+    "recent_pressure_count",
+    "pressure_intensity",
+)
+
+TYPED_CACHE_VERSION = 1
+
+# Track2 컬럼별 compact dtype (id는 결측 가능한 nullable Int32, time_seconds는 float64 유지)
+TRACK2_DTYPES: Dict[str, str] = {
+    **{col: "Int32" for col in ("game_id", "period_id", "episode_id", "team_id", "player_id", "action_id")},
+    **{col: "float32" for col in FLOAT32_COLUMNS},
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    "time_seconds": "float64",
+}
+
+# batch_from_frame(피처 엔진 입력)이 읽는 컬럼
+EVENT_FRAME_COLUMNS = (
+    "game_id",
+    "time_seconds",
+    *FLOAT32_COLUMNS,
+    *INT32_COLUMNS,
+    *CATEGORICAL_COLUMNS,
+    *PRESSURE_COLUMNS,
+)
+
+
+def apply_track2_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """TRACK2_DTYPES에 있는 컬럼을 compact dtype으로 변환 (이미 같은 dtype이면 그대로)"""
+    casts = {col: dtype for col, dtype in TRACK2_DTYPES.items() if col in df.columns and str(df[col].dtype) != dtype}
+    return df.astype(casts) if casts else df
+
+
+def read_track2_csv(source, columns: Optional[Iterable[str]] = None, **kwargs) -> pd.DataFrame:
+    """pd.read_csv + TRACK2_DTYPES (columns가 있으면 그 중 존재하는 컬럼만 읽음)
+
+    source는 경로나 파일 객체. header 없는 구간을 읽을 때는 names=헤더를 함께 넘긴다.
+    """
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda col: col in wanted  # noqa: E731 - 없는 컬럼은 조용히 건너뛴다
+    return pd.read_csv(source, dtype=TRACK2_DTYPES, usecols=usecols, low_memory=False, **kwargs)
+
+
+def _typed_cache_path(csv_path: str) -> Path:
+    source = source_signature(csv_path)
+    key = f"{TYPED_CACHE_VERSION}:{source['mtime_ns']}:{source['size']}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    path = Path(csv_path)
+    return path.with_name(f"{path.stem}.typed.{digest}.parquet")
+
+
+def _build_typed_cache(csv_path: str, path: Path) -> pd.DataFrame:
+    df = read_track2_csv(csv_path)
+    try:
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        for old in path.parent.glob(f"{Path(csv_path).stem}.typed.*.parquet"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    except OSError:  # pragma: no cover - 캐시 저장 실패해도 이번 로드는 계속 진행
+        pass
+    return df
+
+
+def _has_parquet_engine() -> bool:
+    # typed 캐시 읽기/쓰기는 pyarrow를 쓴다 (backend/requirements.txt에는 없음)
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _parquet_columns(path) -> Sequence[str]:
+    import pyarrow.parquet as pq  # pandas read_parquet 엔진
+
+    return pq.read_schema(path).names
+
+
+def load_track2_frame(
+    path: str, columns: Optional[Sequence[str]] = None, filters=None, use_cache: bool = True
+) -> pd.DataFrame:
+    """Track2 이벤트(CSV 또는 Parquet)를 compact dtype으로 로드
+
+    - columns: 읽을 컬럼 (None이면 전체, 파일에 없는 컬럼은 무시, 순서는 파일 순서)
+    - filters: Parquet 행 필터 (pd.read_parquet filters, 예: [("game_id", "==", 126283)])
+    - CSV는 typed Parquet 캐시를 만들어 두고 거기서 읽는다
+      (use_cache=False이거나 pyarrow가 없으면 CSV 직접 파싱)
+    """
+    if not str(path).endswith(".parquet"):
+        if not use_cache or not _has_parquet_engine():
+            return read_track2_csv(path, columns)
+        cache_path = _typed_cache_path(path)
+        if not cache_path.exists():
+            df = _build_typed_cache(path, cache_path)
+            if columns is None:
+                return df
+            return df[[col for col in df.columns if col in set(columns)]]
+        path = str(cache_path)
+    if columns is not None:
+        wanted = set(columns)
+        columns = [col for col in _parquet_columns(path) if col in wanted]
+    return apply_track2_dtypes(pd.read_parquet(path, columns=columns, filters=filters))
+
+
+def _float_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), np.nan, dtype=np.float32)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+
+
+def _int_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), INT_MISSING, dtype=np.int32)
+    values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.where(np.isnan(values), INT_MISSING, values).astype(np.int32)
+
+
+def _codes_column(df: pd.DataFrame, col: str):
+    if col not in df.columns:
+        return np.asarray([""]), np.zeros(len(df), dtype=np.int16)
+    values = df[col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    codes, vocab = pd.factorize(values.fillna("").astype(str), sort=True)
+    return np.asarray(vocab, dtype=str), codes.astype(np.int16)
+
+
+def batch_from_frame(
+    df: pd.DataFrame, game_id: str = "", extra_columns: Sequence[str] = PRESSURE_COLUMNS
+) -> EventBatch:
+    """이벤트 DataFrame → EventBatch (행 순서 유지, 결측 라벨은 빈 문자열)
+
+    extra_columns 중 DataFrame에 있는 컬럼은 float64로 extras에 담는다.
+    """
+    if not game_id and "game_id" in df.columns and len(df):
+        game_id = str(df["game_id"].iloc[0])
+    columns = {
+        "time_seconds": pd.to_numeric(df["time_seconds"], errors="coerce").to_numpy(dtype=np.float64),
+    }
+    for col in FLOAT32_COLUMNS:
+        columns[col] = _float_column(df, col)
+    for col in INT32_COLUMNS:
+        columns[col] = _int_column(df, col)
+    for col in CATEGORICAL_COLUMNS:
+        columns[f"{col}_vocab"], columns[f"{col}_codes"] = _codes_column(df, col)
+    extras = {
+        col: pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        for col in extra_columns
+        if col in df.columns
+    }
+    return replace(EventBatch.from_columns(game_id, columns), extras=extras)
@@ -0,0 +1,202 @@
+"""
+raw_data.csv game_id 바이트 오프셋 인덱스
+
+game_id별 (byte offset, byte length, row count, 시간 범위, period 수)를 기록해
+존재 확인은 O(1), 경기별 읽기는 해당 구간만 seek해서 처리한다.
+인덱스는 캐시 디렉터리에 JSON으로 저장하고, 메모리에 올려 두었다가
+원본 CSV의 mtime/size가 바뀔 때만 다시 만든다.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+
+INDEX_VERSION = 1
+INDEX_NAME = "game_index.json"
+
+_INDEXES: Dict[str, "GameIndex"] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class GameIndexEntry:
+    game_id: str
+    offset: int
+    length: int
+    row_count: int
+    time_min: float
+    time_max: float
+    period_count: int
+
+
+class GameIndex:
+    """game_id → GameIndexEntry 매핑 (CSV 등장 순서 유지)"""
+
+    def __init__(self, csv_path: str, source: Dict[str, int], header: List[str], entries: Dict[str, GameIndexEntry]):
+        self.csv_path = csv_path
+        self.source = source
+        self.header = header
+        self.entries = entries
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, game_id: str) -> Optional[GameIndexEntry]:
+        return self.entries.get(game_id)
+
+    def game_ids(self) -> List[str]:
+        return list(self.entries)
+
+    def read_rows(self, game_id: str) -> Optional[List[Dict[str, str]]]:
+        """해당 경기 바이트 구간만 읽어 DictReader 형식의 행 리스트로 반환"""
+        entry = self.entries.get(game_id)
+        if entry is None:
+            return None
+        with open(self.csv_path, "rb") as f:
+            f.seek(entry.offset)
+            chunk = f.read(entry.length).decode("utf-8")
+        reader = csv.DictReader(io.StringIO(chunk), fieldnames=self.header)
+        # 구간 안에 다른 경기 행이 섞여 있어도(비연속 저장) game_id로 걸러낸다.
+        return [row for row in reader if row.get("game_id") == game_id]
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": INDEX_VERSION,
+            "source": self.source,
+            "header": self.header,
+            "games": [asdict(entry) for entry in self.entries.values()],
+        }
+
+
+def cache_dir_for(csv_path: str) -> str:
+    """원본 CSV 경로별 캐시 디렉터리 (경로 해시로 구분)"""
+    settings = get_settings()
+    digest = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(settings.event_cache_path, digest)
+
+
+def source_signature(csv_path: str) -> Dict[str, int]:
+    stat = os.stat(csv_path)
+    return {"mtime_ns": int(stat.st_mtime_ns), "size": int(stat.st_size)}
+
+
+def _split_line(line: bytes) -> List[str]:
+    text = line.decode("utf-8").rstrip("\r\n")
+    if '"' in text:
+        return next(csv.reader([text]))
+    return text.split(",")
+
+
+def build_game_index(csv_path: str) -> GameIndex:
+    """CSV를 바이트 단위로 한 번 스캔해 인덱스 생성"""
+    source = source_signature(csv_path)
+    spans: Dict[str, Dict] = {}
+    with open(csv_path, "rb") as f:
+        header_line = f.readline()
+        if header_line.startswith(b"\xef\xbb\xbf"):
+            header_line = header_line[3:]
+        header = _split_line(header_line)
+        gid_idx = header.index("game_id")
+        time_idx = header.index("time_seconds") if "time_seconds" in header else None
+        period_idx = header.index("period_id") if "period_id" in header else None
+
+        offset = f.tell()
+        for line in f:
+            line_end = offset + len(line)
+            fields = _split_line(line)
+            gid = fields[gid_idx] if len(fields) > gid_idx else ""
+            if gid:
+                span = spans.get(gid)
+                if span is None:
+                    span = spans[gid] = {
+                        "start": offset,
+                        "end": line_end,
+                        "rows": 0,
+                        "time_min": float("inf"),
+                        "time_max": float("-inf"),
+                        "periods": set(),
+                    }
+                span["end"] = line_end
+                span["rows"] += 1
+                if time_idx is not None and len(fields) > time_idx:
+                    try:
+                        ts = float(fields[time_idx])
+                    except ValueError:
+                        ts = None
+                    if ts is not None:
+                        span["time_min"] = min(span["time_min"], ts)
+                        span["time_max"] = max(span["time_max"], ts)
+                if period_idx is not None and len(fields) > period_idx and fields[period_idx]:
+                    span["periods"].add(fields[period_idx])
+            offset = line_end
+
+    entries = {
+        gid: GameIndexEntry(
+            game_id=gid,
+            offset=span["start"],
+            length=span["end"] - span["start"],
+            row_count=span["rows"],
+            time_min=span["time_min"] if span["time_min"] != float("inf") else 0.0,
+            time_max=span["time_max"] if span["time_max"] != float("-inf") else 0.0,
+            period_count=len(span["periods"]),
+        )
+        for gid, span in spans.items()
+    }
+    return GameIndex(csv_path, source, header, entries)
+
+
+def _index_path(csv_path: str) -> str:
+    return os.path.join(cache_dir_for(csv_path), INDEX_NAME)
+
+
+def _load_persisted(csv_path: str, source: Dict[str, int]) -> Optional[GameIndex]:
+    try:
+        with open(_index_path(csv_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, PermissionError, json.JSONDecodeError):
+        return None
+    if data.get("version") != INDEX_VERSION or data.get("source") != source:
+        return None
+    entries = {item["game_id"]: GameIndexEntry(**item) for item in data.get("games", [])}
+    return GameIndex(csv_path, source, data["header"], entries)
+
+
+def _persist(index: GameIndex) -> None:
+    path = _index_path(index.csv_path)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:  # pragma: no cover - 인덱스 저장 실패는 메모리 인덱스로 계속 동작
+        pass
+
+
+def get_game_index(csv_path: str) -> GameIndex:
+    """메모리 → 디스크 → 재빌드 순으로 최신 인덱스 반환"""
+    key = os.path.abspath(csv_path)
+    source = source_signature(csv_path)
+    index = _INDEXES.get(key)
+    if index is not None and index.source == source:
+        return index
+    with _INDEX_LOCK:
+        index = _INDEXES.get(key)
+        if index is not None and index.source == source:
+            return index
+        index = _load_persisted(csv_path, source)
+        if index is None:
+            index = build_game_index(csv_path)
+            _persist(index)
+        _INDEXES[key] = index
+        return index
@@ -0,0 +1,138 @@
+"""
+프로세스 공용 경기 이벤트 저장소
+
+같은 game_id로 여러 세션이 열려도 경기 데이터는 한 번만 로드해
+읽기 전용 컬럼 배열을 공유한다. 참조 카운트가 0이 된 경기는
+LRU 순서로 최대 `game_store_max_idle_games`개까지만 유지한다.
+세션에는 경기 전체를 담은 EventBatch(읽기 전용 배열)를 그대로 넘긴다.
+
+CSV가 바뀌면(source_signature 불일치) acquire는 새로 로드한 항목을 돌려주고,
+이전 배열을 잡고 있는 세션은 release할 때까지 그 배열을 그대로 쓴다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.schemas.event import EventBatch
+from app.services.data.event_cache import load_game_columns
+from app.services.data.game_index import source_signature
+
+GameKey = Tuple[str, str]
+
+
+@dataclass
+class _StoreEntry:
+    batch: EventBatch
+    source: Dict[str, int]
+    refcount: int = 0
+
+
+class GameStore:
+    def __init__(self, max_idle_games: int = 4) -> None:
+        self.max_idle_games = max(0, max_idle_games)
+        self._entries: Dict[GameKey, _StoreEntry] = {}
+        self._idle: "OrderedDict[GameKey, None]" = OrderedDict()
+        # CSV가 바뀌어 교체됐지만 아직 참조가 남은 항목 (id(batch) → 항목)
+        self._retired: Dict[int, _StoreEntry] = {}
+        # 락 밖에서 로드 중인 경기 (끝나면 set)
+        self._loading: Dict[GameKey, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(csv_path: str, game_id: str) -> GameKey:
+        return os.path.abspath(csv_path), game_id
+
+    def acquire(self, csv_path: str, game_id: str) -> Optional[EventBatch]:
+        """경기 전체 EventBatch 반환 (참조 +1). 없는 경기면 None
+
+        로드(CSV 파싱·인덱스 생성 가능)는 저장소 락 밖에서 한다. 같은 경기를 동시에 요청한
+        세션은 먼저 로드를 시작한 쪽이 끝날 때까지 기다렸다가 그 항목을 공유한다.
+        """
+        key = self._key(csv_path, game_id)
+        source = source_signature(csv_path)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.source != source:
+                    self._retire(key, entry)
+                    entry = None
+                if entry is not None:
+                    entry.refcount += 1
+                    self._idle.pop(key, None)
+                    return entry.batch
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    break
+            loading.wait()
+
+        entry = None
+        try:
+            columns = load_game_columns(csv_path, game_id)
+            if columns is not None:
+                for array in columns.values():
+                    array.setflags(write=False)
+                entry = _StoreEntry(batch=EventBatch.from_columns(game_id, columns), source=source, refcount=1)
+        finally:
+            with self._lock:
+                del self._loading[key]
+                if entry is not None:
+                    self._entries[key] = entry
+            loading.set()
+        return entry.batch if entry is not None else None
+
+    def _retire(self, key: GameKey, entry: _StoreEntry) -> None:
+        # 현재 항목에서 빼고, 참조가 남아 있으면 release될 때까지 따로 보관
+        self._entries.pop(key, None)
+        self._idle.pop(key, None)
+        if entry.refcount:
+            self._retired[id(entry.batch)] = entry
+
+    def release(self, csv_path: str, game_id: str, batch: Optional[EventBatch] = None) -> None:
+        """참조 -1. 0이 되면 idle LRU에 넣고 한도를 넘는 경기는 해제
+
+        batch를 주면 acquire로 받은 그 배열의 항목을 내린다 (CSV가 바뀌어 교체된 항목 포함).
+        """
+        key = self._key(csv_path, game_id)
+        with self._lock:
+            retired = self._retired.get(id(batch)) if batch is not None else None
+            if retired is not None and retired.batch is batch:
+                retired.refcount -= 1
+                if retired.refcount == 0:
+                    del self._retired[id(batch)]
+                return
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount == 0:
+                return
+            if batch is not None and entry.batch is not batch:
+                return
+            entry.refcount -= 1
+            if entry.refcount == 0:
+                self._idle[key] = None
+                while len(self._idle) > self.max_idle_games:
+                    evicted, _ = self._idle.popitem(last=False)
+                    self._entries.pop(evicted, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "loaded_games": len(self._entries) + len(self._retired),
+                "idle_games": len(self._idle),
+                "references": sum(
+                    entry.refcount for entry in (*self._entries.values(), *self._retired.values())
+                ),
+            }
+
+
+_GAME_STORE: GameStore | None = None
+
+
+def get_game_store() -> GameStore:
+    global _GAME_STORE
+    if _GAME_STORE is None:
+        _GAME_STORE = GameStore(max_idle_games=get_settings().game_store_max_idle_games)
+    return _GAME_STORE
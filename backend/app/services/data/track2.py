@@ -5,6 +5,7 @@ from typing import Dict, List, Set
 from fastapi import HTTPException
 
 from app.core.config import get_settings
+from app.services.data.game_index import get_game_index
 
 REQUIRED_EVENT_COLUMNS: Set[str] = {
     "game_id",
@@ -57,17 +58,9 @@ def list_game_ids(limit: int | None = None, recommend: bool = False) -> List[Dic
     settings = get_settings()
     _ensure_file(settings.events_data_path, "Track2 raw_data")
 
-    game_ids: List[str] = []
-    with open(settings.events_data_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        seen = set()
-        for row in reader:
-            gid = row.get("game_id")
-            if gid and gid not in seen:
-                seen.add(gid)
-                game_ids.append(gid)
-                if limit and len(game_ids) >= limit:
-                    break
+    game_ids: List[str] = get_game_index(settings.events_data_path).game_ids()
+    if limit:
+        game_ids = game_ids[:limit]
 
     meta: Dict[str, Dict[str, str]] = {}
     if os.path.exists(settings.match_info_path):
@@ -107,9 +100,20 @@ def ensure_game_id_exists(game_id: str) -> None:
         _ensure_file(settings.events_data_path, "Track2 raw_data")
     except FileNotFoundError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    with open(settings.events_data_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("game_id") == game_id:
-                return
+    if game_id in get_game_index(settings.events_data_path):
+        return
     raise HTTPException(status_code=404, detail=f"game_id '{game_id}'를 raw_data에서 찾을 수 없습니다.")
+
+
+def describe_game(game_id: str) -> Dict[str, object]:
+    """인덱스에 기록된 경기 요약 (행 수, 시간 범위, period 수)"""
+    ensure_game_id_exists(game_id)
+    entry = get_game_index(get_settings().events_data_path).get(game_id)
+    return {
+        "game_id": game_id,
+        "exists": True,
+        "row_count": entry.row_count,
+        "time_min": entry.time_min,
+        "time_max": entry.time_max,
+        "period_count": entry.period_count,
+    }
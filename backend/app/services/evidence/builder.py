@@ -1,11 +1,11 @@
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
 
 import cv2
 import numpy as np
 
 from app.core.config import get_settings
-from app.schemas.event import EventRecord
+from app.schemas.event import EventBatch
 
 PITCH_LENGTH = 105.0
 PITCH_WIDTH = 68.0
@@ -38,7 +38,7 @@ class EvidenceBuilder:
         pattern_type: str,
         severity: str,
         metrics: Dict[str, float],
-        events: List[EventRecord],
+        events: EventBatch,
     ) -> Tuple[str, str]:
         session_dir = os.path.join(self.evidence_root, session_id)
         os.makedirs(session_dir, exist_ok=True)
@@ -49,7 +49,7 @@ class EvidenceBuilder:
         start_ts = max(0.0, ts_center - 5.0)
         end_ts = ts_center + 5.0
 
-        sorted_events = sorted(events, key=lambda e: e.time_seconds)
+        sorted_events = self._sorted_by_time(events)
         self._render_clip(sorted_events, start_ts, end_ts, clip_path)
         self._render_overlay(sorted_events, overlay_path, pattern_type, severity, metrics, ts_center)
 
@@ -59,7 +59,13 @@ class EvidenceBuilder:
         self._assert_exists(clip_path, overlay_path)
         return clip_url, overlay_url
 
-    def _render_clip(self, events: List[EventRecord], start_ts: float, end_ts: float, output_path: str) -> None:
+    def _sorted_by_time(self, events: EventBatch) -> EventBatch:
+        times = events.time_seconds
+        if len(times) < 2 or bool(np.all(times[1:] >= times[:-1])):
+            return events
+        return events.take(np.argsort(times, kind="stable"))
+
+    def _render_clip(self, events: EventBatch, start_ts: float, end_ts: float, output_path: str) -> None:
         fps = 10
         duration = max(0.1, end_ts - start_ts)
         frame_count = max(1, int(duration * fps))
@@ -68,12 +74,14 @@ class EvidenceBuilder:
         if not writer.isOpened():  # pragma: no cover - defensive
             return
 
+        # 시간순 정렬돼 있으므로 프레임마다 [start_ts, current_ts] 구간만 이진 탐색으로 그린다.
+        first = int(np.searchsorted(events.time_seconds, start_ts, side="left"))
         for frame_idx in range(frame_count):
             current_ts = start_ts + frame_idx / fps
             frame = self._draw_pitch()
-            for ev in events:
-                if start_ts <= ev.time_seconds <= current_ts:
-                    self._draw_event(frame, ev)
+            last = int(np.searchsorted(events.time_seconds, current_ts, side="right"))
+            for idx in range(first, last):
+                self._draw_event(frame, events, idx)
             writer.write(frame)
         writer.release()
 
@@ -82,7 +90,7 @@ class EvidenceBuilder:
 
     def _render_overlay(
         self,
-        events: List[EventRecord],
+        events: EventBatch,
         output_path: str,
         pattern_type: str,
         severity: str,
@@ -90,9 +98,9 @@ class EvidenceBuilder:
         ts_center: float,
     ) -> None:
         frame = self._draw_pitch()
-        for ev in events:
-            if abs(ev.time_seconds - ts_center) <= 5:
-                self._draw_event(frame, ev)
+        near = np.flatnonzero(np.abs(events.time_seconds - ts_center) <= 5)
+        for idx in near:
+            self._draw_event(frame, events, int(idx))
 
         y = 30
         cv2.putText(frame, f"Pattern: {pattern_type}", (20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
@@ -137,10 +145,13 @@ class EvidenceBuilder:
         cv2.line(frame, (x_final_third, 0), (x_final_third, FRAME_HEIGHT), (200, 200, 200), 1)
         return frame
 
-    def _draw_event(self, frame: np.ndarray, event: EventRecord) -> None:
-        start_px = self._to_px(event.start_x, event.start_y)
-        end_px = self._to_px(event.end_x, event.end_y)
-        color = self._color_for_event(event)
+    def _draw_event(self, frame: np.ndarray, events: EventBatch, idx: int) -> None:
+        start_px = self._to_px(float(events.start_x[idx]), float(events.start_y[idx]))
+        end_px = self._to_px(float(events.end_x[idx]), float(events.end_y[idx]))
+        color = self._color_for_event(
+            str(events.type_vocab[events.type_codes[idx]]),
+            str(events.result_vocab[events.result_codes[idx]]),
+        )
 
         if start_px and end_px:
             cv2.arrowedLine(frame, start_px, end_px, color, 3, tipLength=0.2)
@@ -149,22 +160,22 @@ class EvidenceBuilder:
         elif end_px:
             cv2.circle(frame, end_px, 6, color, -1)
 
-    def _to_px(self, x: float | None, y: float | None) -> Tuple[int, int] | None:
-        if x is None or y is None:
+    def _to_px(self, x: float, y: float) -> Tuple[int, int] | None:
+        if np.isnan(x) or np.isnan(y):
             return None
         px = int((x / PITCH_LENGTH) * FRAME_WIDTH)
         py = int((y / PITCH_WIDTH) * FRAME_HEIGHT)
         return (px, py)
 
-    def _color_for_event(self, event: EventRecord) -> Tuple[int, int, int]:
-        type_name = (event.type_name or "").lower()
+    def _color_for_event(self, type_name: str, result_name: str) -> Tuple[int, int, int]:
+        type_name = type_name.lower()
         if type_name == "shot":
             return (0, 0, 255)
         if type_name == "pass":
             return (0, 200, 255)
         if type_name == "carry":
             return (255, 140, 0)
-        if "turnover" in type_name or (event.result_name or "").lower() == "unsuccessful":
+        if "turnover" in type_name or result_name.lower() == "unsuccessful":
             return (180, 180, 180)
         return (255, 255, 0)
 
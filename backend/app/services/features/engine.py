@@ -0,0 +1,519 @@
+"""
+will_have_shot 피처 엔진
+
+데이터셋 빌더(scripts/build_dataset_will_have_shot.py)와 실시간 세션이 함께 쓰는
+피처 계산. 입력은 시간순 EventBatch 하나(= 피처 윈도우)이고, 학습 데이터와
+같은 키·같은 순서의 피처 딕셔너리를 돌려준다.
+
+피처는 그룹 단위 함수(FEATURE_GROUPS)로 나뉘며 순서대로 실행된다.
+뒤쪽 그룹(압박 프록시, 상호작용)은 앞 그룹이 채운 값을 읽는다 (GROUP_DEPENDENCIES).
+모델 입력 컬럼이 정해져 있으면 groups_for로 필요한 그룹만 골라 계산한다
+(실시간 경로의 window_feature_vector).
+
+구간 통계(다중 스케일, 최근 N개, 최근 vs 이전 10초)는 EventPrefix 누적 배열로
+O(1)에 구한다. 데이터셋 빌더처럼 겹치는 윈도우를 많이 계산할 때는 경기 전체의
+EventPrefix를 한 번 만들어 prefix/offset으로 넘기면 윈도우마다 다시 만들지 않는다.
+"""
+
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.event import INT_MISSING, EventBatch
+from app.services.features.kernel import (
+    failure_density,
+    feature_vector,
+    label_counts,
+    label_mask,
+    nanmean,
+    rapid_repeats,
+    sample_std,
+    type_feature_name,
+)
+from app.services.features.prefix import EventPrefix
+
+# 피처 정의가 바뀌면 올린다 (데이터셋 빌더의 경기별 피처 캐시 무효화)
+FEATURE_VERSION = 1
+
+BASE_TYPES = ("Pass", "Carry", "Shot", "Duel", "Interception")
+SEQUENCE_TYPES = ("Pass", "Carry", "Shot", "Duel")
+TOP_TYPE_LIMIT = 10
+MULTI_SCALE_SECONDS = (1, 5, 10, 20)
+RECENT_EVENT_COUNTS = (5, 10)
+PRESSURE_WINDOW_SECONDS = 5.0
+STATSBOMB_FEATURES = (
+    ("statsbomb_pressure_count", "pressure_event_count", "sum"),
+    ("statsbomb_under_pressure_count", "under_pressure_count", "sum"),
+    ("statsbomb_counterpress_count", "counterpress_count", "sum"),
+    ("statsbomb_pressure_rate", "pressure_rate", "mean"),
+    ("statsbomb_recent_pressure_count", "recent_pressure_count", "sum"),
+    ("statsbomb_pressure_intensity", "pressure_intensity", "max"),
+)
+
+Features = Dict[str, float]
+
+
+class WindowContext:
+    """그룹 함수들이 공유하는 윈도우 배열 (float64 변환·라벨 마스크를 한 번만 계산)"""
+
+    def __init__(self, events: EventBatch, prefix: Optional[EventPrefix] = None, offset: int = 0) -> None:
+        self.events = events
+        self.n = len(events)
+        self.time = events.time_seconds.astype(np.float64, copy=False)
+        self.start_x = events.start_x.astype(np.float64)
+        self.start_y = events.start_y.astype(np.float64)
+        self.end_x = events.end_x.astype(np.float64)
+        self.end_y = events.end_y.astype(np.float64)
+        self.dx = events.dx.astype(np.float64)
+        self.dy = events.dy.astype(np.float64)
+        self.current_time = float(self.time.max())
+        self.type_counts = label_counts(events.type_vocab, events.type_codes)
+        self.is_pass = label_mask(events.type_vocab, events.type_codes, "Pass")
+        self.is_successful = label_mask(events.result_vocab, events.result_codes, "Successful")
+        self.is_unsuccessful = label_mask(events.result_vocab, events.result_codes, "Unsuccessful")
+
+        # team_id.diff() != 0 규칙: 첫 행과 결측 team_id 앞뒤 행은 항상 변화로 본다
+        team_id = events.team_id
+        missing = team_id == INT_MISSING
+        self.has_team = not missing.all()
+        self.team_changed = np.ones(self.n, dtype=bool)
+        self.team_changed[1:] = (team_id[1:] != team_id[:-1]) | missing[1:] | missing[:-1]
+
+        # prefix가 없으면 구간 통계 그룹이 처음 쓸 때 이 윈도우만의 누적 배열을 만든다
+        # (offset은 prefix 기준 윈도우 시작 행)
+        self._prefix = prefix
+        self.offset = offset if prefix is not None else 0
+
+    @property
+    def prefix(self) -> EventPrefix:
+        if self._prefix is None:
+            self._prefix = prefix_for(self.events)
+        return self._prefix
+
+    def since(self, start_ts: float) -> int:
+        """time_seconds >= start_ts 가 시작되는 행 위치"""
+        return int(np.searchsorted(self.time, start_ts, side="left"))
+
+    def type_count(self, name: str, lo: int, hi: int) -> float:
+        return float(self.prefix.type_count(name, self.offset + lo, self.offset + hi))
+
+    def success_count(self, lo: int, hi: int) -> int:
+        return self.prefix.success_count(self.offset + lo, self.offset + hi)
+
+    def end_x_stats(self, lo: int, hi: int) -> Optional[Tuple[float, float]]:
+        return self.prefix.end_x_stats(self.offset + lo, self.offset + hi)
+
+    def interval_stats(self, lo: int, hi: int) -> Tuple[float, float]:
+        return self.prefix.interval_stats(self.offset + lo, self.offset + hi)
+
+
+def _zeros(features: Features, keys: Sequence[str]) -> None:
+    for key in keys:
+        features[key] = 0.0
+
+
+# ---------------------------------------------------------------------------
+# 피처 그룹
+# ---------------------------------------------------------------------------
+
+
+def _basic_stats(ctx: WindowContext, features: Features) -> None:
+    features["event_count"] = float(ctx.n)
+    time_span = float(ctx.current_time - ctx.time.min())
+    features["time_span"] = time_span if time_span > 0 else 0.0
+    features["event_rate"] = features["event_count"] / features["time_span"] if features["time_span"] > 0 else 0.0
+
+
+def _type_counts(ctx: WindowContext, features: Features) -> None:
+    for name in BASE_TYPES:
+        features[f"{name.lower()}_count"] = float(ctx.type_counts.get(name, 0))
+    # EDA 상위 타입들도 자동 추가 (최대 10개)
+    for name in list(ctx.type_counts)[:TOP_TYPE_LIMIT]:
+        if name not in BASE_TYPES:
+            features[type_feature_name(name)] = float(ctx.type_counts[name])
+
+
+def _result_stats(ctx: WindowContext, features: Features) -> None:
+    events = ctx.events
+    features["successful_count"] = float(np.count_nonzero(ctx.is_successful))
+    features["unsuccessful_count"] = float(np.count_nonzero(ctx.is_unsuccessful))
+    features["unknown_result_count"] = float(
+        np.count_nonzero(label_mask(events.result_vocab, events.result_codes, ""))
+    )
+    total_with_result = features["successful_count"] + features["unsuccessful_count"]
+    features["success_rate"] = features["successful_count"] / total_with_result if total_with_result > 0 else 0.0
+    features["success_rate_with_unknown"] = features["successful_count"] / features["event_count"]
+
+
+PASS_KEYS = ("mean_dx", "mean_dy", "std_dx", "std_dy", "forward_ratio", "right_ratio", "left_ratio", "center_ratio")
+
+
+def _deltas(delta: np.ndarray, end: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """dx/dy 컬럼에 값이 하나라도 있으면 그 값, 없으면 end - start (결측 제외)"""
+    values = delta if not np.isnan(delta).all() else end - start
+    return values[~np.isnan(values)]
+
+
+def _pass_geometry(ctx: WindowContext, features: Features) -> None:
+    is_pass = ctx.is_pass & ~np.isnan(ctx.start_x) & ~np.isnan(ctx.end_x)
+    pass_total = int(np.count_nonzero(is_pass))
+    if not pass_total:
+        _zeros(features, PASS_KEYS)
+        return
+    dx = _deltas(ctx.dx[is_pass], ctx.end_x[is_pass], ctx.start_x[is_pass])
+    dy = _deltas(ctx.dy[is_pass], ctx.end_y[is_pass], ctx.start_y[is_pass])
+    features["mean_dx"] = float(np.mean(dx)) if len(dx) else 0.0
+    features["mean_dy"] = float(np.mean(dy)) if len(dy) else 0.0
+    features["std_dx"] = float(np.std(dx)) if len(dx) else 0.0
+    features["std_dy"] = float(np.std(dy)) if len(dy) else 0.0
+    features["forward_ratio"] = float(np.count_nonzero(dx > 0)) / len(dx) if len(dx) else 0.0
+
+    # 채널 분포 (y 좌표 기준, 0~68 스케일): left <22.7 (=68/3), right >45.3 (=68×2/3)
+    start_y = ctx.start_y[is_pass]
+    if not np.isnan(start_y).all():
+        features["right_ratio"] = int(np.count_nonzero(start_y > 45.3)) / pass_total
+        features["left_ratio"] = int(np.count_nonzero(start_y < 22.7)) / pass_total
+        features["center_ratio"] = 1.0 - features["right_ratio"] - features["left_ratio"]
+    else:
+        _zeros(features, ("right_ratio", "left_ratio", "center_ratio"))
+
+
+def _penetration(ctx: WindowContext, features: Features) -> None:
+    # final_third: 70 (=105×2/3), penalty_area: 88.5 (=105-16.5) 대신 >88 사용
+    features["final_third_entries"] = float(np.count_nonzero(ctx.end_x > 70))
+    features["penalty_area_entries"] = float(np.count_nonzero(ctx.end_x > 88))
+
+
+def _possession(ctx: WindowContext, features: Features) -> None:
+    if ctx.has_team:
+        features["possession_changes"] = float(max(0, int(np.count_nonzero(ctx.team_changed)) - 1))
+    else:
+        features["possession_changes"] = 0.0
+
+
+def _multi_scale_keys(window_sec: int) -> List[str]:
+    prefix = f"past_{window_sec}s"
+    return [f"{prefix}_{name.lower()}_count" for name in SEQUENCE_TYPES] + [
+        f"{prefix}_event_count",
+        f"{prefix}_success_rate",
+        f"{prefix}_mean_end_x",
+        f"{prefix}_max_end_x",
+        f"{prefix}_interval_mean",
+        f"{prefix}_interval_std",
+    ]
+
+
+def _multi_scale(ctx: WindowContext, features: Features) -> None:
+    """1/5/10/20초 윈도우: 짧은 순간의 패턴과 긴 흐름을 함께 반영"""
+    for window_sec in MULTI_SCALE_SECONDS:
+        lo = ctx.since(ctx.current_time - window_sec)
+        count = ctx.n - lo
+        if count <= 0:
+            _zeros(features, _multi_scale_keys(window_sec))
+            continue
+        prefix = f"past_{window_sec}s"
+        for name in SEQUENCE_TYPES:
+            features[f"{prefix}_{name.lower()}_count"] = ctx.type_count(name, lo, ctx.n)
+        features[f"{prefix}_event_count"] = float(count)
+        features[f"{prefix}_success_rate"] = float(ctx.success_count(lo, ctx.n) / count)
+
+        end_x = ctx.end_x_stats(lo, ctx.n)
+        if end_x is not None:
+            features[f"{prefix}_mean_end_x"], features[f"{prefix}_max_end_x"] = end_x
+        else:
+            features[f"{prefix}_mean_end_x"] = 0.0
+            features[f"{prefix}_max_end_x"] = 0.0
+        features[f"{prefix}_interval_mean"], features[f"{prefix}_interval_std"] = ctx.interval_stats(lo, ctx.n)
+
+
+def _recent_event_keys(count: int) -> List[str]:
+    return [f"recent_{count}_{name.lower()}_count" for name in SEQUENCE_TYPES] + [
+        f"recent_{count}_success_rate",
+        f"recent_{count}_mean_end_x",
+    ]
+
+
+def _recent_events(ctx: WindowContext, features: Features) -> None:
+    """최근 N개 이벤트 (기존 호환성)"""
+    for count in RECENT_EVENT_COUNTS:
+        lo = max(0, ctx.n - count)
+        size = ctx.n - lo
+        for name in SEQUENCE_TYPES:
+            features[f"recent_{count}_{name.lower()}_count"] = ctx.type_count(name, lo, ctx.n)
+        features[f"recent_{count}_success_rate"] = float(ctx.success_count(lo, ctx.n) / size)
+        end_x = ctx.end_x_stats(lo, ctx.n)
+        features[f"recent_{count}_mean_end_x"] = end_x[0] if end_x is not None else 0.0
+
+
+INTERVAL_KEYS = ("event_interval_mean", "event_interval_std", "event_interval_min", "event_interval_max")
+
+
+def _interval_stats(ctx: WindowContext, features: Features) -> None:
+    if ctx.n <= 1:
+        _zeros(features, INTERVAL_KEYS)
+        return
+    intervals = np.diff(ctx.time)
+    features["event_interval_mean"] = float(intervals.mean())
+    features["event_interval_std"] = sample_std(intervals)
+    features["event_interval_min"] = float(intervals.min())
+    features["event_interval_max"] = float(intervals.max())
+
+
+RECENT_VS_PREVIOUS_KEYS = (
+    "recent_10s_event_count",
+    "previous_10s_event_count",
+    "event_count_change",
+    "recent_10s_mean_end_x",
+    "previous_10s_mean_end_x",
+    "end_x_change",
+    "recent_10s_success_rate",
+    "previous_10s_success_rate",
+    "success_rate_change",
+)
+
+
+def _recent_vs_previous(ctx: WindowContext, features: Features) -> None:
+    """최근 10초 vs 이전 10초 (공격 강도 변화)"""
+    recent_lo = ctx.since(ctx.current_time - 10)
+    previous_lo = min(ctx.since(ctx.current_time - 20), recent_lo)
+    recent_count = ctx.n - recent_lo
+    previous_count = recent_lo - previous_lo
+
+    features["recent_10s_event_count"] = float(recent_count)
+    features["previous_10s_event_count"] = float(previous_count)
+    features["event_count_change"] = features["recent_10s_event_count"] - features["previous_10s_event_count"]
+
+    recent_end_x = ctx.end_x_stats(recent_lo, ctx.n)
+    previous_end_x = ctx.end_x_stats(previous_lo, recent_lo)
+    features["recent_10s_mean_end_x"] = recent_end_x[0] if recent_end_x is not None else 0.0
+    features["previous_10s_mean_end_x"] = previous_end_x[0] if previous_end_x is not None else 0.0
+    features["end_x_change"] = features["recent_10s_mean_end_x"] - features["previous_10s_mean_end_x"]
+
+    features["recent_10s_success_rate"] = (
+        float(ctx.success_count(recent_lo, ctx.n) / recent_count) if recent_count else 0.0
+    )
+    features["previous_10s_success_rate"] = (
+        float(ctx.success_count(previous_lo, recent_lo) / previous_count) if previous_count else 0.0
+    )
+    features["success_rate_change"] = features["recent_10s_success_rate"] - features["previous_10s_success_rate"]
+
+
+DISPERSION_KEYS = ("end_x_variance", "end_x_std", "end_y_variance", "end_y_std", "attack_trend")
+
+
+def _dispersion(ctx: WindowContext, features: Features) -> None:
+    """좌표 분산과 시간 트렌드 (최근 이벤트가 더 공격적인지)"""
+    if ctx.n <= 1:
+        _zeros(features, DISPERSION_KEYS)
+        return
+    for axis, values in (("end_x", ctx.end_x), ("end_y", ctx.end_y)):
+        values = values[~np.isnan(values)]
+        if len(values) > 1:
+            features[f"{axis}_variance"] = float(np.var(values, ddof=1))
+            features[f"{axis}_std"] = float(np.std(values, ddof=1))
+        else:
+            features[f"{axis}_variance"] = 0.0
+            features[f"{axis}_std"] = 0.0
+
+    features["attack_trend"] = 0.0
+    if ctx.n >= 3:
+        # 기존 구현과 같은 구간: 앞 n//3개, 뒤 iloc[-n//3:] (= 올림 n/3개)
+        first_mean_x = nanmean(ctx.end_x[: ctx.n // 3])
+        last_mean_x = nanmean(ctx.end_x[-ctx.n // 3:])
+        if first_mean_x is not None and last_mean_x is not None:
+            features["attack_trend"] = last_mean_x - first_mean_x
+
+
+def _statsbomb_pressure(ctx: WindowContext, features: Features) -> None:
+    """StatsBomb 압박 이벤트 피처 (압박 통합 데이터에서만 값이 있음)"""
+    extras = ctx.events.extras
+    counts = extras.get("pressure_event_count")
+    if counts is None or np.isnan(counts).all():
+        _zeros(features, [name for name, _, _ in STATSBOMB_FEATURES])
+        return
+    for name, column, how in STATSBOMB_FEATURES:
+        values = extras[column]
+        if how == "sum":
+            features[name] = float(np.nansum(values))
+        elif how == "mean":
+            mean = nanmean(values)
+            features[name] = mean if mean is not None else float("nan")
+        else:
+            features[name] = float(np.nanmax(values)) if not np.isnan(values).all() else float("nan")
+
+
+PRESSURE_PROXY_KEYS = ("pressure_proxy_failure_rate", "pressure_proxy_failure_density", "pressure_proxy_rapid_turnover")
+
+
+def _pressure_proxy(ctx: WindowContext, features: Features) -> None:
+    """이벤트 로그만으로 추정하는 압박 지표"""
+    # 실패 이벤트 밀도 (높을수록 압박 가능성)
+    features["pressure_proxy_failure_rate"] = features["unsuccessful_count"] / features["event_count"]
+
+    # 연속 3개 이벤트가 5초 이내일 때 초당 실패 수의 최댓값
+    features["pressure_proxy_failure_density"] = failure_density(
+        ctx.time, ctx.is_unsuccessful.astype(np.int64), PRESSURE_WINDOW_SECONDS
+    )
+
+    # 턴오버(team_id 변화) 후 5초 내 재턴오버 횟수
+    rapid = rapid_repeats(ctx.time[ctx.team_changed], PRESSURE_WINDOW_SECONDS) if ctx.has_team else 0
+    features["pressure_proxy_rapid_turnover"] = float(rapid)
+
+
+INTERACTION_KEYS = (
+    "pass_success_interaction",
+    "pass_success_ratio",
+    "final_third_event_density",
+    "penalty_area_event_density",
+    "forward_final_third_interaction",
+    "event_rate_success_interaction",
+    "penetration_depth",
+    "center_attack_interaction",
+    "pressure_attack_interaction",
+    "pressure_trend_interaction",
+    "variance_attack_interaction",
+    "variance_trend_interaction",
+)
+
+
+def _interactions(ctx: WindowContext, features: Features) -> None:
+    """주요 피처 쌍의 곱/비율/차이"""
+    if features["pass_count"] > 0:
+        features["pass_success_interaction"] = features["pass_count"] * features["success_rate"]
+        features["pass_success_ratio"] = features["successful_count"] / features["pass_count"]
+    else:
+        features["pass_success_interaction"] = 0.0
+        features["pass_success_ratio"] = 0.0
+    features["final_third_event_density"] = features["final_third_entries"] / features["event_count"]
+    features["penalty_area_event_density"] = features["penalty_area_entries"] / features["event_count"]
+    features["forward_final_third_interaction"] = (
+        features["forward_ratio"] * features["final_third_entries"] if features["forward_ratio"] > 0 else 0.0
+    )
+    features["event_rate_success_interaction"] = features["event_rate"] * features["success_rate"]
+    features["penetration_depth"] = features["final_third_entries"] - features["penalty_area_entries"]
+    features["center_attack_interaction"] = features["center_ratio"] * features["final_third_entries"]
+    features["pressure_attack_interaction"] = (
+        features["pressure_proxy_failure_rate"] * features["final_third_entries"]
+    )
+    features["pressure_trend_interaction"] = features["pressure_proxy_failure_density"] * features["attack_trend"]
+    features["variance_attack_interaction"] = features["end_x_std"] * features["final_third_entries"]
+    features["variance_trend_interaction"] = features["end_x_std"] * abs(features["attack_trend"])
+
+
+FeatureGroup = Callable[[WindowContext, Features], None]
+
+FEATURE_GROUPS: Tuple[Tuple[str, FeatureGroup], ...] = (
+    ("basic", _basic_stats),
+    ("types", _type_counts),
+    ("results", _result_stats),
+    ("passes", _pass_geometry),
+    ("penetration", _penetration),
+    ("possession", _possession),
+    ("multi_scale", _multi_scale),
+    ("recent_events", _recent_events),
+    ("intervals", _interval_stats),
+    ("recent_vs_previous", _recent_vs_previous),
+    ("dispersion", _dispersion),
+    ("statsbomb", _statsbomb_pressure),
+    ("pressure_proxy", _pressure_proxy),
+    ("interactions", _interactions),
+)
+
+# 그룹별 고정 피처 키 (types 그룹은 여기에 더해 type_* 동적 컬럼을 만든다)
+GROUP_KEYS: Dict[str, Tuple[str, ...]] = {
+    "basic": ("event_count", "time_span", "event_rate"),
+    "types": tuple(f"{name.lower()}_count" for name in BASE_TYPES),
+    "results": (
+        "successful_count",
+        "unsuccessful_count",
+        "unknown_result_count",
+        "success_rate",
+        "success_rate_with_unknown",
+    ),
+    "passes": PASS_KEYS,
+    "penetration": ("final_third_entries", "penalty_area_entries"),
+    "possession": ("possession_changes",),
+    "multi_scale": tuple(chain.from_iterable(map(_multi_scale_keys, MULTI_SCALE_SECONDS))),
+    "recent_events": tuple(chain.from_iterable(map(_recent_event_keys, RECENT_EVENT_COUNTS))),
+    "intervals": INTERVAL_KEYS,
+    "recent_vs_previous": RECENT_VS_PREVIOUS_KEYS,
+    "dispersion": DISPERSION_KEYS,
+    "statsbomb": tuple(name for name, _, _ in STATSBOMB_FEATURES),
+    "pressure_proxy": PRESSURE_PROXY_KEYS,
+    "interactions": INTERACTION_KEYS,
+}
+
+# 그룹이 읽는 앞 그룹의 피처
+GROUP_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "results": ("basic",),
+    "pressure_proxy": ("basic", "results"),
+    "interactions": ("basic", "types", "results", "passes", "penetration", "dispersion", "pressure_proxy"),
+}
+
+# EventPrefix 누적 배열을 읽는 그룹 (이 중 하나라도 계산하면 윈도우마다 prefix를 만든다)
+PREFIX_GROUPS = ("multi_scale", "recent_events", "recent_vs_previous")
+
+_KEY_GROUPS = {key: name for name, keys in GROUP_KEYS.items() for key in keys}
+
+
+def feature_group(column: str) -> Optional[str]:
+    """피처 컬럼을 만드는 그룹 이름 (엔진 피처가 아니면 None)"""
+    if column in _KEY_GROUPS:
+        return _KEY_GROUPS[column]
+    # type_feature_name이 만드는 동적 컬럼: type_<이름>_count
+    return "types" if column.startswith("type_") and column.endswith("_count") else None
+
+
+@lru_cache(maxsize=32)
+def _groups_for(columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    pending = [group for group in map(feature_group, columns) if group is not None]
+    needed = set()
+    while pending:
+        group = pending.pop()
+        if group not in needed:
+            needed.add(group)
+            pending.extend(GROUP_DEPENDENCIES.get(group, ()))
+    return tuple(name for name, _ in FEATURE_GROUPS if name in needed)
+
+
+def groups_for(feature_columns: Sequence[str]) -> Tuple[str, ...]:
+    """feature_columns를 채우는 데 필요한 그룹 (의존 그룹 포함, FEATURE_GROUPS 순서)"""
+    return _groups_for(tuple(feature_columns))
+
+
+def empty_features() -> Features:
+    """빈 윈도우용 기본 피처 (type_* 동적 컬럼 없음)"""
+    return dict.fromkeys(chain.from_iterable(GROUP_KEYS.values()), 0.0)
+
+
+def prefix_for(events: EventBatch) -> EventPrefix:
+    """구간 통계 피처가 쓰는 누적 배열 (경기 전체 batch로 만들면 윈도우 간 공유 가능)"""
+    return EventPrefix(events, SEQUENCE_TYPES)
+
+
+def extract_features(
+    events: EventBatch,
+    prefix: Optional[EventPrefix] = None,
+    offset: int = 0,
+    groups: Optional[Collection[str]] = None,
+) -> Features:
+    """이벤트 윈도우(시간순)에서 피처 추출
+
+    prefix를 주면 events는 prefix를 만든 batch의 [offset, offset + len(events)) 구간이어야 한다.
+    groups를 주면 그 그룹만 계산한다 (의존 그룹까지 포함해야 함, groups_for 참고).
+    """
+    if len(events) == 0:
+        return empty_features()
+    ctx = WindowContext(events, prefix, offset)
+    features: Features = {}
+    for name, group in FEATURE_GROUPS:
+        if groups is None or name in groups:
+            group(ctx, features)
+    return features
+
+
+def window_feature_vector(events: EventBatch, feature_columns: Sequence[str]) -> np.ndarray:
+    """feature_columns 순서의 (1, n) 피처 벡터 (모델 입력용, 필요한 그룹만 계산)"""
+    return feature_vector(extract_features(events, groups=groups_for(feature_columns)), feature_columns)
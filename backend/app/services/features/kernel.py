@@ -0,0 +1,75 @@
+"""
+피처 계산용 NumPy 기본 연산
+
+engine의 피처 그룹들이 공유하는 배열 연산 모음.
+pandas(value_counts, mean/std/var의 skipna, ddof=1)와 같은 결과를 내도록 맞춘다.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+def type_feature_name(type_name: str) -> str:
+    return f"type_{type_name.lower().replace(' ', '_')}_count"
+
+
+def label_counts(vocab: np.ndarray, codes: np.ndarray) -> Dict[str, int]:
+    """value_counts()와 같은 순서(빈도 내림차순, 동률이면 처음 등장한 순)의 라벨별 개수"""
+    if not len(codes):
+        return {}
+    present, first_idx = np.unique(codes, return_index=True)
+    counts = np.bincount(codes, minlength=len(vocab))[present]
+    order = np.lexsort((first_idx, -counts))
+    return {str(vocab[present[i]]): int(counts[i]) for i in order}
+
+
+def label_mask(vocab: np.ndarray, codes: np.ndarray, label: str) -> np.ndarray:
+    """codes 중 label에 해당하는 행 마스크 (vocab에 없으면 전부 False)"""
+    hits = np.flatnonzero(vocab == label)
+    if not len(hits):
+        return np.zeros(len(codes), dtype=bool)
+    return codes == hits[0]
+
+
+def nanmean(values: np.ndarray) -> Optional[float]:
+    """결측 제외 평균. 값이 하나도 없으면 None"""
+    valid = ~np.isnan(values)
+    count = int(np.count_nonzero(valid))
+    if not count:
+        return None
+    return float(np.where(valid, values, 0.0).sum() / count)
+
+
+def sample_std(values: np.ndarray) -> float:
+    """pandas Series.std() (ddof=1), 값이 하나 이하면 0.0"""
+    return float(np.std(values, ddof=1)) if len(values) > 1 else 0.0
+
+
+def failure_density(time: np.ndarray, failures: np.ndarray, max_span: float) -> float:
+    """연속 3개 이벤트가 max_span초 이내인 구간들의 초당 실패 수 최댓값 (해당 구간이 없으면 0.0)
+
+    구간 길이가 0이면 그 구간 값은 0.0으로 본다.
+    """
+    if len(time) < 3:
+        return 0.0
+    span = time[2:] - time[:-2]
+    in_range = span <= max_span
+    if not in_range.any():
+        return 0.0
+    span = span[in_range]
+    counts = (failures[:-2] + failures[1:-1] + failures[2:])[in_range]
+    density = np.divide(counts, span, out=np.zeros(len(span), dtype=np.float64), where=span > 0)
+    return float(density.max())
+
+
+def rapid_repeats(change_times: np.ndarray, max_gap: float) -> int:
+    """연속한 변화 시각 간격이 max_gap초 이하인 횟수"""
+    return int(np.count_nonzero(np.diff(change_times) <= max_gap))
+
+
+def feature_vector(features: Dict[str, float], feature_columns: Sequence[str]) -> np.ndarray:
+    """feature_columns 순서의 (1, n) 벡터. 없는 피처는 0.0"""
+    return np.fromiter(
+        (features.get(col, 0.0) for col in feature_columns), dtype=np.float64, count=len(feature_columns)
+    ).reshape(1, -1)
@@ -0,0 +1,94 @@
+"""
+행 구간 통계용 누적 배열
+
+경기(또는 윈도우) 전체에 대해 타입별 개수·성공 수·end_x 합·시간 간격 합의
+prefix sum과 end_x 구간 최댓값용 sparse table을 한 번 만들어 두고,
+임의의 행 구간 [lo, hi) 통계를 O(1)에 돌려준다.
+
+데이터셋 빌더는 경기 단위로 한 번 만들어 겹치는 윈도우들이 공유하고,
+실시간 세션은 윈도우마다 새로 만든다.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.event import EventBatch
+from app.services.features.kernel import label_mask, sample_std
+
+# 누적합 차이로 구한 분산이 이보다 작으면 상쇄 오차가 커지므로 구간을 직접 계산한다
+_VARIANCE_FLOOR = 1e-6
+
+
+def _cumsum(values: np.ndarray, dtype) -> np.ndarray:
+    out = np.zeros(len(values) + 1, dtype=dtype)
+    np.cumsum(values, dtype=dtype, out=out[1:])
+    return out
+
+
+class _SparseMax:
+    """구간 최댓값 (O(n log n) 생성, O(1) 조회)"""
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.levels = [values]
+        width = 1
+        while width * 2 <= len(values):
+            prev = self.levels[-1]
+            self.levels.append(np.maximum(prev[:-width], prev[width:]))
+            width *= 2
+
+    def query(self, lo: int, hi: int) -> float:
+        level = (hi - lo).bit_length() - 1
+        table = self.levels[level]
+        return float(max(table[lo], table[hi - (1 << level)]))
+
+
+class EventPrefix:
+    """EventBatch 하나에 대한 누적 배열 (인덱스는 이 batch의 행 위치)"""
+
+    def __init__(self, events: EventBatch, type_names: Sequence[str]) -> None:
+        self.time = events.time_seconds.astype(np.float64, copy=False)
+        self.type_counts = {
+            name: _cumsum(label_mask(events.type_vocab, events.type_codes, name), np.int64) for name in type_names
+        }
+        self.successes = _cumsum(label_mask(events.result_vocab, events.result_codes, "Successful"), np.int64)
+
+        end_x = events.end_x.astype(np.float64)
+        valid = ~np.isnan(end_x)
+        self.end_x_count = _cumsum(valid, np.int64)
+        self.end_x_sum = _cumsum(np.where(valid, end_x, 0.0), np.float64)
+        self.end_x_max = _SparseMax(np.where(valid, end_x, -np.inf))
+
+        gaps = np.diff(self.time)
+        self.gap_sum = _cumsum(gaps, np.float64)
+        self.gap_sq_sum = _cumsum(gaps * gaps, np.float64)
+
+    def type_count(self, name: str, lo: int, hi: int) -> int:
+        counts = self.type_counts[name]
+        return int(counts[hi] - counts[lo])
+
+    def success_count(self, lo: int, hi: int) -> int:
+        return int(self.successes[hi] - self.successes[lo])
+
+    def end_x_stats(self, lo: int, hi: int) -> Optional[Tuple[float, float]]:
+        """구간 end_x의 (결측 제외 평균, 최댓값). 값이 하나도 없으면 None"""
+        count = int(self.end_x_count[hi] - self.end_x_count[lo])
+        if not count:
+            return None
+        mean = float((self.end_x_sum[hi] - self.end_x_sum[lo]) / count)
+        return mean, self.end_x_max.query(lo, hi)
+
+    def interval_stats(self, lo: int, hi: int) -> Tuple[float, float]:
+        """구간 이벤트 간격의 (평균, 표본 표준편차). 이벤트가 하나 이하면 (0, 0)"""
+        gaps = hi - lo - 1
+        if gaps < 1:
+            return 0.0, 0.0
+        mean = float(self.time[hi - 1] - self.time[lo]) / gaps
+        if gaps < 2:
+            return mean, 0.0
+        total = float(self.gap_sum[hi - 1] - self.gap_sum[lo])
+        variance = (float(self.gap_sq_sum[hi - 1] - self.gap_sq_sum[lo]) - total * total / gaps) / (gaps - 1)
+        if variance < _VARIANCE_FLOOR:
+            return mean, sample_std(np.diff(self.time[lo:hi]))
+        return mean, float(np.sqrt(variance))
+
@@ -2,7 +2,9 @@ import csv
 import time
 from typing import List, Optional, Tuple
 
-from app.schemas.event import EventRecord
+from app.schemas.event import EventBatch, EventRecord
+from app.services.data.event_cache import to_float, to_int
+from app.services.data.game_store import get_game_store
 from app.services.ingest.base import IngestSource
 
 
@@ -13,20 +15,23 @@ class EventIngestSource(IngestSource):
         self.csv_path = csv_path
         self.game_id = game_id
         self.playback_speed = playback_speed if playback_speed > 0 else 1.0
-        self._events: List[EventRecord] = []
+        # 경기 전체 EventBatch (GameStore 공유본, CSV 대체 경로에서는 세션 전용)
+        self._batch: Optional[EventBatch] = None
+        self._shared = False
         self._cursor = 0
         self._last_ts: Optional[float] = None
 
     def open(self) -> None:
+        self.close()
         self._load_events()
         self._cursor = 0
         self._last_ts = None
 
     def read_frame(self) -> Optional[Tuple[EventRecord, float]]:
-        if self._cursor >= len(self._events):
+        if self._batch is None or self._cursor >= len(self._batch):
             return None
 
-        event = self._events[self._cursor]
+        event = self._batch.record(self._cursor)
         self._cursor += 1
         current_ts = float(event.time_seconds)
 
@@ -38,11 +43,32 @@ class EventIngestSource(IngestSource):
         return event, current_ts
 
     def close(self) -> None:
-        self._events = []
+        if self._shared:
+            get_game_store().release(self.csv_path, self.game_id, self._batch)
+        self._batch = None
+        self._shared = False
         self._cursor = 0
         self._last_ts = None
 
+    @property
+    def batch(self) -> Optional[EventBatch]:
+        """경기 전체 이벤트 (읽기 전용, 시간순)"""
+        return self._batch
+
+    @property
+    def cursor(self) -> int:
+        """다음에 읽을 행 번호 (= 지금까지 내보낸 이벤트 수)"""
+        return self._cursor
+
     def _load_events(self) -> None:
+        try:
+            self._batch = get_game_store().acquire(self.csv_path, self.game_id)
+            self._shared = self._batch is not None
+        except OSError:
+            # 캐시 디렉터리를 쓸 수 없으면 CSV 직접 스캔으로 대체
+            self._batch = EventBatch.from_records(self._load_events_from_csv(), game_id=self.game_id)
+
+    def _load_events_from_csv(self) -> List[EventRecord]:
         with open(self.csv_path, "r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             rows = [
@@ -53,14 +79,14 @@ class EventIngestSource(IngestSource):
         events: List[EventRecord] = []
         for row in rows:
             try:
-                start_x = _try_float(row.get("start_x"))
-                start_y = _try_float(row.get("start_y"))
-                end_x = _try_float(row.get("end_x"))
-                end_y = _try_float(row.get("end_y"))
+                start_x = to_float(row.get("start_x"))
+                start_y = to_float(row.get("start_y"))
+                end_x = to_float(row.get("end_x"))
+                end_y = to_float(row.get("end_y"))
                 
                 # dx, dy 계산 (Track2에 있으면 사용, 없으면 계산)
-                dx = _try_float(row.get("dx"))
-                dy = _try_float(row.get("dy"))
+                dx = to_float(row.get("dx"))
+                dy = to_float(row.get("dy"))
                 if dx is None and start_x is not None and end_x is not None:
                     dx = end_x - start_x
                 if dy is None and start_y is not None and end_y is not None:
@@ -69,8 +95,8 @@ class EventIngestSource(IngestSource):
                 events.append(
                     EventRecord(
                         game_id=row.get("game_id", ""),
-                        game_episode=_try_int(row.get("game_episode")),
-                        action_id=_try_int(row.get("action_id")),
+                        game_episode=to_int(row.get("game_episode")),
+                        action_id=to_int(row.get("action_id")),
                         time_seconds=float(row.get("time_seconds", 0.0)),
                         type_name=row.get("type_name", ""),
                         result_name=row.get("result_name", ""),
@@ -78,9 +104,9 @@ class EventIngestSource(IngestSource):
                         start_y=start_y,
                         end_x=end_x,
                         end_y=end_y,
-                        team_id=_try_int(row.get("team_id")),
-                        player_id=_try_int(row.get("player_id")),
-                        period_id=_try_int(row.get("period_id")),
+                        team_id=to_int(row.get("team_id")),
+                        player_id=to_int(row.get("player_id")),
+                        period_id=to_int(row.get("period_id")),
                         dx=dx,
                         dy=dy,
                     )
@@ -88,22 +114,5 @@ class EventIngestSource(IngestSource):
             except ValueError:
                 continue
         events.sort(key=lambda e: (e.time_seconds, e.action_id or 0))
-        self._events = events
-
-
-def _try_float(value: Optional[str]) -> Optional[float]:
-    if value is None or value == "":
-        return None
-    try:
-        return float(value)
-    except ValueError:
-        return None
-
+        return events
 
-def _try_int(value: Optional[str]) -> Optional[int]:
-    if value is None or value == "":
-        return None
-    try:
-        return int(value)
-    except ValueError:
-        return None
@@ -0,0 +1,125 @@
+"""
+규칙 기반 탐지기용 증분 집계
+
+EventWindow에 이벤트가 들어오고(add_record) 밀려날 때(remove_rows) 해당 행만 반영해
+build_up_bias / transition_risk / final_third_pressure 판단에 필요한
+합계·카운트를 유지한다. 평가 시점에는 집계값만 읽으므로 O(1)이다.
+
+이벤트는 시간순으로 들어온다고 가정한다 (EventWindow와 동일).
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.schemas.event import EventRecord
+
+FOLLOWUP_SECONDS = 8.0
+# 좌표는 float32로 저장되므로 채널 경계도 float32로 맞춰 비교 (배열 비교와 동일한 결과)
+RIGHT_CHANNEL_Y = float(np.float32(68 * 2 / 3))
+LEFT_CHANNEL_Y = float(np.float32(68 / 3))
+
+
+def _float32(value: Optional[float]) -> float:
+    # EventWindow 버퍼와 같은 float32 값으로 더해야 밀려날 때 정확히 상쇄된다
+    return float("nan") if value is None else float(np.float32(value))
+
+
+# remove_rows가 받는 행 튜플의 컬럼 순서
+ROW_COLUMNS = ("time_seconds", "type_name", "result_name", "start_x", "start_y", "end_x")
+
+# (build_up 대상, 턴오버 타입, 슈팅)
+_TypeFlags = Tuple[bool, bool, bool]
+
+
+class WindowAggregates:
+    def __init__(self) -> None:
+        # build_up_bias: start_x/end_x가 있는 Pass/Carry
+        self.pass_count = 0
+        self.pass_dx_sum = 0.0
+        self.right_channel = 0
+        self.left_channel = 0
+        self.center_channel = 0
+        # final_third_pressure: end_x > 70
+        self.final_third_entries = 0
+        # transition_risk: 윈도우 안 턴오버 수와 가장 늦은 턴오버
+        self.turnover_count = 0
+        self.last_turnover_ts: Optional[float] = None
+        self.last_turnover_x = 0.0
+        self.followup_attacks = 0
+        self._type_flags: Dict[str, _TypeFlags] = {}
+
+    def add_record(self, event: EventRecord) -> None:
+        """방금 들어온 이벤트 하나를 배치 없이 반영 (세션의 이벤트당 경로)"""
+        self._apply_row(
+            event.time_seconds,
+            event.type_name or "",
+            event.result_name or "",
+            _float32(event.start_x),
+            _float32(event.start_y),
+            _float32(event.end_x),
+            1,
+        )
+
+    def remove_rows(self, rows: Iterable[tuple]) -> None:
+        """EventWindow.rows(evicted, ROW_COLUMNS)로 읽은 밀려난 행들을 뺀다"""
+        for ts, type_name, result_name, start_x, start_y, end_x in rows:
+            self._apply_row(ts, type_name, result_name, start_x, start_y, end_x, -1)
+
+    def mean_pass_dx(self) -> float:
+        return self.pass_dx_sum / self.pass_count if self.pass_count else 0.0
+
+    def _flags(self, type_name: str) -> _TypeFlags:
+        flags = self._type_flags.get(type_name)
+        if flags is None:
+            lowered = type_name.lower()
+            flags = self._type_flags[type_name] = (
+                lowered in {"pass", "carry"},
+                "turnover" in lowered,
+                lowered == "shot",
+            )
+        return flags
+
+    def _apply_row(
+        self, ts: float, type_name: str, result_name: str, start_x: float, start_y: float, end_x: float, sign: int
+    ) -> None:
+        is_pass, is_turnover_type, is_shot = self._flags(type_name)
+
+        if is_pass and start_x == start_x and end_x == end_x:
+            self.pass_count += sign
+            self.pass_dx_sum += sign * (end_x - start_x)
+            if start_y > RIGHT_CHANNEL_Y:
+                self.right_channel += sign
+            elif start_y < LEFT_CHANNEL_Y:
+                self.left_channel += sign
+            elif start_y == start_y:
+                self.center_channel += sign
+            if self.pass_count == 0:
+                # 빈 윈도우에서 부동소수 누적 오차 초기화
+                self.pass_dx_sum = 0.0
+
+        if end_x > 70:
+            self.final_third_entries += sign
+
+        is_turnover = is_turnover_type or result_name.lower() == "unsuccessful"
+        if sign > 0:
+            if is_turnover and (self.last_turnover_ts is None or ts > self.last_turnover_ts):
+                # 동시각 턴오버는 먼저 들어온 것을 유지
+                self.last_turnover_ts = ts
+                self.last_turnover_x = (
+                    end_x if end_x == end_x and end_x else (start_x if start_x == start_x and start_x else 0.0)
+                )
+                self.followup_attacks = 0
+            if (
+                self.last_turnover_ts is not None
+                and (is_shot or end_x > 88)
+                and self.last_turnover_ts < ts <= self.last_turnover_ts + FOLLOWUP_SECONDS
+            ):
+                self.followup_attacks += 1
+        if is_turnover:
+            self.turnover_count += sign
+            if self.turnover_count == 0:
+                # 가장 늦은 턴오버까지 밀려나면 후속 공격도 함께 빠진다
+                self.last_turnover_ts = None
+                self.last_turnover_x = 0.0
+                self.followup_attacks = 0
@@ -6,10 +6,9 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
 
 from app.core.config import get_settings
-from app.schemas.event import EventRecord
+from app.schemas.event import EventBatch, EventRecord
 from app.schemas.session import (
     Alert,
     AlertsResponse,
@@ -23,10 +22,14 @@ from app.schemas.session import (
     SessionStatusEvent,
     Severity,
 )
+from app.services.alerts.inference import get_inference_service
 from app.services.alerts.will_have_shot import get_will_have_shot_predictor
 from app.services.evidence.builder import get_evidence_builder
+from app.services.features.engine import window_feature_vector
 from app.services.ingest.base import IngestSource
 from app.services.ingest.factory import ingest_factory
+from app.services.sessions.detectors import ROW_COLUMNS, WindowAggregates
+from app.services.sessions.window import EventWindow
 from app.services.uploads.store import get_upload_store
 
 
@@ -128,7 +131,7 @@ class SessionManager:
                 pattern_type="build_up_bias",
                 severity=Severity.medium,
                 metrics={"flow_x_bias": 0.2},
-                events_slice=[],
+                events_slice=EventBatch.empty(),
             )
             state.alerts.append(alert)
             await self._push_status(state, SessionStatus.running, "Fallback alert generated")
@@ -149,9 +152,9 @@ class SessionManager:
             await self._push_status(state, SessionStatus.lost, "Ingest source missing")
             return
 
-        window: List[EventRecord] = []
+        window = EventWindow(window_seconds=45.0)
+        aggregates = WindowAggregates()
         last_eval_ts = 0.0
-        window_seconds = 45.0
 
         try:
             while state.session.status == SessionStatus.running:
@@ -161,12 +164,14 @@ class SessionManager:
                 event, ts = frame_data
                 if not isinstance(event, EventRecord):
                     continue
-                window.append(event)
-                window = [ev for ev in window if ts - ev.time_seconds <= window_seconds]
+                evicted = window.push(event)
+                if evicted:
+                    aggregates.remove_rows(window.rows(evicted, ROW_COLUMNS))
+                aggregates.add_record(event)
 
                 if ts - last_eval_ts >= 1.0:
                     last_eval_ts = ts
-                    await self._evaluate_event_alerts(state, window, ts)
+                    await self._evaluate_event_alerts(state, window.view(), ts, aggregates)
                 await asyncio.sleep(0)
         except asyncio.CancelledError:  # pragma: no cover - cooperative cancel
             pass
@@ -214,9 +219,11 @@ class SessionManager:
         )
         state.status_events.append(event)
 
-    async def _evaluate_event_alerts(self, state: SessionState, window: List[EventRecord], ts: float) -> None:
+    async def _evaluate_event_alerts(
+        self, state: SessionState, window: EventBatch, ts: float, aggregates: WindowAggregates
+    ) -> None:
         patterns_triggered = False
-        build_up = self._detect_build_up_bias(window)
+        build_up = self._detect_build_up_bias(aggregates)
         if build_up:
             severity, metrics = build_up
             if self._should_emit(state, "build_up_bias", ts):
@@ -234,7 +241,7 @@ class SessionManager:
                     patterns_triggered = True
                     await self._push_status(state, SessionStatus.running, "build_up_bias alert generated")
 
-        transition = self._detect_transition_risk(window)
+        transition = self._detect_transition_risk(aggregates)
         if transition:
             severity, metrics = transition
             if self._should_emit(state, "transition_risk", ts):
@@ -252,7 +259,7 @@ class SessionManager:
                     patterns_triggered = True
                     await self._push_status(state, SessionStatus.running, "transition_risk alert generated")
 
-        pressure = self._detect_final_third_pressure(window)
+        pressure = self._detect_final_third_pressure(aggregates)
         if pressure:
             severity, metrics = pressure
             if self._should_emit(state, "final_third_pressure", ts):
@@ -274,8 +281,10 @@ class SessionManager:
         predictor = get_will_have_shot_predictor()
         if predictor.is_active and len(window) > 0:
             try:
-                features = self._extract_features_for_ml(window)
-                proba = predictor.predict_proba(features)
+                # 다른 세션 요청과 한 배치로 묶여 worker thread에서 예측된다
+                proba = await get_inference_service().submit(
+                    window_feature_vector(window, predictor.feature_columns)
+                )
                 if proba is not None and predictor.should_alert(proba):
                     if self._should_emit(state, "will_have_shot", ts, cooldown=15.0):
                         metrics = {
@@ -299,7 +308,7 @@ class SessionManager:
                 # ML 예측 실패해도 서비스는 계속 동작
                 print(f"WillHaveShotPredictor: Error during prediction: {e}")
 
-        if not patterns_triggered and ts >= 30 and not state.alerts and window:
+        if not patterns_triggered and ts >= 30 and not state.alerts and len(window) > 0:
             if self._settings.demo_mode:
                 metrics = self._demo_metrics(window)
             else:
@@ -317,26 +326,18 @@ class SessionManager:
                 state.last_pattern_ts["build_up_bias"] = ts
                 await self._push_status(state, SessionStatus.running, "fallback alert generated")
 
-    def _detect_build_up_bias(self, window: List[EventRecord]) -> Optional[Tuple[Severity, Dict[str, float]]]:
-        passes = [
-            ev
-            for ev in window
-            if (ev.type_name or "").lower() in {"pass", "carry"} and ev.start_x is not None and ev.end_x is not None
-        ]
-        if len(passes) < 8:
+    def _detect_build_up_bias(self, aggregates: WindowAggregates) -> Optional[Tuple[Severity, Dict[str, float]]]:
+        pass_count = aggregates.pass_count
+        if pass_count < 8:
             return None
-        dx = [ev.end_x - ev.start_x for ev in passes]
-        mean_dx = sum(dx) / len(dx)
-        right_channel = sum(1 for ev in passes if ev.start_y is not None and ev.start_y > (68 * 2 / 3))
-        left_channel = sum(1 for ev in passes if ev.start_y is not None and ev.start_y < (68 / 3))
-        total_channel = right_channel + left_channel + sum(
-            1 for ev in passes if ev.start_y is not None and (68 / 3) <= ev.start_y <= (68 * 2 / 3)
-        )
+        mean_dx = aggregates.mean_pass_dx()
+        right_channel = aggregates.right_channel
+        total_channel = right_channel + aggregates.left_channel + aggregates.center_channel
         right_ratio = right_channel / total_channel if total_channel else 0.0
         metrics = {
             "mean_dx": float(mean_dx),
             "right_channel_ratio": float(right_ratio),
-            "event_count": float(len(passes)),
+            "event_count": float(pass_count),
         }
         severity: Optional[Severity] = None
         if abs(mean_dx) > 8 or right_ratio > 0.6:
@@ -345,43 +346,29 @@ class SessionManager:
             severity = Severity.medium
         return (severity, metrics) if severity else None
 
-    def _detect_transition_risk(self, window: List[EventRecord]) -> Optional[Tuple[Severity, Dict[str, float]]]:
-        if not window:
-            return None
-        turnover_candidates = [
-            ev
-            for ev in window
-            if (ev.result_name or "").lower() == "unsuccessful"
-            or "turnover" in (ev.type_name or "").lower()
-        ]
-        if not turnover_candidates:
-            return None
-        last_turnover = max(turnover_candidates, key=lambda ev: ev.time_seconds)
-        followups = [
-            ev
-            for ev in window
-            if last_turnover.time_seconds < ev.time_seconds <= last_turnover.time_seconds + 8
-            and (ev.type_name.lower() == "shot" or (ev.end_x is not None and ev.end_x > 88))
-        ]
-        if not followups:
+    def _detect_transition_risk(self, aggregates: WindowAggregates) -> Optional[Tuple[Severity, Dict[str, float]]]:
+        followups = aggregates.followup_attacks
+        if aggregates.last_turnover_ts is None or not followups:
             return None
         metrics = {
-            "turnover_x": float(last_turnover.end_x or last_turnover.start_x or 0.0),
-            "followup_attack_count": float(len(followups)),
+            "turnover_x": float(aggregates.last_turnover_x),
+            "followup_attack_count": float(followups),
         }
-        severity = Severity.high if len(followups) >= 2 else Severity.medium
+        severity = Severity.high if followups >= 2 else Severity.medium
         return severity, metrics
 
-    def _detect_final_third_pressure(self, window: List[EventRecord]) -> Optional[Tuple[Severity, Dict[str, float]]]:
-        entries = [ev for ev in window if ev.end_x is not None and ev.end_x > 70]
-        if len(entries) < 5:
+    def _detect_final_third_pressure(
+        self, aggregates: WindowAggregates
+    ) -> Optional[Tuple[Severity, Dict[str, float]]]:
+        entries = aggregates.final_third_entries
+        if entries < 5:
             return None
-        metrics = {"final_third_entries": float(len(entries))}
-        severity = Severity.high if len(entries) >= 10 else Severity.medium
+        metrics = {"final_third_entries": float(entries)}
+        severity = Severity.high if entries >= 10 else Severity.medium
         return severity, metrics
 
-    def _events_for_evidence(self, window: List[EventRecord], ts: float) -> List[EventRecord]:
-        return [ev for ev in window if abs(ev.time_seconds - ts) <= 5]
+    def _events_for_evidence(self, window: EventBatch, ts: float) -> EventBatch:
+        return window.time_range(ts - 5, ts + 5)
 
     def _should_emit(self, state: SessionState, pattern_type: str, ts: float, cooldown: float = 8.0) -> bool:
         last_ts = state.last_pattern_ts.get(pattern_type)
@@ -389,170 +376,17 @@ class SessionManager:
             return True
         return (ts - last_ts) >= cooldown
 
-    def _extract_features_for_ml(self, window: List[EventRecord]) -> Dict[str, float]:
-        """이벤트 윈도우에서 ML 모델용 피처 추출"""
-        if not window:
-            return self._empty_ml_features()
-        
-        # EventRecord 리스트를 DataFrame으로 변환
-        events_data = []
-        for ev in window:
-            events_data.append({
-                "time_seconds": ev.time_seconds,
-                "type_name": ev.type_name or "",
-                "result_name": ev.result_name or "",
-                "start_x": ev.start_x,
-                "start_y": ev.start_y,
-                "end_x": ev.end_x,
-                "end_y": ev.end_y,
-                "dx": ev.dx,
-                "dy": ev.dy,
-                "team_id": ev.team_id,
-            })
-        events = pd.DataFrame(events_data)
-        
-        features = {}
-        
-        # 1. 기본 통계
-        features["event_count"] = float(len(events))
-        time_span = float(events["time_seconds"].max() - events["time_seconds"].min())
-        features["time_span"] = time_span if time_span > 0 else 0.0
-        features["event_rate"] = features["event_count"] / features["time_span"] if features["time_span"] > 0 else 0.0
-        
-        # 2. 이벤트 타입별 카운트
-        type_counts = events["type_name"].value_counts()
-        features["pass_count"] = float(type_counts.get("Pass", 0))
-        features["carry_count"] = float(type_counts.get("Carry", 0))
-        features["shot_count"] = float(type_counts.get("Shot", 0))
-        features["duel_count"] = float(type_counts.get("Duel", 0))
-        features["interception_count"] = float(type_counts.get("Interception", 0))
-        
-        # EDA 상위 타입들도 자동 추가
-        top_types = type_counts.head(10).index.tolist()
-        for t in top_types:
-            if t not in ["Pass", "Carry", "Shot", "Duel", "Interception"]:
-                features[f"type_{t.lower().replace(' ', '_')}_count"] = float(type_counts.get(t, 0))
-        
-        # 3. result_name 기반
-        result_counts = events["result_name"].value_counts()
-        features["successful_count"] = float(result_counts.get("Successful", 0))
-        features["unsuccessful_count"] = float(result_counts.get("Unsuccessful", 0))
-        features["unknown_result_count"] = float(
-            (events["result_name"].isna() | (events["result_name"] == "")).sum()
-        )
-        total_with_result = features["successful_count"] + features["unsuccessful_count"]
-        features["success_rate"] = (
-            features["successful_count"] / total_with_result if total_with_result > 0 else 0.0
-        )
-        features["success_rate_with_unknown"] = (
-            features["successful_count"] / features["event_count"] if features["event_count"] > 0 else 0.0
-        )
-        
-        # 4. 패스/이동 공간 피처
-        passes = events[
-            (events["type_name"] == "Pass")
-            & events["start_x"].notna()
-            & events["end_x"].notna()
-        ].copy()
-        
-        if len(passes) > 0:
-            # dx, dy 계산
-            if "dx" in passes.columns and passes["dx"].notna().any():
-                dx_list = passes["dx"].dropna().tolist()
-            else:
-                dx_list = (passes["end_x"] - passes["start_x"]).dropna().tolist()
-            
-            if "dy" in passes.columns and passes["dy"].notna().any():
-                dy_list = passes["dy"].dropna().tolist()
-            else:
-                dy_list = (passes["end_y"] - passes["start_y"]).dropna().tolist()
-            
-            features["mean_dx"] = float(np.mean(dx_list)) if dx_list else 0.0
-            features["mean_dy"] = float(np.mean(dy_list)) if dy_list else 0.0
-            features["std_dx"] = float(np.std(dx_list)) if dx_list else 0.0
-            features["std_dy"] = float(np.std(dy_list)) if dy_list else 0.0
-            features["forward_ratio"] = (
-                sum(1 for d in dx_list if d > 0) / len(dx_list) if dx_list else 0.0
-            )
-            
-            # 채널 분포 (y 좌표 기준, 0~68 스케일)
-            if passes["start_y"].notna().any():
-                right = (passes["start_y"] > 45.3).sum()
-                left = (passes["start_y"] < 22.7).sum()
-                total = len(passes)
-                features["right_ratio"] = right / total if total > 0 else 0.0
-                features["left_ratio"] = left / total if total > 0 else 0.0
-                features["center_ratio"] = 1.0 - features["right_ratio"] - features["left_ratio"]
-            else:
-                features["right_ratio"] = 0.0
-                features["left_ratio"] = 0.0
-                features["center_ratio"] = 0.0
-        else:
-            features["mean_dx"] = 0.0
-            features["mean_dy"] = 0.0
-            features["std_dx"] = 0.0
-            features["std_dy"] = 0.0
-            features["forward_ratio"] = 0.0
-            features["right_ratio"] = 0.0
-            features["left_ratio"] = 0.0
-            features["center_ratio"] = 0.0
-        
-        # 5. 침투 지표
-        features["final_third_entries"] = float(
-            (events["end_x"].notna() & (events["end_x"] > 70)).sum()
-        )
-        features["penalty_area_entries"] = float(
-            (events["end_x"].notna() & (events["end_x"] > 88)).sum()
-        )
-        
-        # 6. 볼 소유 변화
-        if "team_id" in events.columns and events["team_id"].notna().any():
-            team_changes = (events["team_id"].diff() != 0).sum() - 1
-            features["possession_changes"] = float(max(0, team_changes))
-        else:
-            features["possession_changes"] = 0.0
-        
-        return features
-    
-    def _empty_ml_features(self) -> Dict[str, float]:
-        """빈 윈도우용 기본 피처"""
-        return {
-            "event_count": 0.0,
-            "time_span": 0.0,
-            "event_rate": 0.0,
-            "pass_count": 0.0,
-            "carry_count": 0.0,
-            "shot_count": 0.0,
-            "duel_count": 0.0,
-            "interception_count": 0.0,
-            "successful_count": 0.0,
-            "unsuccessful_count": 0.0,
-            "unknown_result_count": 0.0,
-            "success_rate": 0.0,
-            "success_rate_with_unknown": 0.0,
-            "mean_dx": 0.0,
-            "mean_dy": 0.0,
-            "std_dx": 0.0,
-            "std_dy": 0.0,
-            "forward_ratio": 0.0,
-            "right_ratio": 0.0,
-            "left_ratio": 0.0,
-            "center_ratio": 0.0,
-            "final_third_entries": 0.0,
-            "penalty_area_entries": 0.0,
-            "possession_changes": 0.0,
-        }
-
-    def _demo_metrics(self, window: List[EventRecord]) -> Dict[str, float]:
-        dx = [ev.end_x - ev.start_x for ev in window if ev.start_x is not None and ev.end_x is not None]
-        mean_dx = float(sum(dx) / len(dx)) if dx else 0.0
-        right_entries = [ev for ev in window if ev.end_x is not None and ev.end_x > 70]
-        shots = [ev for ev in window if (ev.type_name or "").lower() == "shot"]
+    def _demo_metrics(self, window: EventBatch) -> Dict[str, float]:
+        dx = (window.end_x.astype(np.float64) - window.start_x)
+        dx = dx[~np.isnan(dx)]
+        mean_dx = float(dx.mean()) if len(dx) else 0.0
+        right_entries = int((window.end_x > 70).sum())
+        shots = int(window.type_mask(lambda name: name.lower() == "shot").sum())
         return {
             "event_count": float(len(window)),
             "mean_dx": mean_dx,
-            "final_third_entries": float(len(right_entries)),
-            "shot_count": float(len(shots)),
+            "final_third_entries": float(right_entries),
+            "shot_count": float(shots),
         }
 
     def _try_create_alert(
@@ -562,7 +396,7 @@ class SessionManager:
         pattern_type: str,
         severity: Severity,
         metrics: Dict[str, float],
-        events_slice: List[EventRecord],
+        events_slice: EventBatch,
     ) -> Alert | None:
         alert_id = str(uuid.uuid4())
         try:
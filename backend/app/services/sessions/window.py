@@ -0,0 +1,132 @@
+"""
+세션용 시간 슬라이딩 윈도우
+
+이벤트를 컬럼 배열 버퍼에 뒤로 덧붙이고, 시간이 흐르면 앞쪽(head)만 옮겨
+오래된 이벤트를 밀어낸다. 이벤트당 경로는 밀려난 행 구간(range)만 돌려주고,
+현재 윈도우 뷰(EventBatch)는 평가 시점에만 복사 없이 꺼낸다.
+
+버퍼가 가득 차면 살아있는 구간만 새 버퍼로 옮기므로(기존 버퍼는 덮어쓰지 않음)
+이전에 꺼낸 뷰는 이후 push가 일어나도 그대로 유효하다.
+"""
+
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from app.schemas.event import CATEGORICAL_COLUMNS, FLOAT32_COLUMNS, INT32_COLUMNS, INT_MISSING, EventBatch, EventRecord
+
+_MIN_CAPACITY = 256
+
+
+class EventWindow:
+    def __init__(self, window_seconds: float, game_id: str = "") -> None:
+        self.window_seconds = window_seconds
+        self.game_id = game_id
+        self._head = 0
+        self._tail = 0
+        self._columns: Dict[str, np.ndarray] = self._allocate(_MIN_CAPACITY)
+        self._codes: Dict[str, Dict[str, int]] = {col: {} for col in CATEGORICAL_COLUMNS}
+        self._labels: Dict[str, List[str]] = {col: [] for col in CATEGORICAL_COLUMNS}
+        self._vocab: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _allocate(capacity: int) -> Dict[str, np.ndarray]:
+        columns = {"time_seconds": np.empty(capacity, dtype=np.float64)}
+        for col in FLOAT32_COLUMNS:
+            columns[col] = np.empty(capacity, dtype=np.float32)
+        for col in INT32_COLUMNS:
+            columns[col] = np.empty(capacity, dtype=np.int32)
+        for col in CATEGORICAL_COLUMNS:
+            columns[f"{col}_codes"] = np.empty(capacity, dtype=np.int16)
+        return columns
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def push(self, event: EventRecord) -> range:
+        """이벤트를 넣고 윈도우를 event.time_seconds 기준으로 갱신
+
+        반환값은 이번에 밀려난 이벤트들의 버퍼 행 구간 (증분 집계용, rows()로 읽는다).
+        EventBatch를 만들지 않으므로 이벤트당 비용이 작다.
+        """
+        if not self.game_id:
+            self.game_id = event.game_id
+        if self._tail == len(self._columns["time_seconds"]):
+            self._reallocate()
+
+        row = self._tail
+        columns = self._columns
+        columns["time_seconds"][row] = event.time_seconds
+        for col in FLOAT32_COLUMNS:
+            value = getattr(event, col)
+            columns[col][row] = np.nan if value is None else value
+        for col in INT32_COLUMNS:
+            value = getattr(event, col)
+            columns[col][row] = INT_MISSING if value is None else value
+        for col in CATEGORICAL_COLUMNS:
+            columns[f"{col}_codes"][row] = self._code(col, getattr(event, col) or "")
+        self._tail += 1
+        return self.advance(event.time_seconds)
+
+    def advance(self, ts: float) -> range:
+        """ts - time_seconds > window_seconds 인 앞쪽 이벤트 제거 후 제거된 버퍼 행 구간 반환
+
+        시간순 입력이므로 앞에서부터만 확인하면 되고, 각 이벤트는 한 번만 밀려난다.
+        """
+        times = self._columns["time_seconds"]
+        start = head = self._head
+        while head < self._tail and ts - times[head] > self.window_seconds:
+            head += 1
+        self._head = head
+        return range(start, head)
+
+    def view(self) -> EventBatch:
+        """현재 윈도우 전체 뷰"""
+        return self._view(self._head, self._tail)
+
+    def rows(self, rows: range, columns: Sequence[str]) -> Iterator[tuple]:
+        """버퍼 행 구간의 columns 값을 행별 튜플로 (범주형은 라벨)
+
+        push/advance가 돌려준 구간은 다음 push 전까지만 유효하다 (버퍼를 다시 잡을 수 있음).
+        """
+        # 보통 0~2행이라 슬라이스/tolist보다 item() 조회가 싸다
+        sources = [
+            (self._columns[f"{col}_codes"], self._labels[col])
+            if col in CATEGORICAL_COLUMNS
+            else (self._columns[col], None)
+            for col in columns
+        ]
+        for i in rows:
+            yield tuple([array.item(i) if labels is None else labels[array.item(i)] for array, labels in sources])
+
+    def time_range(self, start_ts: float, end_ts: float) -> EventBatch:
+        return self.view().time_range(start_ts, end_ts)
+
+    def _view(self, start: int, stop: int) -> EventBatch:
+        columns = {name: array[start:stop] for name, array in self._columns.items()}
+        for col in CATEGORICAL_COLUMNS:
+            columns[f"{col}_vocab"] = self._vocab_array(col)
+        return EventBatch.from_columns(self.game_id, columns)
+
+    def _code(self, col: str, label: str) -> int:
+        codes = self._codes[col]
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(self._labels[col])
+            self._labels[col].append(label)
+            self._vocab.pop(col, None)
+        return code
+
+    def _vocab_array(self, col: str) -> np.ndarray:
+        vocab = self._vocab.get(col)
+        if vocab is None:
+            vocab = self._vocab[col] = np.asarray(self._labels[col], dtype=str)
+        return vocab
+
+    def _reallocate(self) -> None:
+        live = self._tail - self._head
+        columns = self._allocate(max(_MIN_CAPACITY, 2 * live))
+        for name, array in self._columns.items():
+            columns[name][:live] = array[self._head:self._tail]
+        self._columns = columns
+        self._head, self._tail = 0, live
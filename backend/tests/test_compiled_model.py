@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.services.alerts.compiled import CompiledModel, export_model, save_compiled  # noqa: E402
+from app.services.alerts.will_have_shot import WillHaveShotPredictor  # noqa: E402
+
+
+def _data(rows=600, features=6):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(rows, features))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(scale=0.5, size=rows) > 0.3).astype(int)
+    X[::17, 3] = np.nan
+    return X, y
+
+
+def test_compiled_models_match_sklearn_probabilities(tmp_path):
+    X, y = _data()
+    X_clean = np.nan_to_num(X)
+    scaler = StandardScaler().fit(X_clean)
+    cases = [
+        (HistGradientBoostingClassifier(max_iter=30, max_depth=4, random_state=0).fit(X, y), None, X),
+        (LogisticRegression().fit(scaler.transform(X_clean), y), scaler, X_clean),
+    ]
+    for model, transform, inputs in cases:
+        path = tmp_path / "model.npz"
+        save_compiled(path, export_model(model, transform), {"feature_columns": ["a"]})
+        compiled = CompiledModel.load(path)
+        expected = model.predict_proba(transform.transform(inputs) if transform else inputs)
+
+        assert compiled.meta == {"feature_columns": ["a"]}
+        np.testing.assert_allclose(compiled.predict_proba(inputs), expected, rtol=0, atol=1e-9)
+        # 한 행 경로(포인터 점프)와 배치 경로가 같은 값을 낸다
+        single = np.array([compiled.predict_proba(inputs[i : i + 1])[0, 1] for i in range(40)])
+        np.testing.assert_allclose(single, expected[:40, 1], rtol=0, atol=1e-9)
+
+
+def test_predictor_prefers_fresh_compiled_model(tmp_path, monkeypatch):
+    X, y = _data()
+    model = HistGradientBoostingClassifier(max_iter=10, random_state=0).fit(X, y)
+    compiled_path = tmp_path / "will_have_shot_model.npz"
+    save_compiled(compiled_path, export_model(model), {"feature_columns": list("abcdef"), "threshold_precision": 0.4})
+    monkeypatch.setenv("WILL_HAVE_SHOT_MODEL_PATH", str(tmp_path / "will_have_shot_model.joblib"))
+
+    predictor = WillHaveShotPredictor()
+    assert predictor.is_active and predictor.threshold == 0.4
+    assert predictor.model_path == str(compiled_path)
+    proba = predictor.predict_vector(X[1:2])
+    assert abs(proba - model.predict_proba(X[1:2])[0, 1]) < 1e-9
@@ -0,0 +1,82 @@
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.schemas.event import EventBatch, EventRecord  # noqa: E402
+from app.services.sessions.window import EventWindow  # noqa: E402
+
+
+def _record(ts, type_name="Pass", result_name="Successful", end_x=None, team_id=None):
+    return EventRecord(
+        game_id="g",
+        game_episode=None,
+        action_id=int(ts),
+        time_seconds=ts,
+        type_name=type_name,
+        result_name=result_name,
+        start_x=10.0,
+        start_y=20.0,
+        end_x=end_x,
+        end_y=None,
+        team_id=team_id,
+    )
+
+
+def test_event_batch_round_trips_records():
+    records = [_record(1.0, end_x=30.0, team_id=7), _record(2.5, "Shot", "")]
+    batch = EventBatch.from_records(records)
+    assert len(batch) == 2
+    assert batch.records() == records
+    assert np.isnan(batch.end_x[1]) and batch.end_x.dtype == np.float32
+    assert batch.type_mask(lambda name: name == "Shot").tolist() == [False, True]
+    assert np.isnan(batch.team_float()[1])
+
+
+def test_event_batch_time_range_is_a_view():
+    batch = EventBatch.from_records([_record(float(ts)) for ts in range(10)])
+    window = batch.time_range(2.0, 5.0)
+    assert window.time_seconds.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert np.shares_memory(window.time_seconds, batch.time_seconds)
+    assert window.record(0).action_id == 2
+    assert len(batch.time_range(20.0, 30.0)) == 0
+
+
+def test_event_window_evicts_like_list_filter():
+    window = EventWindow(window_seconds=45.0)
+    reference = []
+    held = None
+    for i in range(1000):
+        event = _record(i * 0.37, "Shot" if i % 7 == 0 else "Pass", team_id=i % 3 or None)
+        evicted = window.push(event)
+        kept = [ev for ev in reference + [event] if event.time_seconds - ev.time_seconds <= 45.0]
+        dropped = [(ev.time_seconds, ev.type_name) for ev in reference + [event] if ev not in kept]
+        assert list(window.rows(evicted, ("time_seconds", "type_name"))) == dropped
+        reference = kept
+        if i == 300:
+            held = window.view()
+            held_records = held.records()
+    assert window.view().records() == reference
+    # 버퍼를 다시 잡아도 이전에 꺼낸 뷰는 그대로 유지
+    assert held.records() == held_records
+
+
+def test_event_batch_columns_round_trip_keeps_extras():
+    batch = replace(
+        EventBatch.from_records([_record(1.0, end_x=30.0, team_id=7), _record(2.5, "Shot", "")]),
+        extras={"pressure_rate": np.asarray([0.5, np.nan])},
+    )
+    restored = EventBatch.from_columns(batch.game_id, batch.to_columns())
+    assert restored.records() == batch.records()
+    assert np.array_equal(restored.extras["pressure_rate"], batch.extras["pressure_rate"], equal_nan=True)
+
+
+def test_event_batch_digest_tracks_content():
+    records = [_record(1.0, end_x=30.0, team_id=7), _record(2.5, "Shot", "")]
+    digest = EventBatch.from_records(records).digest()
+    assert EventBatch.from_records(list(records)).digest() == digest
+    records[1] = _record(2.5, "Shot", "", end_x=99.0)
+    assert EventBatch.from_records(records).digest() != digest
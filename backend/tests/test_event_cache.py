@@ -0,0 +1,174 @@
+import csv
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.services.data import game_store  # noqa: E402
+from app.services.data.event_cache import build_event_cache, load_game_columns  # noqa: E402
+from app.services.data.game_index import get_game_index  # noqa: E402
+from app.services.data.game_store import GameStore  # noqa: E402
+from app.services.ingest.events import EventIngestSource  # noqa: E402
+
+FIELDS = [
+    "game_id", "period_id", "time_seconds", "team_id", "player_id", "action_id",
+    "type_name", "result_name", "start_x", "start_y", "end_x", "end_y", "game_episode",
+]
+
+
+def _write_events(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: row.get(key, "") for key in FIELDS})
+
+
+def _rows():
+    return [
+        {"game_id": "1", "time_seconds": "3.5", "action_id": "2", "type_name": "Pass", "result_name": "Successful",
+         "start_x": "10", "start_y": "20", "end_x": "30", "end_y": "25", "team_id": "7", "period_id": "1"},
+        {"game_id": "2", "time_seconds": "1.0", "action_id": "0", "type_name": "Shot", "result_name": "",
+         "start_x": "90", "start_y": "34", "team_id": "8"},
+        {"game_id": "1", "time_seconds": "1.0", "action_id": "1", "type_name": "Carry", "result_name": "",
+         "start_x": "5", "start_y": "5", "end_x": "", "end_y": ""},
+        {"game_id": "1", "time_seconds": "bad", "action_id": "3", "type_name": "Pass"},
+    ]
+
+
+def test_event_cache_builds_per_game_columns(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_CACHE_PATH", str(tmp_path / "cache"))
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+
+    columns = load_game_columns(str(csv_path), "1")
+    assert columns["time_seconds"].tolist() == [1.0, 3.5]
+    assert columns["type_name_vocab"][columns["type_name_codes"]].tolist() == ["Carry", "Pass"]
+    assert columns["dx"][1] == 20.0
+    assert load_game_columns(str(csv_path), "missing") is None
+
+    source = EventIngestSource(str(csv_path), "1")
+    source.open()
+    first, ts = source.read_frame()
+    assert ts == 1.0 and first.end_x is None and first.team_id is None
+    second, _ = source.read_frame()
+    assert (second.type_name, second.dx, second.team_id) == ("Pass", 20.0, 7)
+    assert source.read_frame() is None
+
+
+def test_build_event_cache_returns_summary_and_writes_only_game_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_CACHE_PATH", str(tmp_path / "cache"))
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+
+    summary = build_event_cache(str(csv_path))
+    assert {gid: entry["rows"] for gid, entry in summary["games"].items()} == {"1": 2, "2": 1}
+    files = sorted(path.name for path in (tmp_path / "cache").rglob("*") if path.is_file())
+    assert files == ["game_1.npz", "game_2.npz"]
+    assert load_game_columns(str(csv_path), "2")["time_seconds"].tolist() == [1.0]
+
+
+def test_game_index_records_offsets_and_reads_one_game(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_CACHE_PATH", str(tmp_path / "cache"))
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+
+    index = get_game_index(str(csv_path))
+    assert index.game_ids() == ["1", "2"]
+    entry = index.get("1")
+    assert (entry.row_count, entry.time_min, entry.time_max, entry.period_count) == (3, 1.0, 3.5, 1)
+    assert [row["action_id"] for row in index.read_rows("1")] == ["2", "1", "3"]
+    assert "missing" not in index
+
+
+def test_event_cache_invalidates_on_source_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_CACHE_PATH", str(tmp_path / "cache"))
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+    assert len(load_game_columns(str(csv_path), "2")["time_seconds"]) == 1
+    assert load_game_columns(str(csv_path), "3") is None
+
+    rows = _rows() + [
+        {"game_id": "2", "time_seconds": "4.0", "type_name": "Pass"},
+        {"game_id": "3", "time_seconds": "0.5", "type_name": "Pass"},
+    ]
+    _write_events(csv_path, rows)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert len(load_game_columns(str(csv_path), "2")["time_seconds"]) == 2
+    assert load_game_columns(str(csv_path), "3")["time_seconds"].tolist() == [0.5]
+
+
+def test_game_store_shares_columns_and_evicts_idle_games(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_CACHE_PATH", str(tmp_path / "cache"))
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+    store = GameStore(max_idle_games=1)
+
+    first = store.acquire(str(csv_path), "1")
+    second = store.acquire(str(csv_path), "1")
+    assert first is second
+    assert not first.time_seconds.flags.writeable
+    assert store.stats() == {"loaded_games": 1, "idle_games": 0, "references": 2}
+
+    store.release(str(csv_path), "1")
+    store.release(str(csv_path), "1")
+    store.acquire(str(csv_path), "2")
+    store.release(str(csv_path), "2")
+    assert store.stats() == {"loaded_games": 1, "idle_games": 1, "references": 0}
+
+
+def test_game_store_reloads_changed_csv_and_keeps_old_batch_for_holders(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_CACHE_PATH", str(tmp_path / "cache"))
+    csv_path = tmp_path / "raw_data.csv"
+    rows = [row for row in _rows() if row["game_id"] == "1"]
+    _write_events(csv_path, rows[:1])
+    store = GameStore(max_idle_games=1)
+
+    old = store.acquire(str(csv_path), "1")
+    assert len(old) == 1
+
+    _write_events(csv_path, rows[:1] + [dict(rows[0], action_id="9", time_seconds="99.0")])
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    new = store.acquire(str(csv_path), "1")
+    assert len(new) == 2 and len(old) == 1
+    assert store.stats() == {"loaded_games": 2, "idle_games": 0, "references": 2}
+
+    # 이전 배열을 잡고 있던 세션이 release해도 새 항목의 참조는 그대로
+    store.release(str(csv_path), "1", old)
+    assert store.stats() == {"loaded_games": 1, "idle_games": 0, "references": 1}
+    store.release(str(csv_path), "1", new)
+    assert store.stats() == {"loaded_games": 1, "idle_games": 1, "references": 0}
+
+
+def test_game_store_loads_outside_the_store_lock(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_CACHE_PATH", str(tmp_path / "cache"))
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+    store = GameStore()
+    gate, calls = threading.Event(), []
+
+    def slow_load(path, game_id):
+        calls.append(game_id)
+        if game_id == "1":
+            assert gate.wait(5)
+        return load_game_columns(path, game_id)
+
+    monkeypatch.setattr(game_store, "load_game_columns", slow_load)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(store.acquire, str(csv_path), "1")
+        while not calls:
+            time.sleep(0.01)
+        second = pool.submit(store.acquire, str(csv_path), "1")
+        # 경기 1을 로드하는 동안에도 다른 경기의 acquire/release는 막히지 않는다
+        assert len(store.acquire(str(csv_path), "2")) == 1
+        store.release(str(csv_path), "2")
+        gate.set()
+        assert first.result(5) is second.result(5)
+    assert calls == ["1", "2"]
+    assert store.stats()["references"] == 2
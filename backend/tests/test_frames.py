@@ -0,0 +1,69 @@
+import csv
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.services.data import frames  # noqa: E402
+from app.services.data.frames import load_track2_frame  # noqa: E402
+
+FIELDS = ["game_id", "period_id", "time_seconds", "action_id", "type_name", "start_x", "end_x"]
+COLUMNS = ["time_seconds", "game_id", "type_name", "end_x", "missing"]
+
+
+def _write_events(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: row.get(key, "") for key in FIELDS})
+
+
+def _rows():
+    return [
+        {"game_id": "1", "time_seconds": "3.5", "action_id": "2", "type_name": "Pass", "start_x": "10", "end_x": "30"},
+        {"game_id": "2", "time_seconds": "1.0", "action_id": "0", "type_name": "Shot", "start_x": "90"},
+        {"game_id": "1", "time_seconds": "1.0", "action_id": "1", "type_name": "Carry", "start_x": "5"},
+    ]
+
+
+def _assert_typed(df):
+    assert list(df.columns) == ["game_id", "time_seconds", "type_name", "end_x"]
+    assert str(df["game_id"].dtype) == "Int32"
+    assert str(df["type_name"].dtype) == "category"
+    assert df["end_x"].dtype == "float32"
+
+
+def test_typed_loader_prunes_columns_and_caches_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+
+    df = load_track2_frame(str(csv_path), COLUMNS)
+    _assert_typed(df)
+    caches = list(tmp_path.glob("raw_data.typed.*.parquet"))
+    assert len(caches) == 1
+
+    warm = load_track2_frame(str(csv_path), COLUMNS)
+    assert warm.equals(df)
+
+    _write_events(csv_path, _rows()[:2])
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert len(load_track2_frame(str(csv_path), COLUMNS)) == 2
+    assert list(tmp_path.glob("raw_data.typed.*.parquet")) != caches
+    assert len(list(tmp_path.glob("raw_data.typed.*.parquet"))) == 1
+
+
+def test_typed_loader_reads_csv_without_parquet_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(frames, "_has_parquet_engine", lambda: False)
+    csv_path = tmp_path / "raw_data.csv"
+    _write_events(csv_path, _rows())
+
+    df = load_track2_frame(str(csv_path), COLUMNS)
+    _assert_typed(df)
+    assert len(df) == 3
+    assert not list(tmp_path.glob("raw_data.typed.*.parquet"))
@@ -0,0 +1,48 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.services.alerts.inference import InferenceService  # noqa: E402
+
+
+class _SumPredictor:
+    """행 합을 확률로 돌려주고 배치 크기를 기록하는 가짜 예측기"""
+
+    is_active = True
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, features):
+        self.batch_sizes.append(len(features))
+        return features.sum(axis=1)
+
+
+def test_inference_service_batches_concurrent_requests():
+    predictor = _SumPredictor()
+    service = InferenceService(predictor, max_wait_ms=20.0, max_batch_rows=4)
+
+    async def run():
+        vectors = [np.full((1, 3), i / 100) for i in range(10)]
+        return await asyncio.gather(*(service.submit(vector) for vector in vectors))
+
+    results = asyncio.run(run())
+
+    assert results == [float(np.full(3, i / 100).sum()) for i in range(10)]
+    assert predictor.batch_sizes == [4, 4, 2]
+    stats = service.stats()
+    assert stats["batches"] == 3 and stats["rows"] == 10
+    assert stats["max_batch_rows"] == 4 and stats["last_batch_rows"] == 2
+    assert stats["queue_depth"] == 0
+
+
+def test_inference_service_returns_none_when_batch_fails():
+    predictor = _SumPredictor()
+    predictor.predict_batch = lambda features: None
+    service = InferenceService(predictor, max_wait_ms=1.0)
+
+    assert asyncio.run(service.submit(np.ones((1, 2)))) is None
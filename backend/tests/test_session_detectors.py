@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.schemas.event import EventRecord  # noqa: E402
+from app.services.sessions.detectors import ROW_COLUMNS, WindowAggregates  # noqa: E402
+from app.services.sessions.window import EventWindow  # noqa: E402
+
+
+def _event(ts, type_name, result_name="", start_x=50.0, start_y=34.0, end_x=60.0):
+    return EventRecord(
+        game_id="g",
+        game_episode=None,
+        action_id=None,
+        time_seconds=ts,
+        type_name=type_name,
+        result_name=result_name,
+        start_x=start_x,
+        start_y=start_y,
+        end_x=end_x,
+        end_y=None,
+    )
+
+
+def _feed(window, aggregates, event):
+    aggregates.remove_rows(window.rows(window.push(event), ROW_COLUMNS))
+    aggregates.add_record(event)
+
+
+def test_window_aggregates_follow_entries_and_evictions():
+    window, aggregates = EventWindow(window_seconds=45.0), WindowAggregates()
+    _feed(window, aggregates, _event(0.0, "Pass", start_y=60.0, end_x=75.0))
+    _feed(window, aggregates, _event(1.0, "Pass", "Unsuccessful", end_x=40.0))
+    _feed(window, aggregates, _event(1.0, "Ball Turnover", end_x=30.0))
+    _feed(window, aggregates, _event(3.0, "Shot", end_x=None))
+    _feed(window, aggregates, _event(20.0, "Carry", start_y=10.0, end_x=90.0))
+
+    assert (aggregates.pass_count, aggregates.right_channel, aggregates.left_channel) == (3, 1, 1)
+    assert aggregates.mean_pass_dx() == (25.0 - 10.0 + 40.0) / 3
+    assert aggregates.final_third_entries == 2
+    # 동시각 턴오버는 먼저 들어온 행 기준, 8초 이내 공격만 후속으로 집계
+    assert (aggregates.last_turnover_ts, aggregates.last_turnover_x, aggregates.followup_attacks) == (1.0, 40.0, 1)
+
+    _feed(window, aggregates, _event(46.5, "Duel", end_x=None))
+    assert (aggregates.pass_count, aggregates.final_third_entries) == (1, 1)
+    assert aggregates.last_turnover_ts is None and aggregates.followup_attacks == 0
+
+
+def test_incremental_aggregates_match_recomputed_window():
+    window, aggregates = EventWindow(window_seconds=45.0), WindowAggregates()
+    types = ["Pass", "Carry", "Shot", "Ball Turnover", "Duel"]
+    kept = []
+    for i in range(400):
+        event = _event(i * 0.7, types[i % 5], "Unsuccessful" if i % 4 == 0 else "", 10.0 + i % 83 * 1.1, i % 68 * 1.01,
+                       None if i % 9 == 0 else 5.0 + i % 97 * 1.03)
+        _feed(window, aggregates, event)
+        kept = [e for e in kept if event.time_seconds - e.time_seconds <= 45.0] + [event]
+
+        recomputed = WindowAggregates()
+        for e in kept:
+            recomputed.add_record(e)
+        incremental, expected = dict(vars(aggregates)), dict(vars(recomputed))
+        for state in (incremental, expected):
+            del state["_type_flags"]
+        assert abs(incremental.pop("pass_dx_sum") - expected.pop("pass_dx_sum")) < 1e-6
+        assert incremental == expected
@@ -5,19 +5,46 @@
 학습된 모델에서 피처 중요도를 추출하고 분석합니다.
 - LogisticRegression: coefficients 절댓값
 - HistGradientBoostingClassifier: feature_importances_
-- 상관관계 분석
+- 상관관계 분석 (+ --correlation-threshold: 중요도 순으로 고상관 피처 제거)
+- --permutation: 경기(game_id) 단위 permutation importance (Stacking/Voting 포함 모든 모델)
 - 중요도 기반 피처 선택
+- --cost-aware: 피처 그룹별 계산 비용(실제 Track2 윈도우에서 측정)과 PR-AUC의
+  Pareto 곡선을 만들고, PR-AUC 손실이 허용치 이내인 가장 빠른 그룹 조합을 선택
 """
 
 import argparse
 import json
+import sys
+import time
 from pathlib import Path
+from typing import Dict, List, Sequence, Set
 
 import joblib
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import average_precision_score
 from sklearn.preprocessing import StandardScaler
 
+# backend 패키지와 학습 스크립트(전처리 공유)를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+sys.path.insert(0, str(project_root / "scripts"))
+
+from app.schemas.event import EventBatch  # noqa: E402
+from app.services.data.frames import EVENT_FRAME_COLUMNS, batch_from_frame, load_track2_frame  # noqa: E402
+from app.services.features.engine import (  # noqa: E402
+    FEATURE_GROUPS,
+    GROUP_DEPENDENCIES,
+    PREFIX_GROUPS,
+    WindowContext,
+    extract_features,
+    feature_group,
+    groups_for,
+    prefix_for,
+)
+from train_will_have_shot import prepare_features  # noqa: E402
+
 
 def load_model(model_path: str) -> dict:
     """모델 로드"""
@@ -114,26 +141,31 @@ def extract_feature_importance(model_dict: dict, feature_columns: list) -> pd.Da
 
 
 def analyze_feature_correlation(df: pd.DataFrame, feature_columns: list) -> pd.DataFrame:
-    """피처 간 상관관계 분석"""
-    # 상관관계 행렬 계산
+    """피처 간 상관관계 분석 (상삼각 쌍, 상관계수 내림차순)"""
     corr_matrix = df[feature_columns].corr().abs()
-    
-    # 상위 상관관계 쌍 추출 (중복 제거)
-    corr_pairs = []
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i + 1, len(corr_matrix.columns)):
-            corr_pairs.append({
-                "feature1": corr_matrix.columns[i],
-                "feature2": corr_matrix.columns[j],
-                "correlation": corr_matrix.iloc[i, j],
-            })
-    
-    corr_df = pd.DataFrame(corr_pairs)
+    rows, cols = np.triu_indices(len(feature_columns), k=1)
+    names = corr_matrix.columns.to_numpy()
+    corr_df = pd.DataFrame({
+        "feature1": names[rows],
+        "feature2": names[cols],
+        "correlation": corr_matrix.to_numpy()[rows, cols],
+    })
     corr_df = corr_df.sort_values("correlation", ascending=False).reset_index(drop=True)
     
     return corr_df
 
 
+def prune_correlated_features(df: pd.DataFrame, ranked_features: list, threshold: float) -> list:
+    """중요도 순(ranked_features)으로 훑으며 이미 남긴 피처와 |상관| > threshold인 피처 제거"""
+    corr = np.nan_to_num(df[ranked_features].corr().abs().to_numpy(), nan=0.0)
+    # 자기보다 중요한 피처와의 상관만 보도록 상삼각(행 < 열)만 남긴다
+    upper = np.triu(corr > threshold, k=1)
+    kept = np.zeros(len(ranked_features), dtype=bool)
+    for j in range(len(ranked_features)):
+        kept[j] = not upper[kept, j].any()
+    return [name for name, keep in zip(ranked_features, kept) if keep]
+
+
 def select_features_by_importance(
     importance_df: pd.DataFrame,
     top_k: int = None,
@@ -156,6 +188,231 @@ def select_features_by_importance(
     return selected
 
 
+def sample_windows(
+    track2_path: str, games: int, window_sec: float, stride_sec: float, seed: int = 42
+) -> List[EventBatch]:
+    """비용 측정용 대표 윈도우: 무작위 경기들에서 데이터셋 빌더와 같은 [t-window, t] 윈도우"""
+    df = load_track2_frame(track2_path, EVENT_FRAME_COLUMNS)
+    game_ids = df["game_id"].unique()
+    rng = np.random.default_rng(seed)
+    picked = set(rng.choice(game_ids, size=min(games, len(game_ids)), replace=False).tolist())
+    windows = []
+    for game_id, game_df in df[df["game_id"].isin(picked)].groupby("game_id", sort=False):
+        batch = batch_from_frame(game_df.sort_values("time_seconds", kind="stable"), game_id=str(game_id))
+        for current_time in np.arange(batch.time_seconds[0] + window_sec, batch.time_seconds[-1], stride_sec):
+            window = batch.time_range(current_time - window_sec, current_time)
+            if len(window):
+                windows.append(window)
+    return windows
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure_group_costs(windows: Sequence[EventBatch], repeats: int = 3) -> Dict[str, float]:
+    """그룹별 윈도우당 계산 시간 (µs)
+
+    "context"(WindowContext 생성)와 "prefix"(구간 통계 누적 배열)는 공통 비용으로 따로 잰다.
+    그룹은 앞 그룹 피처가 채워진 상태에서 단독으로 잰다.
+    """
+    per_window = 1e6 / len(windows)
+    costs = {
+        "context": _best_of(lambda: [WindowContext(w, prefix_for(w)) for w in windows], repeats) * per_window,
+        "prefix": _best_of(lambda: [prefix_for(w) for w in windows], repeats) * per_window,
+    }
+    costs["context"] -= costs["prefix"]
+    contexts = [WindowContext(w, prefix_for(w)) for w in windows]
+    features = [extract_features(w) for w in windows]
+    for name, group in FEATURE_GROUPS:
+        # 같은 입력이면 같은 값을 다시 쓰므로 features 딕셔너리를 그대로 재사용한다
+        costs[name] = _best_of(lambda: [group(c, f) for c, f in zip(contexts, features)], repeats) * per_window
+    return costs
+
+
+def measure_extraction_latency(windows: Sequence[EventBatch], columns: Sequence[str], repeats: int = 3) -> float:
+    """columns만 계산할 때(실시간 경로와 같은 그룹 선택) 윈도우당 피처 추출 시간 (µs)"""
+    groups = groups_for(columns)
+    return _best_of(lambda: [extract_features(w, groups=groups) for w in windows], repeats) * 1e6 / len(windows)
+
+
+def _with_dependencies(group: str) -> Set[str]:
+    needed, pending = set(), [group]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(GROUP_DEPENDENCIES.get(name, ()))
+    return needed
+
+
+def _added_ratio(group: str, selected: Set[str], group_importance: Dict[str, float], costs: Dict[str, float]) -> float:
+    """group(과 아직 없는 의존 그룹)을 더할 때 늘어나는 중요도 / 비용"""
+    added = _with_dependencies(group) - selected
+    cost = sum(costs[name] for name in added)
+    if added & set(PREFIX_GROUPS) and not selected & set(PREFIX_GROUPS):
+        cost += costs["prefix"]
+    return sum(group_importance.get(name, 0.0) for name in added) / max(cost, 1e-9)
+
+
+def pareto_candidates(importance_df: pd.DataFrame, costs: Dict[str, float]) -> List[List[str]]:
+    """중요도/비용 비율이 큰 그룹부터 (의존 그룹과 함께) 하나씩 더한 그룹 조합 목록"""
+    group_importance: Dict[str, float] = {}
+    for feature, importance in zip(importance_df["feature"], importance_df["importance"]):
+        group = feature_group(feature)
+        if group is not None:
+            group_importance[group] = group_importance.get(group, 0.0) + float(importance)
+
+    selected: Set[str] = set()
+    candidates = []
+    remaining = set(group_importance)
+    while remaining:
+        best = max(sorted(remaining), key=lambda group: _added_ratio(group, selected, group_importance, costs))
+        selected |= _with_dependencies(best)
+        remaining -= selected
+        candidates.append([name for name, _ in FEATURE_GROUPS if name in selected])
+    return candidates
+
+
+def _evaluation_set(model_dict: dict, dataset_df: pd.DataFrame, feature_columns: Sequence[str]):
+    """모델의 test_games(없으면 전체) 행의 (X, y, game_id), 전처리는 학습과 같은 prepare_features"""
+    test_games = model_dict.get("test_games")
+    eval_df = dataset_df[dataset_df["game_id"].isin(test_games)] if test_games else dataset_df
+    X, y = prepare_features(eval_df, list(feature_columns))
+    return X, y, eval_df["game_id"].to_numpy()
+
+
+def _permutation_scores(
+    model, X: np.ndarray, y: np.ndarray, columns: Sequence[int], group_codes: np.ndarray, n_repeats: int, seed: int
+) -> List[List[float]]:
+    """columns 각각을 경기 안에서 섞었을 때의 PR-AUC (워커 하나가 X 사본 하나를 재사용)"""
+    X = X.copy()
+    # order: 경기별로 모은 행 위치. 같은 경기 블록 안에서 무작위 순서로 뽑은 행 위치와 짝지어 섞는다
+    order = np.argsort(group_codes, kind="stable")
+    scores = []
+    for column in columns:
+        original = X[:, column].copy()
+        rng = np.random.default_rng([seed, column])
+        column_scores = []
+        for _ in range(n_repeats):
+            shuffled = np.lexsort((rng.random(len(group_codes)), group_codes))
+            X[order, column] = original[shuffled]
+            column_scores.append(float(average_precision_score(y, model.predict_proba(X)[:, 1])))
+        X[:, column] = original
+        scores.append(column_scores)
+    return scores
+
+
+def permutation_importance_by_game(
+    model_dict: dict,
+    X: np.ndarray,
+    y: np.ndarray,
+    game_ids: np.ndarray,
+    feature_columns: Sequence[str],
+    n_repeats: int = 5,
+    n_jobs: int = -1,
+    random_state: int = 42,
+) -> pd.DataFrame:
+    """경기 단위 permutation importance (PR-AUC 감소량)
+
+    피처 값을 같은 경기 안에서만 섞어 경기 간 분포 차이가 중요도로 새지 않게 한다.
+    기준 PR-AUC는 한 번만 계산해 재사용하고, 피처는 joblib 워커들에 나눠 병렬로 처리한다.
+    scaler(StandardScaler)는 컬럼별 변환이라 미리 적용한 X를 섞어도 결과가 같다.
+    """
+    model = model_dict["model"]
+    if model_dict.get("scaler") is not None:
+        X = model_dict["scaler"].transform(X)
+    baseline = float(average_precision_score(y, model.predict_proba(X)[:, 1]))
+    group_codes = pd.factorize(game_ids)[0]
+
+    n_workers = joblib.effective_n_jobs(n_jobs)
+    chunks = [chunk for chunk in np.array_split(np.arange(len(feature_columns)), n_workers * 4) if len(chunk)]
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_permutation_scores)(model, X, y, chunk.tolist(), group_codes, n_repeats, random_state)
+        for chunk in chunks
+    )
+    drops = baseline - np.asarray([scores for chunk_scores in results for scores in chunk_scores])
+    df = pd.DataFrame({
+        "feature": list(feature_columns),
+        "importance_mean": drops.mean(axis=1),
+        "importance_std": drops.std(axis=1),
+        "baseline_pr_auc": baseline,
+    })
+    return df.sort_values("importance_mean", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _subsample_games(df: pd.DataFrame, max_samples: int, random_state: int = 42) -> pd.DataFrame:
+    """경기 단위로 뽑아 max_samples 행 이하로 줄인 데이터셋 (경기 안의 행은 모두 유지)"""
+    if max_samples <= 0 or len(df) <= max_samples:
+        return df
+    sizes = df.groupby("game_id", sort=False).size()
+    shuffled = sizes.sample(frac=1.0, random_state=random_state)
+    keep = shuffled.index[shuffled.cumsum() <= max_samples]
+    return df[df["game_id"].isin(keep)]
+
+
+def subset_pr_auc(model_dict: dict, X: np.ndarray, y: np.ndarray, keep: np.ndarray) -> float:
+    """keep이 False인 피처를 0으로 둔 PR-AUC (실시간 경로는 계산하지 않은 피처를 0.0으로 채운다)"""
+    X = np.where(keep, X, 0.0)
+    if model_dict.get("scaler") is not None:
+        X = model_dict["scaler"].transform(X)
+    return float(average_precision_score(y, model_dict["model"].predict_proba(X)[:, 1]))
+
+
+def cost_aware_selection(
+    model_dict: dict,
+    importance_df: pd.DataFrame,
+    dataset_df: pd.DataFrame,
+    windows: Sequence[EventBatch],
+    max_pr_auc_drop: float,
+    repeats: int = 3,
+) -> dict:
+    """그룹 조합별 (PR-AUC, 틱당 추출 지연) Pareto 곡선과 선택 결과"""
+    feature_columns = list(model_dict.get("feature_columns") or importance_df["feature"])
+    X, y, _ = _evaluation_set(model_dict, dataset_df, feature_columns)
+    groups = np.asarray([feature_group(col) for col in feature_columns], dtype=object)
+
+    costs = measure_group_costs(windows, repeats)
+    full_pr_auc = subset_pr_auc(model_dict, X, y, np.ones(len(feature_columns), dtype=bool))
+    full_latency = measure_extraction_latency(windows, feature_columns, repeats)
+
+    points = []
+    for subset in pareto_candidates(importance_df, costs):
+        # 엔진 밖 피처(group None)는 항상 유지
+        keep = np.asarray([group is None or group in subset for group in groups], dtype=bool)
+        columns = [col for col, kept in zip(feature_columns, keep) if kept]
+        points.append({
+            "groups": list(groups_for(columns)),
+            "feature_count": int(keep.sum()),
+            "pr_auc": subset_pr_auc(model_dict, X, y, keep),
+            "latency_us": measure_extraction_latency(windows, columns, repeats),
+            "features": columns,
+        })
+    for point in points:
+        point["pareto"] = not any(
+            other["pr_auc"] >= point["pr_auc"]
+            and other["latency_us"] <= point["latency_us"]
+            and (other["pr_auc"] > point["pr_auc"] or other["latency_us"] < point["latency_us"])
+            for other in points
+        )
+    eligible = [p for p in points if p["pareto"] and p["pr_auc"] >= full_pr_auc - max_pr_auc_drop]
+    chosen = min(eligible, key=lambda p: p["latency_us"]) if eligible else max(points, key=lambda p: p["pr_auc"])
+    return {
+        "windows": len(windows),
+        "eval_samples": int(len(y)),
+        "group_costs_us": costs,
+        "full": {"pr_auc": full_pr_auc, "latency_us": full_latency, "feature_count": len(feature_columns)},
+        "max_pr_auc_drop": max_pr_auc_drop,
+        "pareto_curve": [{k: v for k, v in p.items() if k != "features"} for p in points],
+        "selected": chosen,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(description="피처 중요도 분석")
     parser.add_argument(
@@ -200,17 +457,104 @@ def main():
         default=0.8,
         help="누적 중요도 비율 (기본값: 0.8 = 80%%)",
     )
+    parser.add_argument(
+        "--correlation-threshold",
+        type=float,
+        default=None,
+        help="선택된 피처 중 덜 중요한 쪽을 제거할 |상관계수| 기준 (예: 0.95)",
+    )
+    parser.add_argument(
+        "--permutation",
+        action="store_true",
+        help="경기 단위 permutation importance(PR-AUC 감소량)를 중요도로 사용",
+    )
+    parser.add_argument(
+        "--permutation-repeats",
+        type=int,
+        default=5,
+        help="피처당 permutation 반복 횟수",
+    )
+    parser.add_argument(
+        "--permutation-max-samples",
+        type=int,
+        default=50000,
+        help="permutation importance 평가 샘플 상한 (경기 단위로 추출, 0이면 전체)",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=-1,
+        help="permutation importance 병렬 워커 수 (-1: 모든 코어)",
+    )
+    parser.add_argument(
+        "--cost-aware",
+        action="store_true",
+        help="그룹별 계산 비용을 재고 PR-AUC/지연 Pareto 곡선으로 피처 선택 (selected_features.json에 반영)",
+    )
+    parser.add_argument(
+        "--track2-path",
+        type=str,
+        default="00_data/Track2/raw_data.csv",
+        help="비용 측정용 Track2 이벤트 경로 (CSV 또는 Parquet)",
+    )
+    parser.add_argument(
+        "--cost-games",
+        type=int,
+        default=20,
+        help="비용 측정에 쓸 경기 수 (무작위 추출)",
+    )
+    parser.add_argument(
+        "--cost-repeats",
+        type=int,
+        default=3,
+        help="비용 측정 반복 횟수 (최솟값 사용)",
+    )
+    parser.add_argument(
+        "--max-pr-auc-drop",
+        type=float,
+        default=0.005,
+        help="전체 피처 대비 허용하는 PR-AUC 손실",
+    )
     args = parser.parse_args()
     
     # 파일 로드
     print("Loading model and data...")
     model_dict = load_model(args.model_path)
     feature_columns = json.load(open(args.feature_columns_path))
+    df = None
+    if args.dataset_path and Path(args.dataset_path).exists():
+        df = pd.read_parquet(args.dataset_path)
     
     # 피처 중요도 추출
     print("Extracting feature importance...")
     importance_df = extract_feature_importance(model_dict, feature_columns)
     
+    # 경기 단위 permutation importance (옵션)
+    permutation_df = None
+    if args.permutation:
+        if df is None:
+            raise FileNotFoundError(f"Dataset not found (needed for permutation importance): {args.dataset_path}")
+        model_columns = list(model_dict.get("feature_columns") or feature_columns)
+        X, y, game_ids = _evaluation_set(model_dict, _subsample_games(df, args.permutation_max_samples), model_columns)
+        print(f"Computing game-grouped permutation importance ({len(model_columns)} features, {len(y):,} samples, "
+              f"repeats={args.permutation_repeats}, n_jobs={args.n_jobs})...")
+        started = time.perf_counter()
+        permutation_df = permutation_importance_by_game(
+            model_dict, X, y, game_ids, model_columns, n_repeats=args.permutation_repeats, n_jobs=args.n_jobs
+        )
+        print(f"Done in {time.perf_counter() - started:.1f}s (baseline PR-AUC {permutation_df['baseline_pr_auc'].iloc[0]:.4f})")
+        importances = permutation_df["importance_mean"].clip(lower=0.0).to_numpy()
+        if importances.sum() > 0:
+            importance_df = pd.DataFrame({
+                "feature": permutation_df["feature"],
+                "importance": importances / importances.sum(),
+                "method": "permutation_game",
+            })
+        else:
+            print("Warning: all permutation importances <= 0, keeping model importances")
+    elif importance_df["method"].iloc[0].startswith("uniform"):
+        print("Note: model has no usable importances (uniform). Use --permutation for permutation importance.")
+    
     print(f"\nTop 20 features by importance:")
     print(importance_df.head(20).to_string(index=False))
     
@@ -227,13 +571,51 @@ def main():
     
     # 상관관계 분석 (옵션)
     correlation_df = None
-    if args.dataset_path and Path(args.dataset_path).exists():
+    if df is not None:
         print("\nAnalyzing feature correlations...")
-        df = pd.read_parquet(args.dataset_path)
         correlation_df = analyze_feature_correlation(df, feature_columns)
         
         print(f"\nTop 20 feature pairs by correlation:")
         print(correlation_df.head(20).to_string(index=False))
+        
+        if args.correlation_threshold is not None:
+            before = len(selected_features)
+            selected_features = prune_correlated_features(df, selected_features, args.correlation_threshold)
+            print(f"\nCorrelation pruning (> {args.correlation_threshold}): {before} → {len(selected_features)} features")
+    
+    # 비용 기반 선택 (옵션)
+    cost_analysis = None
+    if args.cost_aware:
+        if df is None:
+            raise FileNotFoundError(f"Dataset not found (needed for PR-AUC): {args.dataset_path}")
+        print(f"\nSampling cost windows from {args.cost_games} games of {args.track2_path}...")
+        windows = sample_windows(
+            args.track2_path,
+            args.cost_games,
+            float(model_dict.get("window_sec", 45.0)),
+            float(model_dict.get("stride_sec", 5.0)),
+        )
+        print(f"Measuring feature group costs on {len(windows):,} windows...")
+        cost_analysis = cost_aware_selection(
+            model_dict, importance_df, df, windows, args.max_pr_auc_drop, args.cost_repeats
+        )
+        print(f"\n{'group':>20} {'µs/window':>10}")
+        for name, cost in cost_analysis["group_costs_us"].items():
+            print(f"{name:>20} {cost:>10.1f}")
+        full = cost_analysis["full"]
+        print(f"\nFull: PR-AUC {full['pr_auc']:.4f}, {full['latency_us']:.1f} µs/tick, {full['feature_count']} features")
+        print(f"{'groups':>7} {'features':>8} {'PR-AUC':>8} {'µs/tick':>8} pareto")
+        for point in cost_analysis["pareto_curve"]:
+            print(
+                f"{len(point['groups']):>7} {point['feature_count']:>8} {point['pr_auc']:>8.4f}"
+                f" {point['latency_us']:>8.1f} {'*' if point['pareto'] else ''}"
+            )
+        chosen = cost_analysis["selected"]
+        selected_features = chosen["features"]
+        print(
+            f"\nCost-aware selection: {len(selected_features)} features, groups={chosen['groups']},"
+            f" PR-AUC {chosen['pr_auc']:.4f}, {chosen['latency_us']:.1f} µs/tick"
+        )
     
     # 결과 저장
     result = {
@@ -243,11 +625,21 @@ def main():
             "top_k": args.top_k,
             "threshold": args.threshold,
             "cumulative_ratio": args.cumulative_ratio,
+            "correlation_threshold": args.correlation_threshold,
+            "importance_method": str(importance_df["method"].iloc[0]),
         },
         "importance_ranking": importance_df.to_dict("records"),
         "top_20_features": importance_df.head(20).to_dict("records"),
     }
     
+    if permutation_df is not None:
+        result["permutation_importance"] = permutation_df.to_dict("records")
+    
+    if cost_analysis is not None:
+        result["selection_criteria"]["cost_aware"] = True
+        result["selection_criteria"]["max_pr_auc_drop"] = args.max_pr_auc_drop
+        result["cost_analysis"] = cost_analysis
+    
     if correlation_df is not None:
         result["correlation_analysis"] = {
             "top_20_pairs": correlation_df.head(20).to_dict("records"),
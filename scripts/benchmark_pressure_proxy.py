@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+압박 프록시 피처 벤치마크
+
+합성 시즌(경기 수 × 5초 stride × 45초 윈도우)의 모든 윈도우에 대해
+pressure_proxy_failure_density / pressure_proxy_rapid_turnover를
+기존 행 단위 루프 구현과 배열 구현(app.services.features.kernel)으로 계산해
+결과가 같은지 확인하고 총 소요 시간을 비교한다.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# backend 패키지를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.services.features.engine import PRESSURE_WINDOW_SECONDS  # noqa: E402
+from app.services.features.kernel import failure_density, rapid_repeats  # noqa: E402
+
+
+def synthetic_game(events: int, seed: int):
+    """경기 하나: 시간순 시각, 실패 여부(0/1), team_id 변화 마스크"""
+    rng = np.random.default_rng(seed)
+    times = np.sort(rng.uniform(0, 5400, events))
+    failures = (rng.random(events) < 0.3).astype(np.int64)
+    team_id = rng.choice([1, 2], events, p=[0.55, 0.45])
+    changed = np.ones(events, dtype=bool)
+    changed[1:] = team_id[1:] != team_id[:-1]
+    return times, failures, changed
+
+
+def season_windows(games: int, events: int, window_seconds: float, stride_seconds: float):
+    """데이터셋 빌더와 같은 방식으로 자른 (time, failures, team_changed) 윈도우 목록"""
+    windows = []
+    for game in range(games):
+        times, failures, changed = synthetic_game(events, seed=game)
+        sample_times = np.arange(times[0] + window_seconds, times[-1], stride_seconds)
+        lo = np.searchsorted(times, sample_times - window_seconds, side="left")
+        hi = np.searchsorted(times, sample_times, side="right")
+        for start, stop in zip(lo.tolist(), hi.tolist()):
+            if stop - start:
+                windows.append((times[start:stop], failures[start:stop], changed[start:stop]))
+    return windows
+
+
+def loop_reference(time_values, failures, changed):
+    """기존 구현: 윈도우 행을 하나씩 도는 루프"""
+    density = None
+    for i in range(len(time_values) - 2):
+        window_time = float(time_values[i + 2] - time_values[i])
+        if window_time <= PRESSURE_WINDOW_SECONDS:
+            value = int(failures[i] + failures[i + 1] + failures[i + 2]) / window_time if window_time > 0 else 0.0
+            density = value if density is None else max(density, value)
+    rapid = 0
+    change_times = time_values[changed]
+    for i in range(len(change_times) - 1):
+        if float(change_times[i + 1] - change_times[i]) <= PRESSURE_WINDOW_SECONDS:
+            rapid += 1
+    return (float(density) if density is not None else 0.0), rapid
+
+
+def vectorized(time_values, failures, changed):
+    return (
+        failure_density(time_values, failures, PRESSURE_WINDOW_SECONDS),
+        rapid_repeats(time_values[changed], PRESSURE_WINDOW_SECONDS),
+    )
+
+
+def _run(fn, windows):
+    started = time.perf_counter()
+    results = [fn(*window) for window in windows]
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="압박 프록시 피처 벤치마크")
+    parser.add_argument("--games", type=int, default=228, help="시즌 경기 수 (K리그1 기준 228)")
+    parser.add_argument("--events", type=int, default=3000, help="경기당 이벤트 수")
+    parser.add_argument("--window-seconds", type=float, default=45.0, help="Feature window 크기 (초)")
+    parser.add_argument("--stride-seconds", type=float, default=5.0, help="시간 stride (초)")
+    args = parser.parse_args()
+
+    windows = season_windows(args.games, args.events, args.window_seconds, args.stride_seconds)
+    mean_size = np.mean([len(window[0]) for window in windows])
+    print(f"{len(windows):,} windows (mean {mean_size:.1f} events)")
+
+    expected, loop_s = _run(loop_reference, windows)
+    actual, vector_s = _run(vectorized, windows)
+    if actual != expected:
+        raise SystemExit("vectorized results differ from the loop reference")
+
+    print(f"{'impl':>10} {'total s':>10} {'µs/window':>10}")
+    for name, elapsed in (("loop", loop_s), ("vectorized", vector_s)):
+        print(f"{name:>10} {elapsed:>10.2f} {elapsed / len(windows) * 1e6:>10.1f}")
+    print(f"speedup: {loop_s / vector_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+will_have_shot 피처 엔진 마이크로벤치마크
+
+합성 이벤트로 윈도우 크기별 extract_features 호출 지연(µs/call)을 잰다.
+비교용으로 같은 윈도우를 DataFrame으로 감싸 value_counts 한 번 하는 비용
+(기존 pandas 구현의 최소 고정비)도 함께 출력한다.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# backend 패키지를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.schemas.event import EventRecord  # noqa: E402
+from app.services.features.engine import extract_features  # noqa: E402
+from app.services.sessions.window import EventWindow  # noqa: E402
+
+TYPES = ["Pass", "Carry", "Shot", "Duel", "Clearance", "Ball Recovery", "Throw-In", "Interception"]
+
+
+def synthetic_window(size: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    window = EventWindow(window_seconds=float("inf"))
+    times = np.sort(rng.uniform(0, 45, size))
+    for i, ts in enumerate(times):
+        window.push(
+            EventRecord(
+                game_id="bench",
+                game_episode=None,
+                action_id=i,
+                time_seconds=float(ts),
+                type_name=TYPES[int(rng.integers(len(TYPES)))],
+                result_name=["Successful", "Unsuccessful", ""][int(rng.integers(3))],
+                start_x=float(rng.uniform(0, 105)),
+                start_y=float(rng.uniform(0, 68)),
+                end_x=float(rng.uniform(0, 105)),
+                end_y=float(rng.uniform(0, 68)),
+                team_id=int(rng.integers(1, 3)),
+            )
+        )
+    return window.view()
+
+
+def _time_per_call(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def _pandas_floor(batch):
+    events = pd.DataFrame({
+        "time_seconds": batch.time_seconds,
+        "type_name": batch.type_names,
+        "result_name": batch.result_names,
+        "end_x": batch.end_x,
+    })
+    return events["type_name"].value_counts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="피처 엔진 마이크로벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 60, 150, 400], help="윈도우 이벤트 수")
+    parser.add_argument("--repeat", type=int, default=2000, help="크기별 반복 횟수")
+    args = parser.parse_args()
+
+    print(f"{'events':>8} {'engine µs':>12} {'pandas floor µs':>16}")
+    for size in args.sizes:
+        batch = synthetic_window(size)
+        engine_us = _time_per_call(lambda: extract_features(batch), args.repeat)
+        pandas_us = _time_per_call(lambda: _pandas_floor(batch), max(1, args.repeat // 4))
+        print(f"{size:>8} {engine_us:>12.1f} {pandas_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,30 +5,67 @@ will_have_shot 데이터셋 빌더
 feature window: 과거 45초 (현재 포함) = [t-45, t]
 label lookahead: 미래 10초 = (t, t+10]
 label: will_have_shot = any(type_name == "Shot" for future events)
+
+--workers N: 경기 단위로 프로세스 풀에 나눠 처리한다. 워커는 전체 DataFrame 대신
+경기별 컬럼 파일(.npz)만 읽고, 결과는 원래 경기 순서대로 합쳐 워커 수와 무관하게
+같은 출력을 만든다.
+
+경기별 샘플은 artifacts/will_have_shot_cache/에 캐시된다. 캐시 키는 경기 행 내용,
+window/lookahead/stride, 피처 버전(FEATURE_VERSION)의 해시라서 바뀐 경기만 다시 계산한다
+(--no-cache로 끌 수 있음).
+
+--window-seconds/--lookahead-seconds/--stride-seconds에 값을 여러 개 주면 조합 전체를
+한 번의 로드로 만들고 설정별 Parquet(will_have_shot_dataset_w45_l10_s5.parquet 등)을 쓴다.
+
+--streaming: 입력 전체를 메모리에 올리지 않고 경기 단위(game_index 바이트 구간)로 읽어
+경기별 shard로 내려 쓴 뒤, 출력 파일에 경기 하나씩 row group으로 이어 붙인다.
+최대 메모리는 가장 큰 경기 하나 분량에 비례한다.
 """
 
 import argparse
+import hashlib
+import io
+import itertools
 import json
 import os
 import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
-# 프로젝트 루트를 path에 추가
+# 프로젝트 루트와 backend 패키지를 path에 추가
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.schemas.event import INT_MISSING, EventBatch  # noqa: E402
+from app.services.data.frames import (  # noqa: E402
+    EVENT_FRAME_COLUMNS,
+    batch_from_frame,
+    load_track2_frame,
+    read_track2_csv,
+)
+from app.services.data.game_index import get_game_index  # noqa: E402
+from app.services.features.engine import extract_features as extract_window_features  # noqa: E402
+from app.services.features.engine import FEATURE_VERSION, prefix_for  # noqa: E402
 
 
 def load_track2_data(csv_path: str, use_pressure: bool = False) -> pd.DataFrame:
-    """Track2 CSV 파일 로드 (압박 피처 포함 옵션)"""
+    """Track2 CSV 파일 로드 (압박 피처 포함 옵션)
+
+    피처 엔진이 쓰는 컬럼만 compact dtype으로 읽는다 (CSV는 typed Parquet 캐시 사용).
+    """
     if use_pressure:
         pressure_path = "artifacts/track2_with_pressure.parquet"
         if os.path.exists(pressure_path):
             print(f"Loading Track2 data with pressure features from: {pressure_path}")
-            df = pd.read_parquet(pressure_path)
+            df = load_track2_frame(pressure_path, EVENT_FRAME_COLUMNS)
             print(f"Loaded {len(df):,} rows with pressure features")
             return df
         else:
@@ -38,544 +75,321 @@ def load_track2_data(csv_path: str, use_pressure: bool = False) -> pd.DataFrame:
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"Track2 data file not found: {csv_path}")
     
-    df = pd.read_csv(csv_path, low_memory=False)
-    print(f"Loaded {len(df):,} rows")
+    df = load_track2_frame(csv_path, EVENT_FRAME_COLUMNS)
+    print(f"Loaded {len(df):,} rows ({df.memory_usage(deep=True).sum() / 1e6:.1f} MB)")
     return df
 
 
 def extract_features(events: pd.DataFrame) -> Dict[str, float]:
-    """이벤트 윈도우에서 피처 추출"""
-    features = {}
-    
-    if len(events) == 0:
-        return _empty_features()
-    
-    # 1. 기본 통계
-    features["event_count"] = float(len(events))
-    time_span = float(events["time_seconds"].max() - events["time_seconds"].min())
-    features["time_span"] = time_span if time_span > 0 else 0.0
-    features["event_rate"] = features["event_count"] / features["time_span"] if features["time_span"] > 0 else 0.0
-    
-    # 2. 이벤트 타입별 카운트
-    type_counts = events["type_name"].value_counts()
-    features["pass_count"] = float(type_counts.get("Pass", 0))
-    features["carry_count"] = float(type_counts.get("Carry", 0))
-    features["shot_count"] = float(type_counts.get("Shot", 0))
-    features["duel_count"] = float(type_counts.get("Duel", 0))
-    features["interception_count"] = float(type_counts.get("Interception", 0))
-    
-    # EDA 상위 타입들도 자동 추가 (최대 10개)
-    top_types = type_counts.head(10).index.tolist()
-    for t in top_types:
-        if t not in ["Pass", "Carry", "Shot", "Duel", "Interception"]:
-            features[f"type_{t.lower().replace(' ', '_')}_count"] = float(type_counts.get(t, 0))
-    
-    # 3. result_name 기반
-    result_counts = events["result_name"].value_counts()
-    features["successful_count"] = float(result_counts.get("Successful", 0))
-    features["unsuccessful_count"] = float(result_counts.get("Unsuccessful", 0))
-    features["unknown_result_count"] = float(
-        (events["result_name"].isna() | (events["result_name"] == "")).sum()
-    )
-    total_with_result = features["successful_count"] + features["unsuccessful_count"]
-    features["success_rate"] = (
-        features["successful_count"] / total_with_result if total_with_result > 0 else 0.0
-    )
-    features["success_rate_with_unknown"] = (
-        features["successful_count"] / features["event_count"] if features["event_count"] > 0 else 0.0
-    )
-    
-    # 4. 패스/이동 공간 피처
-    passes = events[
-        (events["type_name"] == "Pass")
-        & events["start_x"].notna()
-        & events["end_x"].notna()
-    ].copy()
-    
-    if len(passes) > 0:
-        # dx, dy 계산 (컬럼에 있으면 사용, 없으면 계산)
-        if "dx" in passes.columns and passes["dx"].notna().any():
-            dx_list = passes["dx"].dropna().tolist()
-        else:
-            dx_list = (passes["end_x"] - passes["start_x"]).dropna().tolist()
-        
-        if "dy" in passes.columns and passes["dy"].notna().any():
-            dy_list = passes["dy"].dropna().tolist()
-        else:
-            dy_list = (
-                passes["end_y"] - passes["start_y"]
-            ).dropna().tolist()
-        
-        features["mean_dx"] = float(np.mean(dx_list)) if dx_list else 0.0
-        features["mean_dy"] = float(np.mean(dy_list)) if dy_list else 0.0
-        features["std_dx"] = float(np.std(dx_list)) if dx_list else 0.0
-        features["std_dy"] = float(np.std(dy_list)) if dy_list else 0.0
-        features["forward_ratio"] = (
-            sum(1 for d in dx_list if d > 0) / len(dx_list) if dx_list else 0.0
+    """이벤트 윈도우(시간순 DataFrame)에서 피처 추출
+
+    실제 계산은 서버와 공유하는 backend 피처 엔진(app.services.features.engine)이 한다.
+    """
+    return extract_window_features(batch_from_frame(events))
+
+
+def _sample_times(min_time: float, max_time: float, window_seconds: float, lookahead_seconds: float, stride_seconds: float) -> np.ndarray:
+    """stride로 시간 포인트 생성 (기존 누적 덧셈과 같은 부동소수 값)"""
+    times = []
+    current_time = min_time + window_seconds
+    while current_time <= max_time - lookahead_seconds:
+        times.append(current_time)
+        current_time += stride_seconds
+    return np.asarray(times, dtype=np.float64)
+
+
+WindowConfig = Tuple[float, float, float]  # (window_seconds, lookahead_seconds, stride_seconds)
+
+
+def config_name(config: WindowConfig) -> str:
+    """설정별 출력/캐시 이름 (예: w45_l10_s5)"""
+    window_seconds, lookahead_seconds, stride_seconds = config
+    return f"w{window_seconds:g}_l{lookahead_seconds:g}_s{stride_seconds:g}"
+
+
+class _GameArrays:
+    """경기 하나에서 설정(window/lookahead/stride)과 무관하게 공유하는 배열
+
+    - batch: 시간순 EventBatch, prefix: 구간 통계 누적 배열
+    - shot_times / team_shot_times: 라벨용 Shot 시각 (전체 / 팀별)
+    - 피처는 윈도우 행 구간 [lo, hi)에만 의존하므로 구간별로 메모해 설정 간에 재사용한다
+    """
+
+    def __init__(self, batch: EventBatch) -> None:
+        self.batch = batch
+        self.prefix = prefix_for(batch)
+        is_shot = batch.type_mask(lambda name: name.lower() == "shot")
+        self.shot_times = batch.time_seconds[is_shot]
+        shot_teams = batch.team_id[is_shot]
+        self.team_shot_times = {int(team): self.shot_times[shot_teams == team] for team in np.unique(shot_teams)}
+        self._features: Dict[Tuple[int, int], Dict[str, float]] = {}
+
+    def features(self, lo: int, hi: int) -> Dict[str, float]:
+        features = self._features.get((lo, hi))
+        if features is None:
+            features = self._features[(lo, hi)] = extract_window_features(self.batch.slice(lo, hi), self.prefix, lo)
+        return features
+
+    def sample_windows(self, config: WindowConfig) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """샘플 시각과 각 시각의 feature window 행 구간 [lo, hi)"""
+        window_seconds, lookahead_seconds, stride_seconds = config
+        times = self.batch.time_seconds
+        sample_times = _sample_times(
+            float(times.min()), float(times.max()), window_seconds, lookahead_seconds, stride_seconds
         )
-        
-        # 채널 분포 (y 좌표 기준, 0~68 스케일)
-        # left: <22.7 (=68/3), right: >45.3 (=68×2/3)
-        if passes["start_y"].notna().any():
-            right = (passes["start_y"] > 45.3).sum()
-            left = (passes["start_y"] < 22.7).sum()
-            total = len(passes)
-            features["right_ratio"] = right / total if total > 0 else 0.0
-            features["left_ratio"] = left / total if total > 0 else 0.0
-            features["center_ratio"] = 1.0 - features["right_ratio"] - features["left_ratio"]
-        else:
-            features["right_ratio"] = 0.0
-            features["left_ratio"] = 0.0
-            features["center_ratio"] = 0.0
-    else:
-        features["mean_dx"] = 0.0
-        features["mean_dy"] = 0.0
-        features["std_dx"] = 0.0
-        features["std_dy"] = 0.0
-        features["forward_ratio"] = 0.0
-        features["right_ratio"] = 0.0
-        features["left_ratio"] = 0.0
-        features["center_ratio"] = 0.0
-    
-    # 5. 침투 지표 (x축 0~105 기준)
-    # final_third: 70 (=105×2/3)
-    # penalty_area: 88.5 (=105-16.5), 실무적으로 >88 사용
-    features["final_third_entries"] = float(
-        (events["end_x"].notna() & (events["end_x"] > 70)).sum()
-    )
-    features["penalty_area_entries"] = float(
-        (events["end_x"].notna() & (events["end_x"] > 88)).sum()
+        window_lo = np.searchsorted(times, sample_times - window_seconds, side="left")
+        window_hi = np.searchsorted(times, sample_times, side="right")
+        return sample_times, window_lo, window_hi
+
+
+def _first_sample_feature_columns(game: _GameArrays, config: WindowConfig) -> Optional[List[str]]:
+    """경기 첫 샘플의 피처 키 (샘플이 없으면 None)"""
+    sample_times, window_lo, window_hi = game.sample_windows(config)
+    if not len(sample_times):
+        return None
+    return list(game.features(int(window_lo[0]), int(window_hi[0])))
+
+
+def _game_samples(game_id, game: _GameArrays, has_team: bool, config: WindowConfig) -> List[Dict]:
+    """경기 하나의 샘플 생성
+
+    Feature window: [t - window_seconds, t], Label window: (t, t + lookahead_seconds]
+    경계는 정렬된 시간 배열에 대한 searchsorted로 한 번에 구한다.
+    """
+    lookahead_seconds = config[1]
+    batch = game.batch
+    sample_times, window_lo, window_hi = game.sample_windows(config)
+    if not len(sample_times):
+        return []
+    future_hi = np.searchsorted(batch.time_seconds, sample_times + lookahead_seconds, side="right")
+    any_shot = np.searchsorted(game.shot_times, sample_times + lookahead_seconds, side="right") > np.searchsorted(
+        game.shot_times, sample_times, side="right"
     )
-    
-    # 6. 볼 소유 변화
-    if "team_id" in events.columns and events["team_id"].notna().any():
-        team_changes = (events["team_id"].diff() != 0).sum() - 1  # 첫 행 제외
-        features["possession_changes"] = float(max(0, team_changes))
-    else:
-        features["possession_changes"] = 0.0
-    
-    # 7. 시퀀스 피처 다층화 (1초/5초/10초/20초 윈도우)
-    # GPT 답변: 여러 시간 범위를 동시에 반영하여 짧은 순간의 패턴 + 긴 관점의 흐름을 동시에 학습
-    if len(events) > 0:
-        current_time = events["time_seconds"].max()
-        
-        # 시간 기반 윈도우 (1초, 5초, 10초, 20초)
-        for window_sec in [1, 5, 10, 20]:
-            window_events = events[events["time_seconds"] >= current_time - window_sec]
-            
-            if len(window_events) > 0:
-                window_types = window_events["type_name"].value_counts()
-                # 주요 타입들의 빈도
-                for t in ["Pass", "Carry", "Shot", "Duel"]:
-                    features[f"past_{window_sec}s_{t.lower()}_count"] = float(window_types.get(t, 0))
-                
-                # 윈도우 내 이벤트 수
-                features[f"past_{window_sec}s_event_count"] = float(len(window_events))
-                
-                # 윈도우 내 성공률
-                window_successful = (window_events["result_name"] == "Successful").sum()
-                features[f"past_{window_sec}s_success_rate"] = float(window_successful / len(window_events))
-                
-                # 윈도우 내 평균 x 좌표 (공격 방향)
-                if window_events["end_x"].notna().any():
-                    features[f"past_{window_sec}s_mean_end_x"] = float(window_events["end_x"].mean())
-                    features[f"past_{window_sec}s_max_end_x"] = float(window_events["end_x"].max())
-                else:
-                    features[f"past_{window_sec}s_mean_end_x"] = 0.0
-                    features[f"past_{window_sec}s_max_end_x"] = 0.0
-                
-                # 윈도우 내 이벤트 간격 통계
-                if len(window_events) > 1:
-                    window_time_diffs = window_events["time_seconds"].diff().dropna()
-                    if len(window_time_diffs) > 0:
-                        features[f"past_{window_sec}s_interval_mean"] = float(window_time_diffs.mean())
-                        features[f"past_{window_sec}s_interval_std"] = float(window_time_diffs.std() if len(window_time_diffs) > 1 else 0.0)
-                    else:
-                        features[f"past_{window_sec}s_interval_mean"] = 0.0
-                        features[f"past_{window_sec}s_interval_std"] = 0.0
-                else:
-                    features[f"past_{window_sec}s_interval_mean"] = 0.0
-                    features[f"past_{window_sec}s_interval_std"] = 0.0
-            else:
-                for t in ["Pass", "Carry", "Shot", "Duel"]:
-                    features[f"past_{window_sec}s_{t.lower()}_count"] = 0.0
-                features[f"past_{window_sec}s_event_count"] = 0.0
-                features[f"past_{window_sec}s_success_rate"] = 0.0
-                features[f"past_{window_sec}s_mean_end_x"] = 0.0
-                features[f"past_{window_sec}s_max_end_x"] = 0.0
-                features[f"past_{window_sec}s_interval_mean"] = 0.0
-                features[f"past_{window_sec}s_interval_std"] = 0.0
-        
-        # 최근 N개 이벤트 (기존 유지, 호환성)
-        for n in [5, 10]:
-            recent_events = events.tail(n)
-            if len(recent_events) > 0:
-                recent_types = recent_events["type_name"].value_counts()
-                for t in ["Pass", "Carry", "Shot", "Duel"]:
-                    features[f"recent_{n}_{t.lower()}_count"] = float(recent_types.get(t, 0))
-                recent_successful = (recent_events["result_name"] == "Successful").sum()
-                features[f"recent_{n}_success_rate"] = float(recent_successful / len(recent_events))
-                if recent_events["end_x"].notna().any():
-                    features[f"recent_{n}_mean_end_x"] = float(recent_events["end_x"].mean())
-                else:
-                    features[f"recent_{n}_mean_end_x"] = 0.0
-            else:
-                for t in ["Pass", "Carry", "Shot", "Duel"]:
-                    features[f"recent_{n}_{t.lower()}_count"] = 0.0
-                features[f"recent_{n}_success_rate"] = 0.0
-                features[f"recent_{n}_mean_end_x"] = 0.0
-    else:
-        # 빈 윈도우 처리
-        for window_sec in [1, 5, 10, 20]:
-            for t in ["Pass", "Carry", "Shot", "Duel"]:
-                features[f"past_{window_sec}s_{t.lower()}_count"] = 0.0
-            features[f"past_{window_sec}s_event_count"] = 0.0
-            features[f"past_{window_sec}s_success_rate"] = 0.0
-            features[f"past_{window_sec}s_mean_end_x"] = 0.0
-            features[f"past_{window_sec}s_max_end_x"] = 0.0
-            features[f"past_{window_sec}s_interval_mean"] = 0.0
-            features[f"past_{window_sec}s_interval_std"] = 0.0
-        for n in [5, 10]:
-            for t in ["Pass", "Carry", "Shot", "Duel"]:
-                features[f"recent_{n}_{t.lower()}_count"] = 0.0
-            features[f"recent_{n}_success_rate"] = 0.0
-            features[f"recent_{n}_mean_end_x"] = 0.0
-    
-    # 8. 이벤트 간격 통계 (mean/std)
-    if len(events) > 1:
-        time_diffs = events["time_seconds"].diff().dropna()
-        if len(time_diffs) > 0:
-            features["event_interval_mean"] = float(time_diffs.mean())
-            features["event_interval_std"] = float(time_diffs.std() if len(time_diffs) > 1 else 0.0)
-            features["event_interval_min"] = float(time_diffs.min())
-            features["event_interval_max"] = float(time_diffs.max())
-        else:
-            features["event_interval_mean"] = 0.0
-            features["event_interval_std"] = 0.0
-            features["event_interval_min"] = 0.0
-            features["event_interval_max"] = 0.0
-    else:
-        features["event_interval_mean"] = 0.0
-        features["event_interval_std"] = 0.0
-        features["event_interval_min"] = 0.0
-        features["event_interval_max"] = 0.0
-    
-    # 9. 최근 10초 vs 이전 10초 비교 피처 (공격 강도 변화)
-    if len(events) > 0:
-        current_time = events["time_seconds"].max()
-        recent_10s = events[events["time_seconds"] >= current_time - 10]
-        previous_10s = events[
-            (events["time_seconds"] >= current_time - 20) & 
-            (events["time_seconds"] < current_time - 10)
-        ]
-        
-        # 이벤트 수 비교
-        features["recent_10s_event_count"] = float(len(recent_10s))
-        features["previous_10s_event_count"] = float(len(previous_10s))
-        features["event_count_change"] = features["recent_10s_event_count"] - features["previous_10s_event_count"]
-        
-        # 공격 진입 비교 (x 좌표)
-        if recent_10s["end_x"].notna().any():
-            features["recent_10s_mean_end_x"] = float(recent_10s["end_x"].mean())
-        else:
-            features["recent_10s_mean_end_x"] = 0.0
-        
-        if previous_10s["end_x"].notna().any():
-            features["previous_10s_mean_end_x"] = float(previous_10s["end_x"].mean())
-        else:
-            features["previous_10s_mean_end_x"] = 0.0
-        
-        features["end_x_change"] = features["recent_10s_mean_end_x"] - features["previous_10s_mean_end_x"]
-        
-        # 성공률 비교
-        if len(recent_10s) > 0:
-            features["recent_10s_success_rate"] = float((recent_10s["result_name"] == "Successful").sum() / len(recent_10s))
-        else:
-            features["recent_10s_success_rate"] = 0.0
-        
-        if len(previous_10s) > 0:
-            features["previous_10s_success_rate"] = float((previous_10s["result_name"] == "Successful").sum() / len(previous_10s))
-        else:
-            features["previous_10s_success_rate"] = 0.0
-        
-        features["success_rate_change"] = features["recent_10s_success_rate"] - features["previous_10s_success_rate"]
-    else:
-        features["recent_10s_event_count"] = 0.0
-        features["previous_10s_event_count"] = 0.0
-        features["event_count_change"] = 0.0
-        features["recent_10s_mean_end_x"] = 0.0
-        features["previous_10s_mean_end_x"] = 0.0
-        features["end_x_change"] = 0.0
-        features["recent_10s_success_rate"] = 0.0
-        features["previous_10s_success_rate"] = 0.0
-        features["success_rate_change"] = 0.0
-    
-    # 10. 통계적 피처 (분산, 왜도, 첨도 등)
-    if len(events) > 1:
-        # x 좌표 분산 (공격 분산도)
-        if events["end_x"].notna().any():
-            end_x_values = events["end_x"].dropna()
-            if len(end_x_values) > 1:
-                features["end_x_variance"] = float(end_x_values.var())
-                features["end_x_std"] = float(end_x_values.std())
-            else:
-                features["end_x_variance"] = 0.0
-                features["end_x_std"] = 0.0
-        else:
-            features["end_x_variance"] = 0.0
-            features["end_x_std"] = 0.0
-        
-        # y 좌표 분산 (측면 분산도)
-        if events["end_y"].notna().any():
-            end_y_values = events["end_y"].dropna()
-            if len(end_y_values) > 1:
-                features["end_y_variance"] = float(end_y_values.var())
-                features["end_y_std"] = float(end_y_values.std())
-            else:
-                features["end_y_variance"] = 0.0
-                features["end_y_std"] = 0.0
-        else:
-            features["end_y_variance"] = 0.0
-            features["end_y_std"] = 0.0
-        
-        # 시간 기반 트렌드 (최근 이벤트가 더 공격적인지)
-        if len(events) >= 3:
-            sorted_events = events.sort_values("time_seconds")
-            first_third = sorted_events.iloc[:len(sorted_events)//3]
-            last_third = sorted_events.iloc[-len(sorted_events)//3:]
-            
-            if first_third["end_x"].notna().any() and last_third["end_x"].notna().any():
-                first_mean_x = float(first_third["end_x"].mean())
-                last_mean_x = float(last_third["end_x"].mean())
-                features["attack_trend"] = last_mean_x - first_mean_x
-            else:
-                features["attack_trend"] = 0.0
-        else:
-            features["attack_trend"] = 0.0
-    else:
-        features["end_x_variance"] = 0.0
-        features["end_x_std"] = 0.0
-        features["end_y_variance"] = 0.0
-        features["end_y_std"] = 0.0
-        features["attack_trend"] = 0.0
-    
-    # 11. StatsBomb 압박 이벤트 피처 (실제 압박 데이터)
-    if "pressure_event_count" in events.columns and events["pressure_event_count"].notna().any():
-        features["statsbomb_pressure_count"] = float(events["pressure_event_count"].sum())
-        features["statsbomb_under_pressure_count"] = float(events["under_pressure_count"].sum())
-        features["statsbomb_counterpress_count"] = float(events["counterpress_count"].sum())
-        features["statsbomb_pressure_rate"] = float(events["pressure_rate"].mean()) if len(events) > 0 else 0.0
-        features["statsbomb_recent_pressure_count"] = float(events["recent_pressure_count"].sum())
-        features["statsbomb_pressure_intensity"] = float(events["pressure_intensity"].max()) if len(events) > 0 else 0.0
-    else:
-        features["statsbomb_pressure_count"] = 0.0
-        features["statsbomb_under_pressure_count"] = 0.0
-        features["statsbomb_counterpress_count"] = 0.0
-        features["statsbomb_pressure_rate"] = 0.0
-        features["statsbomb_recent_pressure_count"] = 0.0
-        features["statsbomb_pressure_intensity"] = 0.0
-    
-    # 12. 압박 프록시 피처 개선 (이벤트 로그만으로 가능한 압박 추정)
-    if features["event_count"] > 0:
-        # 실패 이벤트 밀도 (높을수록 압박 가능성)
-        failure_rate = features["unsuccessful_count"] / features["event_count"]
-        features["pressure_proxy_failure_rate"] = failure_rate
-        
-        # 짧은 시간 내 실패 이벤트 집중도
-        if len(events) >= 3:
-            sorted_events = events.sort_values("time_seconds")
-            time_windows = []
-            for i in range(len(sorted_events) - 2):
-                window = sorted_events.iloc[i:i+3]
-                window_time = float(window["time_seconds"].max() - window["time_seconds"].min())
-                if window_time <= 5.0:  # 5초 이내
-                    failures = (window["result_name"] == "Unsuccessful").sum()
-                    time_windows.append(failures / window_time if window_time > 0 else 0)
-            features["pressure_proxy_failure_density"] = float(max(time_windows)) if time_windows else 0.0
-        else:
-            features["pressure_proxy_failure_density"] = 0.0
-        
-        # 턴오버 직후 재턴오버 (압박 지표)
-        if "team_id" in events.columns and events["team_id"].notna().any():
-            team_changes = events[events["team_id"].diff() != 0]
-            if len(team_changes) >= 2:
-                # 턴오버 후 5초 내 재턴오버
-                turnover_after_turnover = 0
-                for i in range(len(team_changes) - 1):
-                    time_diff = float(team_changes.iloc[i+1]["time_seconds"] - team_changes.iloc[i]["time_seconds"])
-                    if time_diff <= 5.0:
-                        turnover_after_turnover += 1
-                features["pressure_proxy_rapid_turnover"] = float(turnover_after_turnover)
-            else:
-                features["pressure_proxy_rapid_turnover"] = 0.0
-        else:
-            features["pressure_proxy_rapid_turnover"] = 0.0
-    else:
-        features["pressure_proxy_failure_rate"] = 0.0
-        features["pressure_proxy_failure_density"] = 0.0
-        features["pressure_proxy_rapid_turnover"] = 0.0
-    
-    # 14. 상호작용 피처 생성 (GPT 답변: 피처 쌍의 곱/비율/차이)
-    # 주요 피처 쌍의 상호작용을 반영하여 모델이 피처 간 관계를 학습할 수 있도록 함
-    if features["event_count"] > 0:
-        # 패스-성공률 상호작용
-        if features["pass_count"] > 0:
-            features["pass_success_interaction"] = features["pass_count"] * features["success_rate"]
-            features["pass_success_ratio"] = features["successful_count"] / features["pass_count"] if features["pass_count"] > 0 else 0.0
+
+    samples = []
+    for i, current_time in enumerate(sample_times.tolist()):
+        lo, hi = int(window_lo[i]), int(window_hi[i])
+        # Label: will_have_shot (팀 기준)
+        # 현재 시점 t에서 마지막 이벤트의 team_id(=공격 주체) 기준으로,
+        # 미래 10초 내 그 팀의 Shot 발생 여부
+        if hi > lo and has_team:
+            attacking_team_id = int(batch.team_id[hi - 1])
+            will_have_shot = False
+            team_shots = game.team_shot_times.get(attacking_team_id)
+            if attacking_team_id != INT_MISSING and team_shots is not None and future_hi[i] > hi:
+                will_have_shot = bool(
+                    np.searchsorted(team_shots, current_time + lookahead_seconds, side="right")
+                    > np.searchsorted(team_shots, current_time, side="right")
+                )
         else:
-            features["pass_success_interaction"] = 0.0
-            features["pass_success_ratio"] = 0.0
-        
-        # 공격 진입-이벤트 밀도 상호작용
-        features["final_third_event_density"] = features["final_third_entries"] / features["event_count"] if features["event_count"] > 0 else 0.0
-        features["penalty_area_event_density"] = features["penalty_area_entries"] / features["event_count"] if features["event_count"] > 0 else 0.0
-        
-        # 전진 비율-공격 진입 상호작용
-        if features["forward_ratio"] > 0:
-            features["forward_final_third_interaction"] = features["forward_ratio"] * features["final_third_entries"]
+            # team_id가 없으면 기존 방식 (어떤 팀이든 Shot 발생)
+            will_have_shot = bool(any_shot[i])
+
+        samples.append({
+            "game_id": game_id,
+            "current_time": current_time,
+            "will_have_shot": will_have_shot,
+            **game.features(lo, hi),
+        })
+    return samples
+
+
+def _sorted_batches(games: Iterable[Tuple[object, pd.DataFrame]]) -> Iterator[Tuple[object, EventBatch]]:
+    """경기별 DataFrame → 시간순 EventBatch (입력 경기 순서 유지)"""
+    for game_id, game_df in games:
+        if len(game_df) == 0:
+            continue
+        game_df = game_df.sort_values("time_seconds", kind="stable")
+        yield game_id, batch_from_frame(game_df, game_id=str(game_id))
+
+
+def iter_csv_games(csv_path: str) -> Iterator[Tuple[object, pd.DataFrame]]:
+    """CSV를 경기 단위로 읽기 (game_index 바이트 구간만 seek, CSV 첫 등장 순서)
+
+    한 번에 메모리에 올라가는 것은 경기 하나 분량이다.
+    """
+    index = get_game_index(csv_path)
+    with open(csv_path, "rb") as f:
+        for entry in index.entries.values():
+            f.seek(entry.offset)
+            chunk = f.read(entry.length)
+            game_df = read_track2_csv(io.BytesIO(chunk), EVENT_FRAME_COLUMNS, header=None, names=index.header)
+            # 구간 안에 다른 경기 행이 섞여 있어도(비연속 저장) game_id로 걸러낸다.
+            game_df = game_df[game_df["game_id"].astype(str) == entry.game_id]
+            if len(game_df):
+                yield game_df["game_id"].iloc[0], game_df
+
+
+def iter_parquet_games(parquet_path: str) -> Iterator[Tuple[object, pd.DataFrame]]:
+    """Parquet을 경기 단위로 읽기 (game_id 필터, 첫 등장 순서)"""
+    game_ids = pd.read_parquet(parquet_path, columns=["game_id"])["game_id"].unique()
+    for game_id in game_ids:
+        key = game_id.item() if hasattr(game_id, "item") else game_id
+        yield game_id, load_track2_frame(parquet_path, EVENT_FRAME_COLUMNS, filters=[("game_id", "==", key)])
+
+
+def open_track2_games(csv_path: str, use_pressure: bool = False) -> Tuple[Iterator[Tuple[object, pd.DataFrame]], bool]:
+    """load_track2_data의 스트리밍 버전: (경기별 DataFrame 이터레이터, team_id 컬럼 유무)"""
+    if use_pressure:
+        pressure_path = "artifacts/track2_with_pressure.parquet"
+        if os.path.exists(pressure_path):
+            import pyarrow.parquet as pq  # pandas read_parquet 엔진
+
+            print(f"Streaming Track2 data with pressure features from: {pressure_path}")
+            return iter_parquet_games(pressure_path), "team_id" in pq.read_schema(pressure_path).names
         else:
-            features["forward_final_third_interaction"] = 0.0
-        
-        # 이벤트 밀도-성공률 상호작용
-        features["event_rate_success_interaction"] = features["event_rate"] * features["success_rate"]
-        
-        # 침투 지표 차이 (final_third - penalty_area)
-        features["penetration_depth"] = features["final_third_entries"] - features["penalty_area_entries"]
-        
-        # 채널 분포 상호작용 (중앙 집중도)
-        features["center_attack_interaction"] = features["center_ratio"] * features["final_third_entries"]
-        
-        # 압박 프록시 상호작용
-        features["pressure_attack_interaction"] = features["pressure_proxy_failure_rate"] * features["final_third_entries"]
-        features["pressure_trend_interaction"] = features["pressure_proxy_failure_density"] * features["attack_trend"]
-        
-        # 분산 기반 상호작용
-        features["variance_attack_interaction"] = features["end_x_std"] * features["final_third_entries"]
-        features["variance_trend_interaction"] = features["end_x_std"] * abs(features["attack_trend"])
-    else:
-        features["pass_success_interaction"] = 0.0
-        features["pass_success_ratio"] = 0.0
-        features["final_third_event_density"] = 0.0
-        features["penalty_area_event_density"] = 0.0
-        features["forward_final_third_interaction"] = 0.0
-        features["event_rate_success_interaction"] = 0.0
-        features["penetration_depth"] = 0.0
-        features["center_attack_interaction"] = 0.0
-        features["pressure_attack_interaction"] = 0.0
-        features["pressure_trend_interaction"] = 0.0
-        features["variance_attack_interaction"] = 0.0
-        features["variance_trend_interaction"] = 0.0
-    
-    return features
-
-
-def _empty_features() -> Dict[str, float]:
-    """빈 윈도우용 기본 피처"""
-    features = {
-        "event_count": 0.0,
-        "time_span": 0.0,
-        "event_rate": 0.0,
-        "pass_count": 0.0,
-        "carry_count": 0.0,
-        "shot_count": 0.0,
-        "duel_count": 0.0,
-        "interception_count": 0.0,
-        "successful_count": 0.0,
-        "unsuccessful_count": 0.0,
-        "unknown_result_count": 0.0,
-        "success_rate": 0.0,
-        "success_rate_with_unknown": 0.0,
-        "mean_dx": 0.0,
-        "mean_dy": 0.0,
-        "std_dx": 0.0,
-        "std_dy": 0.0,
-        "forward_ratio": 0.0,
-        "right_ratio": 0.0,
-        "left_ratio": 0.0,
-        "center_ratio": 0.0,
-        "final_third_entries": 0.0,
-        "penalty_area_entries": 0.0,
-        "possession_changes": 0.0,
-    }
-    
-    # 시퀀스 피처 다층화 (1초/5초/10초/20초 윈도우)
-    for window_sec in [1, 5, 10, 20]:
-        for t in ["pass", "carry", "shot", "duel"]:
-            features[f"past_{window_sec}s_{t}_count"] = 0.0
-        features[f"past_{window_sec}s_event_count"] = 0.0
-        features[f"past_{window_sec}s_success_rate"] = 0.0
-        features[f"past_{window_sec}s_mean_end_x"] = 0.0
-        features[f"past_{window_sec}s_max_end_x"] = 0.0
-        features[f"past_{window_sec}s_interval_mean"] = 0.0
-        features[f"past_{window_sec}s_interval_std"] = 0.0
-    
-    # 최근 N개 이벤트 (기존 호환성)
-    for n in [5, 10]:
-        for t in ["pass", "carry", "shot", "duel"]:
-            features[f"recent_{n}_{t}_count"] = 0.0
-        features[f"recent_{n}_success_rate"] = 0.0
-        features[f"recent_{n}_mean_end_x"] = 0.0
-    
-    # 이벤트 간격 통계
-    features["event_interval_mean"] = 0.0
-    features["event_interval_std"] = 0.0
-    features["event_interval_min"] = 0.0
-    features["event_interval_max"] = 0.0
-    
-    # 최근 10초 vs 이전 10초 비교
-    features["recent_10s_event_count"] = 0.0
-    features["previous_10s_event_count"] = 0.0
-    features["event_count_change"] = 0.0
-    features["recent_10s_mean_end_x"] = 0.0
-    features["previous_10s_mean_end_x"] = 0.0
-    features["end_x_change"] = 0.0
-    features["recent_10s_success_rate"] = 0.0
-    features["previous_10s_success_rate"] = 0.0
-    features["success_rate_change"] = 0.0
-    
-    # 통계적 피처
-    features["end_x_variance"] = 0.0
-    features["end_x_std"] = 0.0
-    features["end_y_variance"] = 0.0
-    features["end_y_std"] = 0.0
-    features["attack_trend"] = 0.0
-    
-    # StatsBomb 압박 피처
-    features["statsbomb_pressure_count"] = 0.0
-    features["statsbomb_under_pressure_count"] = 0.0
-    features["statsbomb_counterpress_count"] = 0.0
-    features["statsbomb_pressure_rate"] = 0.0
-    features["statsbomb_recent_pressure_count"] = 0.0
-    features["statsbomb_pressure_intensity"] = 0.0
-    
-    # StatsBomb 압박 피처
-    features["statsbomb_pressure_count"] = 0.0
-    features["statsbomb_under_pressure_count"] = 0.0
-    features["statsbomb_counterpress_count"] = 0.0
-    features["statsbomb_pressure_rate"] = 0.0
-    features["statsbomb_recent_pressure_count"] = 0.0
-    features["statsbomb_pressure_intensity"] = 0.0
-    
-    # 압박 프록시 피처
-    features["pressure_proxy_failure_rate"] = 0.0
-    features["pressure_proxy_failure_density"] = 0.0
-    features["pressure_proxy_rapid_turnover"] = 0.0
-    
-    # 상호작용 피처
-    features["pass_success_interaction"] = 0.0
-    features["pass_success_ratio"] = 0.0
-    features["final_third_event_density"] = 0.0
-    features["penalty_area_event_density"] = 0.0
-    features["forward_final_third_interaction"] = 0.0
-    features["event_rate_success_interaction"] = 0.0
-    features["penetration_depth"] = 0.0
-    features["center_attack_interaction"] = 0.0
-    features["pressure_attack_interaction"] = 0.0
-    features["pressure_trend_interaction"] = 0.0
-    features["variance_attack_interaction"] = 0.0
-    features["variance_trend_interaction"] = 0.0
+            print(f"Warning: Pressure data not found at {pressure_path}, using regular CSV")
     
-    return features
+    print(f"Streaming Track2 data from: {csv_path}")
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Track2 data file not found: {csv_path}")
+    return iter_csv_games(csv_path), "team_id" in get_game_index(csv_path).header
+
+
+def _game_config_samples(
+    game_id, batch: EventBatch, has_team: bool, configs: Sequence[WindowConfig]
+) -> List[List[Dict]]:
+    """경기 하나를 여러 설정으로 샘플링 (설정 순서대로)"""
+    game = _GameArrays(batch)
+    return [_game_samples(game_id, game, has_team, config) for config in configs]
+
+
+def _game_samples_from_file(
+    path: str, game_id, has_team: bool, configs: Sequence[WindowConfig]
+) -> List[List[Dict]]:
+    """워커 진입점: 경기 컬럼 파일(.npz)을 읽어 샘플 생성"""
+    with np.load(path, allow_pickle=False) as data:
+        columns = {key: data[key] for key in data.files}
+    os.remove(path)
+    batch = EventBatch.from_columns(str(game_id), columns)
+    return _game_config_samples(game_id, batch, has_team, configs)
+
+
+def _shard_path(cache_dir: Path, game_id, rows_digest: str, has_team: bool, config: WindowConfig) -> Path:
+    """경기 피처 캐시 파일 경로: 설정별 디렉토리 아래, 경기 행 내용·설정·피처 버전의 해시로 구분"""
+    key = json.dumps(
+        {
+            "rows": rows_digest,
+            "has_team": has_team,
+            "window": list(config),
+            "feature_version": FEATURE_VERSION,
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in str(game_id))
+    return cache_dir / config_name(config) / f"game_{safe}.{digest}.parquet"
+
+
+def _write_shard(path: Path, frame: pd.DataFrame) -> None:
+    """캐시 파일 저장 후 같은 경기의 이전(다른 키) 캐시 파일 삭제"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    game_prefix = path.name.split(".", 1)[0]
+    for old in path.parent.glob(f"{game_prefix}.*.parquet"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def _build_shards(
+    games: Iterable[Tuple[object, EventBatch]],
+    configs: List[WindowConfig],
+    has_team: bool,
+    shard_dir: Path,
+    workers: int = 1,
+) -> Tuple[Dict[WindowConfig, List[Path]], Dict[WindowConfig, Optional[List[str]]]]:
+    """경기·설정별 샘플 파일(shard)을 만들고 설정별 shard 경로(경기 순서)와 피처 컬럼을 반환
+
+    shard 키가 같은 파일이 이미 있으면 다시 계산하지 않는다.
+    경기를 하나씩 흘려 보내며 계산 즉시 shard로 내려 쓰므로, 메모리에는 처리 중인 경기만 남는다
+    (workers > 1이면 최대 workers × 2 경기).
+    """
+    shards: Dict[WindowConfig, List[Path]] = {config: [] for config in configs}
+    feature_columns: Dict[WindowConfig, Optional[List[str]]] = dict.fromkeys(configs)
+    reused = rebuilt = 0
+
+    def write(missing: List[Tuple[WindowConfig, Path]], config_samples: List[List[Dict]]) -> None:
+        for (_, path), game_samples in zip(missing, config_samples):
+            _write_shard(path, pd.DataFrame(game_samples))
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()
+    with tempfile.TemporaryDirectory(prefix="will_have_shot_games_") as tmp_dir, pool as executor:
+        pending: Deque = deque()
+        for index, (game_id, batch) in enumerate(games):
+            # 피처 컬럼은 샘플이 있는 첫 경기의 첫 샘플 기준 (동적 type_* 컬럼 포함 여부가 여기서 정해짐)
+            if any(columns is None for columns in feature_columns.values()):
+                game = _GameArrays(batch)
+                for config, columns in feature_columns.items():
+                    if columns is None:
+                        feature_columns[config] = _first_sample_feature_columns(game, config)
+            rows_digest = batch.digest()
+            missing = []
+            for config in configs:
+                path = _shard_path(shard_dir, game_id, rows_digest, has_team, config)
+                shards[config].append(path)
+                if not path.exists():
+                    missing.append((config, path))
+            reused += len(configs) - len(missing)
+            rebuilt += len(missing)
+            if not missing:
+                continue
+            game_configs = [config for config, _ in missing]
+            if executor is None:
+                write(missing, _game_config_samples(game_id, batch, has_team, game_configs))
+                continue
+            # 워커에는 경기 컬럼 파일 경로만 넘긴다 (전체 DataFrame을 pickle하지 않음)
+            npz_path = os.path.join(tmp_dir, f"game_{index:05d}.npz")
+            np.savez(npz_path, **batch.to_columns())
+            pending.append(
+                (missing, executor.submit(_game_samples_from_file, npz_path, game_id, has_team, game_configs))
+            )
+            while len(pending) >= workers * 2:
+                done_missing, future = pending.popleft()
+                write(done_missing, future.result())
+        while pending:
+            done_missing, future = pending.popleft()
+            write(done_missing, future.result())
+
+    print(f"Game shards: reused {reused}, built {rebuilt}")
+    return shards, feature_columns
+
+
+def generate_sweep_samples(
+    df: pd.DataFrame,
+    configs: Sequence[WindowConfig],
+    workers: int = 1,
+    cache_dir: Optional[Path] = None,
+) -> List[Tuple[pd.DataFrame, Optional[List[str]]]]:
+    """여러 (window, lookahead, stride) 설정의 샘플을 한 번에 생성 (설정 순서대로 (데이터셋, 피처 컬럼))
+
+    경기마다 정렬·EventBatch 변환·prefix·라벨용 Shot 시각을 한 번만 만들고 모든 설정이 공유한다.
+    피처는 윈도우 행 구간이 같으면 설정이 달라도 다시 계산하지 않는다.
+    workers > 1이면 경기 단위 프로세스 병렬.
+    cache_dir를 주면 경기·설정별 샘플을 캐시 파일로 남기고, 키가 같으면 다시 계산하지 않는다.
+    """
+    configs = list(dict.fromkeys(tuple(float(v) for v in config) for config in configs))
+    has_team = "team_id" in df.columns
+    
+    print(f"Processing {df['game_id'].nunique()} games x {len(configs)} configs (workers={workers})...")
+    
+    with tempfile.TemporaryDirectory(prefix="will_have_shot_shards_") as tmp_dir:
+        shards, feature_columns = _build_shards(
+            _sorted_batches(df.groupby("game_id", sort=False)),
+            configs,
+            has_team,
+            cache_dir or Path(tmp_dir),
+            workers,
+        )
+        # shard를 원래 경기 순서로 이어 붙인다
+        outputs = []
+        for config in configs:
+            frames = [frame for frame in map(pd.read_parquet, shards[config]) if len(frame)]
+            dataset_df = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+            print(f"Generated {len(dataset_df):,} samples ({config_name(config)})")
+            outputs.append((dataset_df, feature_columns[config]))
+    return outputs
 
 
 def generate_samples(
@@ -583,79 +397,136 @@ def generate_samples(
     window_seconds: float = 45.0,
     lookahead_seconds: float = 10.0,
     stride_seconds: float = 5.0,
-) -> pd.DataFrame:
-    """윈도우 기반 샘플 생성"""
-    samples = []
-    feature_columns = None
-    
-    game_ids = df["game_id"].unique()
-    print(f"Processing {len(game_ids)} games...")
-    
-    for game_id in game_ids:
-        game_df = df[df["game_id"] == game_id].copy()
-        game_df = game_df.sort_values("time_seconds")
-        
-        if len(game_df) == 0:
-            continue
-        
-        min_time = game_df["time_seconds"].min()
-        max_time = game_df["time_seconds"].max()
-        
-        # stride로 시간 포인트 생성
-        current_time = min_time + window_seconds
-        while current_time <= max_time - lookahead_seconds:
-            # Feature window: [current_time - window_seconds, current_time]
-            window_events = game_df[
-                (game_df["time_seconds"] >= current_time - window_seconds)
-                & (game_df["time_seconds"] <= current_time)
-            ]
-            
-            # Label window: (current_time, current_time + lookahead_seconds]
-            future_events = game_df[
-                (game_df["time_seconds"] > current_time)
-                & (game_df["time_seconds"] <= current_time + lookahead_seconds)
-            ]
-            
-            # Label: will_have_shot (팀 기준)
-            # 현재 시점 t에서 마지막 이벤트의 team_id(=공격 주체) 기준으로,
-            # 미래 10초 내 그 팀의 Shot 발생 여부
-            will_have_shot = False
-            if len(window_events) > 0 and "team_id" in window_events.columns:
-                # 마지막 이벤트의 team_id (현재 공격 주체)
-                last_event = window_events.iloc[-1]
-                attacking_team_id = last_event.get("team_id")
-                
-                if pd.notna(attacking_team_id) and len(future_events) > 0:
-                    # 미래 10초 내 해당 팀의 Shot 발생 여부
-                    team_shots = future_events[
-                        (future_events["team_id"] == attacking_team_id)
-                        & (future_events["type_name"].str.lower() == "shot")
-                    ]
-                    will_have_shot = len(team_shots) > 0
+    workers: int = 1,
+    cache_dir: Optional[Path] = None,
+) -> Tuple[pd.DataFrame, Optional[List[str]]]:
+    """윈도우 기반 샘플 생성 (단일 설정)"""
+    return generate_sweep_samples(
+        df, [(window_seconds, lookahead_seconds, stride_seconds)], workers=workers, cache_dir=cache_dir
+    )[0]
+
+
+def _stitch_shards(shard_paths: Sequence[Path], output_path: Path, output_format: str) -> int:
+    """shard들을 경기 순서대로 출력 파일에 이어 쓰기 (경기 하나씩 읽어 Parquet row group / CSV 청크로 추가)
+
+    컬럼은 pd.concat과 같이 shard 등장 순서의 합집합이고, 없는 컬럼은 NaN으로 채운다.
+    """
+    import pyarrow as pa  # pandas to_parquet 엔진
+    import pyarrow.parquet as pq
+
+    shard_paths = [path for path in shard_paths if pq.ParquetFile(path).metadata.num_rows]
+    columns: Dict[str, None] = {}
+    for path in shard_paths:
+        columns.update(dict.fromkeys(pq.read_schema(path).names))
+    columns = list(columns)
+
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    writer = None
+    rows = 0
+    try:
+        for path in shard_paths:
+            frame = pd.read_parquet(path).reindex(columns=columns)
+            if output_format == "csv":
+                frame.to_csv(tmp_path, mode="a" if rows else "w", header=not rows, index=False)
             else:
-                # team_id가 없으면 기존 방식 (어떤 팀이든 Shot 발생)
-                will_have_shot = (future_events["type_name"].str.lower() == "shot").any()
-            
-            # 피처 추출
-            features = extract_features(window_events)
-            
-            # 첫 샘플에서 피처 컬럼 저장
-            if feature_columns is None:
-                feature_columns = list(features.keys())
-            
-            # 샘플 생성
-            sample = {
-                "game_id": game_id,
-                "current_time": current_time,
-                "will_have_shot": bool(will_have_shot),
-                **features,
-            }
-            samples.append(sample)
-            
-            current_time += stride_seconds
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    if not rows:
+        if output_format == "csv":
+            pd.DataFrame().to_csv(tmp_path, index=False)
+        else:
+            pd.DataFrame().to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, output_path)
+    return rows
+
+
+def stream_sweep_to_files(
+    games: Iterable[Tuple[object, pd.DataFrame]],
+    has_team: bool,
+    configs: Sequence[WindowConfig],
+    output_paths: Sequence[Path],
+    output_format: str = "parquet",
+    workers: int = 1,
+    cache_dir: Optional[Path] = None,
+) -> List[Optional[List[str]]]:
+    """경기 단위 스트리밍 빌드: 경기별 DataFrame을 하나씩 받아 shard로 내려 쓰고 설정별 파일로 이어 붙인다
+
+    최대 메모리는 전체 데이터셋이 아니라 가장 큰 경기 하나(+ 병렬 처리 중인 경기)에 비례한다.
+    설정 순서대로 피처 컬럼을 반환한다.
+    """
+    configs = list(dict.fromkeys(tuple(float(v) for v in config) for config in configs))
+    print(f"Streaming games x {len(configs)} configs (workers={workers})...")
+    with tempfile.TemporaryDirectory(prefix="will_have_shot_shards_") as tmp_dir:
+        shards, feature_columns = _build_shards(
+            _sorted_batches(games), configs, has_team, cache_dir or Path(tmp_dir), workers
+        )
+        for config, output_path in zip(configs, output_paths):
+            rows = _stitch_shards(shards[config], output_path, output_format)
+            print(f"Generated {rows:,} samples ({config_name(config)}) -> {output_path}")
+    return [feature_columns[config] for config in configs]
+
+
+def _print_label_distribution(dataset_df: pd.DataFrame) -> None:
+    """라벨 분포와 game_id별 양성 비율 출력"""
+    label_counts = dataset_df["will_have_shot"].value_counts() if len(dataset_df) else pd.Series(dtype=int)
+    positive_count = label_counts.get(True, 0)
+    negative_count = label_counts.get(False, 0)
+    total_count = len(dataset_df)
+    positive_ratio = positive_count / total_count if total_count > 0 else 0.0
     
-    print(f"Generated {len(samples):,} samples")
-    return pd.DataFrame(samples), feature_columns
+    print(f"\nLabel distribution:")
+    print(f"  Positive (will_have_shot=True): {positive_count:,} ({positive_ratio*100:.2f}%)")
+    print(f"  Negative (will_have_shot=False): {negative_count:,} ({(1-positive_ratio)*100:.2f}%)")
+    print(f"  Total: {total_count:,}")
+    
+    # game_id별 양성 비율 분포
+    if "game_id" in dataset_df.columns:
+        game_stats = dataset_df.groupby("game_id")["will_have_shot"].agg(["sum", "count"])
+        game_stats["positive_ratio"] = game_stats["sum"] / game_stats["count"]
+        print(f"\nGame-level positive ratio:")
+        print(f"  Mean: {game_stats['positive_ratio'].mean()*100:.2f}%")
+        print(f"  Max: {game_stats['positive_ratio'].max()*100:.2f}%")
+        print(f"  Min: {game_stats['positive_ratio'].min()*100:.2f}%")
+        print(f"  Games with 0% positive: {(game_stats['positive_ratio'] == 0).sum()}")
+        print(f"  Games with >10% positive: {(game_stats['positive_ratio'] > 0.1).sum()}")
+
+
+def _save_outputs(
+    artifacts_dir: Path, dataset_df: pd.DataFrame, feature_columns, output_format: str, suffix: str = ""
+) -> None:
+    """데이터셋과 피처 컬럼 목록 저장"""
+    if output_format == "parquet":
+        output_path = artifacts_dir / f"will_have_shot_dataset{suffix}.parquet"
+        dataset_df.to_parquet(output_path, index=False)
+    else:
+        output_path = artifacts_dir / f"will_have_shot_dataset{suffix}.csv"
+        dataset_df.to_csv(output_path, index=False)
+    print(f"\nSaved dataset to: {output_path}")
+    _save_feature_columns(artifacts_dir, feature_columns, suffix)
+
+
+def _save_feature_columns(artifacts_dir: Path, feature_columns, suffix: str = "") -> None:
+    feature_columns_path = artifacts_dir / f"feature_columns{suffix}.json"
+    with open(feature_columns_path, "w", encoding="utf-8") as f:
+        json.dump(feature_columns, f, indent=2)
+    print(f"Saved feature columns to: {feature_columns_path}")
+
+
+def _read_label_columns(output_path: Path, output_format: str) -> pd.DataFrame:
+    """라벨 분포 출력용으로 스트리밍 출력 파일에서 game_id/will_have_shot만 읽기"""
+    columns = ["game_id", "will_have_shot"]
+    try:
+        if output_format == "csv":
+            return pd.read_csv(output_path, usecols=columns)
+        return pd.read_parquet(output_path, columns=columns)
+    except (ValueError, KeyError, pd.errors.EmptyDataError):  # 샘플이 하나도 없는 출력
+        return pd.DataFrame()
 
 
 def main():
@@ -674,20 +545,45 @@ def main():
     parser.add_argument(
         "--window-seconds",
         type=float,
-        default=45.0,
-        help="Feature window 크기 (초)",
+        nargs="+",
+        default=[45.0],
+        help="Feature window 크기 (초, 여러 개면 sweep)",
     )
     parser.add_argument(
         "--lookahead-seconds",
         type=float,
-        default=10.0,
-        help="Label lookahead 크기 (초)",
+        nargs="+",
+        default=[10.0],
+        help="Label lookahead 크기 (초, 여러 개면 sweep)",
     )
     parser.add_argument(
         "--stride-seconds",
         type=float,
-        default=5.0,
-        help="시간 stride (초)",
+        nargs="+",
+        default=[5.0],
+        help="시간 stride (초, 여러 개면 sweep)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="경기 단위 병렬 처리 프로세스 수 (1이면 단일 프로세스)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(project_root / "artifacts" / "will_have_shot_cache"),
+        help="경기별 피처 캐시 디렉토리",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="경기별 피처 캐시를 쓰지 않고 전체 재계산",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="경기 단위 스트리밍 빌드 (CSV/Parquet을 경기별로 읽고 출력은 row group 단위로 추가)",
     )
     parser.add_argument(
         "--output-format",
@@ -698,62 +594,55 @@ def main():
     )
     args = parser.parse_args()
     
-    # 데이터 로드
-    df = load_track2_data(args.csv_path, use_pressure=args.use_pressure)
-    
-    # 샘플 생성
-    dataset_df, feature_columns = generate_samples(
-        df,
-        window_seconds=args.window_seconds,
-        lookahead_seconds=args.lookahead_seconds,
-        stride_seconds=args.stride_seconds,
-    )
-    
-    # 라벨 분포 확인
-    label_counts = dataset_df["will_have_shot"].value_counts()
-    positive_count = label_counts.get(True, 0)
-    negative_count = label_counts.get(False, 0)
-    total_count = len(dataset_df)
-    positive_ratio = positive_count / total_count if total_count > 0 else 0.0
-    
-    print(f"\nLabel distribution:")
-    print(f"  Positive (will_have_shot=True): {positive_count:,} ({positive_ratio*100:.2f}%)")
-    print(f"  Negative (will_have_shot=False): {negative_count:,} ({(1-positive_ratio)*100:.2f}%)")
-    print(f"  Total: {total_count:,}")
-    
-    # game_id별 양성 비율 분포
-    if "game_id" in dataset_df.columns:
-        game_stats = dataset_df.groupby("game_id")["will_have_shot"].agg(["sum", "count"])
-        game_stats["positive_ratio"] = game_stats["sum"] / game_stats["count"]
-        print(f"\nGame-level positive ratio:")
-        print(f"  Mean: {game_stats['positive_ratio'].mean()*100:.2f}%")
-        print(f"  Max: {game_stats['positive_ratio'].max()*100:.2f}%")
-        print(f"  Min: {game_stats['positive_ratio'].min()*100:.2f}%")
-        print(f"  Games with 0% positive: {(game_stats['positive_ratio'] == 0).sum()}")
-        print(f"  Games with >10% positive: {(game_stats['positive_ratio'] > 0.1).sum()}")
+    configs = list(itertools.product(args.window_seconds, args.lookahead_seconds, args.stride_seconds))
+    cache_dir = None if args.no_cache else Path(args.cache_dir)
     
     # 출력 디렉토리 생성
     artifacts_dir = project_root / "artifacts"
     artifacts_dir.mkdir(exist_ok=True)
     
-    # 데이터셋 저장
-    if args.output_format == "parquet":
-        output_path = artifacts_dir / "will_have_shot_dataset.parquet"
-        dataset_df.to_parquet(output_path, index=False)
+    # 값이 여러 개면 window × lookahead × stride 조합 전체를 한 번에 만들고 설정 이름을 붙여 저장
+    # (단일 설정은 기존 파일명)
+    unique_configs = list(dict.fromkeys(configs))
+    sweep = len(unique_configs) > 1
+    suffixes = [f"_{config_name(config)}" if sweep else "" for config in unique_configs]
+    
+    if args.streaming:
+        # 경기 단위로 읽어 shard → 출력 파일에 row group으로 이어 쓰기 (전체 데이터를 메모리에 올리지 않음)
+        games, has_team = open_track2_games(args.csv_path, use_pressure=args.use_pressure)
+        output_paths = [
+            artifacts_dir / f"will_have_shot_dataset{suffix}.{args.output_format}" for suffix in suffixes
+        ]
+        all_feature_columns = stream_sweep_to_files(
+            games,
+            has_team,
+            unique_configs,
+            output_paths,
+            output_format=args.output_format,
+            workers=args.workers,
+            cache_dir=cache_dir,
+        )
+        for config, suffix, output_path, feature_columns in zip(
+            unique_configs, suffixes, output_paths, all_feature_columns
+        ):
+            if sweep:
+                print(f"\n=== {config_name(config)} ===")
+            _print_label_distribution(_read_label_columns(output_path, args.output_format))
+            _save_feature_columns(artifacts_dir, feature_columns, suffix)
     else:
-        output_path = artifacts_dir / "will_have_shot_dataset.csv"
-        dataset_df.to_csv(output_path, index=False)
-    print(f"\nSaved dataset to: {output_path}")
-    
-    # 피처 컬럼 저장
-    feature_columns_path = artifacts_dir / "feature_columns.json"
-    with open(feature_columns_path, "w", encoding="utf-8") as f:
-        json.dump(feature_columns, f, indent=2)
-    print(f"Saved feature columns to: {feature_columns_path}")
+        # 데이터 로드
+        df = load_track2_data(args.csv_path, use_pressure=args.use_pressure)
+        
+        # 샘플 생성
+        outputs = generate_sweep_samples(df, configs, workers=args.workers, cache_dir=cache_dir)
+        for config, suffix, (dataset_df, feature_columns) in zip(unique_configs, suffixes, outputs):
+            if sweep:
+                print(f"\n=== {config_name(config)} ===")
+            _print_label_distribution(dataset_df)
+            _save_outputs(artifacts_dir, dataset_df, feature_columns, args.output_format, suffix)
     
     print("\nDataset build complete!")
 
 
 if __name__ == "__main__":
     main()
-
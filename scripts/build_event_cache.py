@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Track2 이벤트 캐시 빌더
+
+raw_data.csv를 경기별 컬럼형 캐시(.npz)로 변환한다.
+서버는 세션 시작 시 캐시가 없거나 원본이 바뀌었으면 자동으로 재생성하지만,
+배포 전에 한 번 실행해 두면 첫 세션 시작 지연을 없앨 수 있다.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# backend 패키지를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.core.config import get_settings  # noqa: E402
+from app.services.data.event_cache import build_event_cache, cache_dir_for  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track2 경기별 이벤트 캐시 빌더")
+    parser.add_argument(
+        "--csv-path",
+        type=str,
+        default=get_settings().events_data_path,
+        help="Track2 CSV 파일 경로",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.csv_path).exists():
+        raise FileNotFoundError(f"Track2 data file not found: {args.csv_path}")
+
+    started = time.perf_counter()
+    summary = build_event_cache(args.csv_path)
+    elapsed = time.perf_counter() - started
+    total_rows = sum(entry["rows"] for entry in summary["games"].values())
+    print(f"Cached {len(summary['games'])} games ({total_rows:,} rows) in {elapsed:.2f}s")
+    print(f"Cache directory: {cache_dir_for(args.csv_path)}")
+
+
+if __name__ == "__main__":
+    main()
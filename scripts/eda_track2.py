@@ -16,25 +16,48 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
-# 프로젝트 루트를 path에 추가
+# 프로젝트 루트와 backend 패키지를 path에 추가
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.services.data.frames import load_track2_frame  # noqa: E402
+
+# 분석에 쓰는 컬럼
+EDA_COLUMNS = (
+    "game_id",
+    "period_id",
+    "team_id",
+    "time_seconds",
+    "type_name",
+    "result_name",
+    "start_x",
+    "start_y",
+    "end_x",
+    "end_y",
+)
 
 
 def load_track2_data(csv_path: str) -> pd.DataFrame:
-    """Track2 CSV 파일 로드"""
+    """Track2 CSV 파일 로드 (분석 컬럼만 compact dtype으로, typed Parquet 캐시 사용)"""
     print(f"Loading Track2 data from: {csv_path}")
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"Track2 data file not found: {csv_path}")
     
-    df = pd.read_csv(csv_path, low_memory=False)
+    df = load_track2_frame(csv_path, EDA_COLUMNS)
     print(f"Loaded {len(df):,} rows, {len(df.columns)} columns")
     return df
 
 
+def _value_counts(series: pd.Series) -> pd.Series:
+    """value_counts (category dtype의 빈 카테고리 제외)"""
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
 def analyze_type_name(df: pd.DataFrame) -> dict:
     """type_name 고유값 및 빈도 분석"""
-    type_counts = df["type_name"].value_counts()
+    type_counts = _value_counts(df["type_name"])
     top_30_dict = type_counts.head(30).to_dict()
     # numpy 타입을 Python 기본 타입으로 변환
     top_30_dict = {k: int(v) for k, v in top_30_dict.items()}
@@ -47,15 +70,15 @@ def analyze_type_name(df: pd.DataFrame) -> dict:
 
 def analyze_result_name(df: pd.DataFrame) -> dict:
     """result_name 분포 및 type_name별 교차표"""
-    result_dist = df["result_name"].value_counts()
+    result_dist = _value_counts(df["result_name"])
     result_dict = {k: int(v) for k, v in result_dist.to_dict().items()}
     
     # type_name별 result_name 교차표 (Top 10 type_name만)
-    top_types = df["type_name"].value_counts().head(10).index
+    top_types = _value_counts(df["type_name"]).head(10).index
     cross_tab = {}
     for t in top_types:
         subset = df[df["type_name"] == t]
-        cross_dict = subset["result_name"].value_counts().to_dict()
+        cross_dict = _value_counts(subset["result_name"]).to_dict()
         cross_tab[t] = {k: int(v) for k, v in cross_dict.items()}
     
     return {
@@ -76,7 +99,7 @@ def analyze_coordinates(df: pd.DataFrame) -> dict:
             result[col] = {"error": "column not found"}
             continue
         
-        series = pd.to_numeric(df[col], errors="coerce")
+        series = pd.to_numeric(df[col], errors="coerce").astype(np.float64)
         result[col] = {
             "min": float(series.min()) if not series.isna().all() else None,
             "max": float(series.max()) if not series.isna().all() else None,
@@ -9,12 +9,19 @@ StatsBomb의 under_pressure, counterpress 이벤트를 Track2 이벤트 로그
 import argparse
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 from tqdm import tqdm
 
+# backend 패키지를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.services.data.frames import load_track2_frame  # noqa: E402
+
 
 def load_statsbomb_events(statsbomb_dir: Path) -> Dict[str, List[Dict]]:
     """StatsBomb 이벤트 데이터 로드"""
@@ -224,7 +231,7 @@ def main():
     
     # Track2 데이터 로드
     print(f"\nLoading Track2 data from: {args.track2_csv}")
-    track2_df = pd.read_csv(args.track2_csv, low_memory=False)
+    track2_df = load_track2_frame(args.track2_csv)
     print(f"Loaded {len(track2_df):,} Track2 events")
     
     # 매칭 및 압박 피처 생성
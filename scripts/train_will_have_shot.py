@@ -5,46 +5,82 @@ will_have_shot 모델 학습/평가 스크립트
 Split: game_id 홀드아웃 (시간 누수 방지)
 모델: LogisticRegression, GradientBoostingClassifier
 평가: PR-AUC, ROC-AUC, F1, Precision/Recall
+
+split별로 전처리한 float32 X / y / game_id는 artifacts/will_have_shot_matrices/<키>/에
+.npy로 캐시되고 mmap으로 열린다. 키는 데이터셋(경로·mtime·size), 피처 목록, test_size,
+split seed의 해시라서 같은 설정으로 다시 돌리면 Parquet 로드·split·전처리를 건너뛴다
+(--no-matrix-cache로 끌 수 있음).
+
+--streaming은 데이터셋 전체를 메모리에 올리지 않는다: row group 배치를 여러 번 읽으며
+scaler와 SGD LogisticRegression을 점진 학습하고, HGB는 uint8 bin 표본(--hgb-max-rows)으로
+학습한다. 평가도 test 경기를 배치로 예측해 (y, 확률, game_id)만 모은다.
 """
 
 import argparse
+import hashlib
 import json
 import os
+import shutil
 import sys
+import tempfile
+import time
+import warnings
 from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
 
 import joblib
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
+from joblib import Parallel, delayed, parallel_config
+from sklearn.base import clone
 from sklearn.calibration import CalibratedClassifierCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 - Halving*SearchCV 활성화
 from sklearn.ensemble import (
     GradientBoostingClassifier,
     HistGradientBoostingClassifier,
     StackingClassifier,
     VotingClassifier,
 )
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import (
     average_precision_score,
-    f1_score,
-    make_scorer,
-    precision_recall_curve,
-    precision_score,
+    log_loss,
     roc_auc_score,
     roc_curve,
 )
 from sklearn.model_selection import (
     GridSearchCV,
     GroupShuffleSplit,
+    HalvingGridSearchCV,
+    HalvingRandomSearchCV,
     RandomizedSearchCV,
+    StratifiedKFold,
 )
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import KBinsDiscretizer, StandardScaler
+from threadpoolctl import threadpool_limits
+
+try:  # scikit-learn >= 1.6: 학습된 base를 앙상블 안에서 다시 학습하지 않고 재사용
+    from sklearn.frozen import FrozenEstimator
+except ImportError:  # pragma: no cover - 구버전은 앙상블이 base를 다시 학습
+    FrozenEstimator = None
 
 # 프로젝트 루트를 path에 추가
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.services.alerts.compiled import export_model, save_compiled  # noqa: E402
+
+# 캐시 파일 형식이나 전처리가 바뀌면 올린다
+MATRIX_CACHE_VERSION = 1
+SPLITS = ("train", "test", "train_train", "train_val")
+STACKING_FOLDS = 3
+BASE_MODELS = ("logistic_regression", "hist_gradient_boosting")
+ENSEMBLE_MODELS = ("voting_soft", "stacking")
+
+SplitMatrices = Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]
 
 
 def load_dataset(dataset_path: str) -> pd.DataFrame:
@@ -93,205 +129,635 @@ def split_by_game_id(
 
 
 def prepare_features(df: pd.DataFrame, feature_columns: list) -> tuple:
-    """피처와 라벨 준비"""
-    X = df[feature_columns].values
-    y = df["will_have_shot"].astype(int).values
+    """피처와 라벨 준비 (float32 X 한 벌에서 제자리 처리)"""
+    X = df[feature_columns].to_numpy(dtype=np.float32, copy=True)
+    y = df["will_have_shot"].astype(np.int8).to_numpy()
     
-    # 결측치 및 이상치 처리
-    # 1. 무한대 값 클리핑 (극단값 방지)
-    X = np.clip(X, -1e6, 1e6)
+    # 결측치 및 이상치 처리: NaN → 0, ±무한대 → ±1e6, 극단값 클리핑
+    np.nan_to_num(X, copy=False, nan=0.0, posinf=1e6, neginf=-1e6)
+    np.clip(X, -1e6, 1e6, out=X)
     
-    # 2. NaN, 무한대 처리
-    X = np.nan_to_num(X, nan=0.0, posinf=1e6, neginf=-1e6)
+    # 표준화 전 검증 (분산이 0인 피처 제거는 학습 단계에서 처리)
     
-    # 3. 다시 클리핑 (안전장치)
-    X = np.clip(X, -1e6, 1e6)
+    return X, y
+
+
+def _game_ids(df: pd.DataFrame) -> np.ndarray:
+    """game_id 배열 (문자열 id는 .npy에 pickle 없이 저장되도록 고정 길이 문자열로)"""
+    game_ids = df["game_id"].to_numpy()
+    return game_ids.astype(str) if game_ids.dtype == object else game_ids
+
+
+def build_split_matrices(
+    df: pd.DataFrame, feature_columns: list, test_size: float = 0.2, random_state: int = 42
+) -> Tuple[SplitMatrices, list, list]:
+    """train/test 홀드아웃과 train 안의 train/val split별 (X, y, game_id)"""
+    train_df, test_df, train_games, test_games = split_by_game_id(
+        df, test_size=test_size, random_state=random_state
+    )
+    train_train_df, train_val_df, _, _ = split_by_game_id(
+        train_df, test_size=0.2, random_state=random_state
+    )
+    frames = {"train": train_df, "test": test_df, "train_train": train_train_df, "train_val": train_val_df}
+    splits = {
+        name: (*prepare_features(frame, feature_columns), _game_ids(frame))
+        for name, frame in frames.items()
+    }
+    return splits, train_games, test_games
+
+
+def _matrix_cache_key(dataset_path: str, feature_columns: Sequence[str], test_size: float, random_state: int) -> str:
+    stat = os.stat(dataset_path)
+    payload = json.dumps(
+        {
+            "version": MATRIX_CACHE_VERSION,
+            "dataset": [os.path.abspath(dataset_path), stat.st_mtime_ns, stat.st_size],
+            "features": list(feature_columns),
+            "test_size": test_size,
+            "random_state": random_state,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def _write_matrix_cache(path: Path, splits: SplitMatrices, meta: dict) -> None:
+    """임시 디렉토리에 모두 쓴 뒤 이름을 바꿔 반쯤 쓴 캐시가 보이지 않게 한다"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+    try:
+        for name, arrays in splits.items():
+            for part, array in zip(("X", "y", "groups"), arrays):
+                np.save(tmp_dir / f"{name}_{part}.npy", array, allow_pickle=False)
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_dir, path)
+    except OSError:
+        # 다른 실행이 먼저 같은 키를 썼거나 저장 실패: 이번 결과는 메모리에서 그대로 쓴다
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_split_matrices(
+    dataset_path: str,
+    feature_columns: list,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    cache_dir: Optional[str] = None,
+) -> Tuple[SplitMatrices, list, list]:
+    """split별 (X, y, game_id)와 train/test game 목록 (cache_dir가 있으면 mmap 캐시 사용)"""
+    cache_path = None
+    if cache_dir:
+        cache_path = Path(cache_dir) / _matrix_cache_key(dataset_path, feature_columns, test_size, random_state)
+        if (cache_path / "meta.json").exists():
+            print(f"Loading prepared matrices from cache: {cache_path}")
+            with open(cache_path / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            splits = {
+                name: tuple(
+                    np.load(cache_path / f"{name}_{part}.npy", mmap_mode="r", allow_pickle=False)
+                    for part in ("X", "y", "groups")
+                )
+                for name in SPLITS
+            }
+            for name in ("train", "test"):
+                print(f"  {name}: {len(splits[name][1]):,} samples")
+            return splits, meta["train_games"], meta["test_games"]
     
-    # 4. 표준화 전 검증 (분산이 0인 피처 제거는 학습 단계에서 처리)
+    df = load_dataset(dataset_path)
+    splits, train_games, test_games = build_split_matrices(df, feature_columns, test_size, random_state)
+    if cache_path is not None:
+        meta = {"train_games": train_games, "test_games": test_games, "feature_columns": list(feature_columns)}
+        _write_matrix_cache(cache_path, splits, meta)
+        print(f"Cached prepared matrices: {cache_path}")
+    return splits, train_games, test_games
+
+
+def _logistic_regression() -> LogisticRegression:
+    return LogisticRegression(class_weight="balanced", max_iter=1000, random_state=42)
+
+
+def _hist_gradient_boosting() -> HistGradientBoostingClassifier:
+    return HistGradientBoostingClassifier(max_iter=100, learning_rate=0.1, max_depth=5, random_state=42)
+
+
+# 튜닝 탐색 공간 (grid: 기존 전수/무작위 탐색, halving: successive halving)
+LR_PARAM_GRID = {
+    "C": [0.01, 0.1, 1.0, 10.0, 100.0],
+    "solver": ["lbfgs", "liblinear"],
+    "class_weight": ["balanced", None],
+}
+HGB_PARAM_GRID = {
+    "max_iter": [50, 100, 200],
+    "learning_rate": [0.05, 0.1, 0.2],
+    "max_depth": [3, 5, 7],
+    "min_samples_leaf": [10, 20, 30],
+}
+# halving 모드의 HGB: max_iter는 early stopping이 정하므로 탐색하지 않는다
+HGB_HALVING_PARAMS = {
+    "learning_rate": [0.03, 0.05, 0.1, 0.2],
+    "max_depth": [3, 5, 7, None],
+    "min_samples_leaf": [10, 20, 30, 50],
+    "max_leaf_nodes": [15, 31, 63],
+    "l2_regularization": [0.0, 0.1, 1.0],
+}
+HALVING_FACTOR = 3
+HALVING_CANDIDATES = 27
+SEARCH_CV = GroupShuffleSplit(n_splits=3, test_size=0.2, random_state=42)
+
+
+class GroupHoldoutHGB(HistGradientBoostingClassifier):
+    """반복 수(max_iter 이하)를 경기 단위 홀드아웃으로 정하는 HGB
+
+    샘플이 겹치는 45s/5s 윈도우라 HGB 내장 early stopping(무작위 행 validation_fraction)은
+    같은 경기의 이웃 윈도우를 학습/검증 양쪽에 넣어 검증 점수가 새고 늦게 멈춘다.
+    fit(game_ids=...)이면 validation_fraction만큼의 경기를 GroupShuffleSplit으로 떼어
+    n_iter_no_change회씩 warm start로 늘리며 검증 log loss가 좋아지지 않을 때까지 학습하고,
+    가장 좋았던 반복 수로 전체 행을 다시 학습한다. game_ids가 없으면 max_iter까지 학습.
+    """
+
+    def fit(self, X, y, sample_weight=None, game_ids=None):
+        if game_ids is None:
+            return super().fit(X, y, sample_weight=sample_weight)
+        X, y = np.asarray(X), np.asarray(y)
+        splitter = GroupShuffleSplit(n_splits=1, test_size=self.validation_fraction, random_state=self.random_state)
+        train_idx, val_idx = next(splitter.split(X, y, np.asarray(game_ids)))
+        weight = None if sample_weight is None else np.asarray(sample_weight)[train_idx]
+
+        probe = clone(self).set_params(warm_start=True)
+        best_loss, best_iter, n_iter = np.inf, self.max_iter, 0
+        while n_iter < self.max_iter:
+            n_iter = min(n_iter + self.n_iter_no_change, self.max_iter)
+            probe.set_params(max_iter=n_iter).fit(X[train_idx], y[train_idx], sample_weight=weight)
+            losses = [
+                log_loss(y[val_idx], proba, labels=probe.classes_)
+                for proba in probe.staged_predict_proba(X[val_idx])
+            ]
+            if min(losses) >= best_loss:
+                break  # 이번 n_iter_no_change회 동안 좋아지지 않음
+            best_loss, best_iter = min(losses), int(np.argmin(losses)) + 1
+
+        max_iter = self.max_iter
+        try:  # 고른 반복 수로 전체 행 재학습 (max_iter 파라미터는 원래 상한으로 되돌린다)
+            self.max_iter = best_iter
+            super().fit(X, y, sample_weight=sample_weight)
+        finally:
+            self.max_iter = max_iter
+        self.holdout_loss_ = best_loss
+        return self
+
+
+def _early_stopping_hgb(**params) -> GroupHoldoutHGB:
+    """경기 10% 홀드아웃 검증 손실이 10회 연속 좋아지지 않으면 멈추는 HGB (max_iter는 상한)"""
+    return GroupHoldoutHGB(
+        max_iter=500,
+        early_stopping=False,
+        validation_fraction=0.1,
+        n_iter_no_change=10,
+        random_state=42,
+        **params,
+    )
+
+
+def tune_estimator(
+    estimator, X: np.ndarray, y: np.ndarray, groups: np.ndarray, search: str, n_jobs: int = 1, label: str = ""
+):
+    """PR-AUC 기준 하이퍼파라미터 탐색 (game_id GroupShuffleSplit 3-fold) → best_estimator_
+
+    - grid: LR은 GridSearchCV(20조합), HGB는 RandomizedSearchCV(20회), 모든 후보를 전체 fold로 학습
+    - halving: successive halving(표본 수를 HALVING_FACTOR배씩 늘리며 상위 1/HALVING_FACTOR만 남김).
+      HGB는 경기 단위 홀드아웃(GroupHoldoutHGB)으로 반복 수를 정한다.
+    """
+    is_hgb = isinstance(estimator, HistGradientBoostingClassifier)
+    common = {"cv": SEARCH_CV, "scoring": "average_precision", "n_jobs": n_jobs, "verbose": 0}
+    fit_params = {}
+    if search == "halving":
+        # exhaust: 마지막 단계가 전체 표본을 쓰도록 시작 표본 수를 정한다
+        halving = {
+            "factor": HALVING_FACTOR,
+            "resource": "n_samples",
+            "min_resources": "exhaust",
+            "random_state": 42,
+            **common,
+        }
+        if is_hgb:
+            searcher = HalvingRandomSearchCV(
+                _early_stopping_hgb(), HGB_HALVING_PARAMS, n_candidates=HALVING_CANDIDATES, **halving
+            )
+            # fold 안에서도 경기 단위 홀드아웃으로 반복 수를 정하도록 game_id를 fit 인자로 넘긴다
+            fit_params = {"game_ids": groups}
+        else:
+            searcher = HalvingGridSearchCV(estimator, LR_PARAM_GRID, **halving)
+    elif is_hgb:
+        # RandomizedSearchCV 사용 (GridSearchCV보다 빠름)
+        searcher = RandomizedSearchCV(estimator, HGB_PARAM_GRID, n_iter=20, random_state=42, **common)
+    else:
+        searcher = GridSearchCV(estimator, LR_PARAM_GRID, **common)
     
-    return X, y
+    started = time.perf_counter()
+    searcher.fit(X, y, groups=groups, **fit_params)
+    best = searcher.best_estimator_
+    print(f"  {label} {search} search: {len(searcher.cv_results_['params'])} fits x 3 folds"
+          f" in {time.perf_counter() - started:.1f}s")
+    print(f"  {label} best params: {searcher.best_params_}"
+          + (f" (game holdout: {best.n_iter_} iterations)" if isinstance(best, GroupHoldoutHGB) else ""))
+    print(f"  {label} best CV score (PR-AUC): {searcher.best_score_:.4f}")
+    return best
 
 
-def train_models(
+def fit_logistic_regression(
     X_train: np.ndarray,
     y_train: np.ndarray,
     groups: np.ndarray = None,
     tune_hyperparams: bool = False,
+    n_jobs: int = 1,
+    estimator: Optional[LogisticRegression] = None,
+    search: str = "grid",
 ) -> dict:
-    """여러 모델 학습 (하이퍼파라미터 튜닝 옵션 포함)"""
-    models = {}
-    
-    # 1. LogisticRegression (표준화 필요)
-    print("\nTraining LogisticRegression...")
+    """LogisticRegression (표준화 필요, 튜닝 옵션, estimator를 주면 그 설정으로 학습)"""
     scaler = StandardScaler()
-    with tqdm(total=1, desc="  Scaling features", unit="step") as pbar:
-        X_train_scaled = scaler.fit_transform(X_train)
-        pbar.update(1)
+    X_train_scaled = scaler.fit_transform(X_train)
     
     if tune_hyperparams and groups is not None:
-        print("  Tuning hyperparameters...")
-        param_grid = {
-            "C": [0.01, 0.1, 1.0, 10.0, 100.0],
-            "solver": ["lbfgs", "liblinear"],
-            "class_weight": ["balanced", None],
-        }
-        # PR-AUC를 최대화하는 하이퍼파라미터 찾기
-        pr_auc_scorer = make_scorer(average_precision_score, needs_proba=True)
-        cv = GroupShuffleSplit(n_splits=3, test_size=0.2, random_state=42)
-        grid_search = GridSearchCV(
+        # 탐색 전 데이터 재검증
+        X_train_scaled_clean = np.clip(X_train_scaled, -10, 10)
+        lr = tune_estimator(
             LogisticRegression(max_iter=1000, random_state=42),
-            param_grid,
-            cv=cv,
-            scoring=pr_auc_scorer,
-            n_jobs=-1,
-            verbose=0,  # tqdm과 충돌 방지
+            X_train_scaled_clean, y_train, groups, search, n_jobs, label="LogisticRegression",
         )
-        # GridSearchCV 진행 표시
-        total_combinations = len(param_grid["C"]) * len(param_grid["solver"]) * len(param_grid["class_weight"])
-        with tqdm(total=total_combinations * 3, desc="  GridSearchCV", unit="fold") as pbar:
-            # GridSearchCV 전 데이터 재검증
-            X_train_scaled_clean = np.clip(X_train_scaled, -10, 10)
-            grid_search.fit(X_train_scaled_clean, y_train, groups=groups)
-            pbar.update(total_combinations * 3)
-        lr = grid_search.best_estimator_
-        print(f"  Best params: {grid_search.best_params_}")
-        print(f"  Best CV score (PR-AUC): {grid_search.best_score_:.4f}")
     else:
-        lr = LogisticRegression(
-            class_weight="balanced",
-            max_iter=1000,
-            random_state=42,
-        )
-        with tqdm(total=1, desc="  Training", unit="model") as pbar:
-            lr.fit(X_train_scaled, y_train)
-            pbar.update(1)
+        lr = clone(estimator) if estimator is not None else _logistic_regression()
+        lr.fit(X_train_scaled, y_train)
     
-    models["logistic_regression"] = {
+    return {
         "model": lr,
         "scaler": scaler,
         "name": "LogisticRegression",
     }
-    
-    # 2. HistGradientBoostingClassifier (더 빠르고 효율적)
-    print("Training HistGradientBoostingClassifier...")
+
+
+def fit_hist_gradient_boosting(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    groups: np.ndarray = None,
+    tune_hyperparams: bool = False,
+    n_jobs: int = 1,
+    estimator: Optional[HistGradientBoostingClassifier] = None,
+    search: str = "grid",
+) -> dict:
+    """HistGradientBoostingClassifier (더 빠르고 효율적, 튜닝 옵션, estimator를 주면 그 설정으로 학습)"""
     if tune_hyperparams and groups is not None:
-        print("  Tuning hyperparameters...")
-        param_grid = {
-            "max_iter": [50, 100, 200],
-            "learning_rate": [0.05, 0.1, 0.2],
-            "max_depth": [3, 5, 7],
-            "min_samples_leaf": [10, 20, 30],
-        }
-        pr_auc_scorer = make_scorer(average_precision_score, needs_proba=True)
-        cv = GroupShuffleSplit(n_splits=3, test_size=0.2, random_state=42)
-        # RandomizedSearchCV 사용 (GridSearchCV보다 빠름)
-        random_search = RandomizedSearchCV(
+        hgb = tune_estimator(
             HistGradientBoostingClassifier(random_state=42),
-            param_grid,
-            n_iter=20,  # 20개 조합만 시도
-            cv=cv,
-            scoring=pr_auc_scorer,
-            n_jobs=-1,
-            random_state=42,
-            verbose=0,  # tqdm과 충돌 방지
+            X_train, y_train, groups, search, n_jobs, label="HistGradientBoosting",
         )
-        # RandomizedSearchCV 진행 표시
-        with tqdm(total=20 * 3, desc="  RandomizedSearchCV", unit="fold") as pbar:
-            random_search.fit(X_train, y_train, groups=groups)
-            pbar.update(20 * 3)
-        hgb = random_search.best_estimator_
-        print(f"  Best params: {random_search.best_params_}")
-        print(f"  Best CV score (PR-AUC): {random_search.best_score_:.4f}")
     else:
-        hgb = HistGradientBoostingClassifier(
-            max_iter=100,
-            learning_rate=0.1,
-            max_depth=5,
-            random_state=42,
-        )
-        with tqdm(total=1, desc="  Training", unit="model") as pbar:
-            hgb.fit(X_train, y_train)
-            pbar.update(1)
+        hgb = clone(estimator) if estimator is not None else _hist_gradient_boosting()
+        hgb.fit(X_train, y_train)
     
-    models["hist_gradient_boosting"] = {
+    return {
         "model": hgb,
         "scaler": None,
         "name": "HistGradientBoostingClassifier",
     }
-    
-    return models
 
 
-def train_ensemble_models(
-    X_train: np.ndarray,
-    y_train: np.ndarray,
-    base_models: dict,
+def _raw_input_estimator(model_dict: dict):
+    """원본 X를 받는 추정기 (scaler가 있으면 Pipeline으로 묶음, 앙상블 base용)"""
+    if model_dict["scaler"]:
+        return Pipeline([("scaler", model_dict["scaler"]), ("lr", model_dict["model"])])
+    return model_dict["model"]
+
+
+def _unfitted_base_estimators(base_estimators: Optional[dict] = None) -> list:
+    """앙상블 base (원본 X 입력, base 후보와 같은 설정)"""
+    base_estimators = base_estimators or {}
+    lr = base_estimators.get("logistic_regression", _logistic_regression())
+    hgb = base_estimators.get("hist_gradient_boosting", _hist_gradient_boosting())
+    return [
+        ("lr", Pipeline([("scaler", StandardScaler()), ("lr", clone(lr))])),
+        ("hgb", clone(hgb)),
+    ]
+
+
+def fit_oof_fold(estimator, X: np.ndarray, y: np.ndarray, train_idx: np.ndarray, test_idx: np.ndarray) -> np.ndarray:
+    """Stacking용 out-of-fold 예측: fold train으로 학습한 estimator의 fold test P(y=1)"""
+    model = clone(estimator).fit(X[train_idx], y[train_idx])
+    return model.predict_proba(X[test_idx])[:, 1]
+
+
+def fit_stacking_refit(
+    X_train: np.ndarray, y_train: np.ndarray, base_estimators: Optional[dict] = None, n_jobs: int = 1
 ) -> dict:
-    """앙상블 모델 학습"""
-    models = {}
-    
-    # Base 모델 준비 (scaled 버전)
-    scaler = StandardScaler()
-    with tqdm(total=1, desc="  Scaling features", unit="step") as pbar:
-        X_train_scaled = scaler.fit_transform(X_train)
-        pbar.update(1)
-    
-    # LR은 scaled 데이터 필요, HGB는 원본 데이터 사용
-    lr_scaled = LogisticRegression(
-        class_weight="balanced", max_iter=1000, random_state=42
-    )
-    with tqdm(total=1, desc="  Training LR", unit="model") as pbar:
-        lr_scaled.fit(X_train_scaled, y_train)
-        pbar.update(1)
-    
-    hgb = HistGradientBoostingClassifier(
-        max_iter=100, learning_rate=0.1, max_depth=5, random_state=42
+    """FrozenEstimator가 없는 scikit-learn용: base까지 새로 학습하는 StackingClassifier"""
+    stacking = StackingClassifier(
+        estimators=_unfitted_base_estimators(base_estimators),
+        final_estimator=LogisticRegression(class_weight="balanced", random_state=42),
+        cv=STACKING_FOLDS,
+        n_jobs=n_jobs,
     )
-    with tqdm(total=1, desc="  Training HGB", unit="model") as pbar:
-        hgb.fit(X_train, y_train)
-        pbar.update(1)
-    
-    # 1. Voting Classifier (Soft)
-    # Voting은 원본 데이터를 사용하므로, LR을 Pipeline으로 래핑
-    print("\nTraining VotingClassifier (soft)...")
-    lr_pipeline = Pipeline([("scaler", scaler), ("lr", lr_scaled)])
+    stacking.fit(X_train, y_train)
+    return {"model": stacking, "scaler": None, "name": "StackingClassifier"}
+
+
+def fit_voting_refit(X_train: np.ndarray, y_train: np.ndarray, base_estimators: Optional[dict] = None) -> dict:
+    """FrozenEstimator가 없는 scikit-learn용: base까지 새로 학습하는 VotingClassifier"""
+    voting_soft = VotingClassifier(estimators=_unfitted_base_estimators(base_estimators), voting="soft")
+    voting_soft.fit(X_train, y_train)
+    return {"model": voting_soft, "scaler": None, "name": "VotingClassifier (soft)"}
+
+
+def build_voting(base_models: dict, X_train: np.ndarray, y_train: np.ndarray) -> dict:
+    """이미 학습된 LR/HGB를 고정(FrozenEstimator)해 묶은 soft VotingClassifier"""
     voting_soft = VotingClassifier(
         estimators=[
-            ("lr", lr_pipeline),
-            ("hgb", hgb),
+            ("lr", FrozenEstimator(_raw_input_estimator(base_models["logistic_regression"]))),
+            ("hgb", FrozenEstimator(_raw_input_estimator(base_models["hist_gradient_boosting"]))),
         ],
         voting="soft",
     )
-    with tqdm(total=1, desc="  Training Voting", unit="model") as pbar:
-        voting_soft.fit(X_train, y_train)
-        pbar.update(1)
-    models["voting_soft"] = {
-        "model": voting_soft,
-        "scaler": None,  # Voting 내부에서 처리
-        "name": "VotingClassifier (soft)",
-    }
-    
-    # 2. Stacking Classifier
-    print("Training StackingClassifier...")
+    voting_soft.fit(X_train, y_train)  # base는 다시 학습하지 않음 (라벨 인코더만 준비)
+    return {"model": voting_soft, "scaler": None, "name": "VotingClassifier (soft)"}
+
+
+def build_stacking(base_models: dict, oof_predictions: np.ndarray, X_train: np.ndarray, y_train: np.ndarray) -> dict:
+    """out-of-fold 예측으로 학습한 meta LR + 이미 학습된 base로 만든 StackingClassifier
+
+    StackingClassifier(cv=STACKING_FOLDS)가 내부에서 하는 것과 같은 fold(StratifiedKFold)와
+    같은 meta 입력(base별 P(y=1))을 쓰므로 결과 모델이 같다. base의 전체 데이터 학습은
+    base 후보 학습 결과를 그대로 쓴다.
+    """
+    final_estimator = LogisticRegression(class_weight="balanced", random_state=42)
+    final_estimator.fit(oof_predictions, y_train)
     stacking = StackingClassifier(
         estimators=[
-            ("lr", lr_pipeline),
-            ("hgb", hgb),
+            ("lr", FrozenEstimator(_raw_input_estimator(base_models["logistic_regression"]))),
+            ("hgb", FrozenEstimator(_raw_input_estimator(base_models["hist_gradient_boosting"]))),
         ],
-        final_estimator=LogisticRegression(class_weight="balanced", random_state=42),
-        cv=3,
-        n_jobs=-1,
-    )
-    with tqdm(total=3, desc="  Stacking CV", unit="fold") as pbar:
-        stacking.fit(X_train, y_train)
-        pbar.update(3)
-    models["stacking"] = {
-        "model": stacking,
-        "scaler": None,  # Stacking 내부에서 처리
-        "name": "StackingClassifier",
+        final_estimator=FrozenEstimator(final_estimator),
+        cv=STACKING_FOLDS,
+    )
+    stacking.fit(X_train, y_train)  # base/meta 모두 고정이라 학습 없이 속성만 채운다
+    return {"model": stacking, "scaler": None, "name": "StackingClassifier"}
+
+
+def _timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def run_tasks(tasks: Dict[str, tuple], n_workers: int, threads_per_worker: int) -> Dict[str, tuple]:
+    """독립 작업들을 프로세스 n_workers개에 나눠 실행 → {이름: (결과, 초)}
+
+    작업마다 BLAS/OpenMP 스레드를 threads_per_worker개로 제한해 전체 코어 예산을 넘지 않는다.
+    큰 배열(mmap 캐시 포함)은 joblib이 워커에 메모리 맵으로 넘긴다.
+    """
+    names = list(tasks)
+    if n_workers <= 1 or len(names) <= 1:
+        with threadpool_limits(limits=threads_per_worker):
+            results = [_timed(*tasks[name]) for name in names]
+    else:
+        with parallel_config(backend="loky", inner_max_num_threads=threads_per_worker):
+            results = Parallel(n_jobs=min(n_workers, len(names)))(
+                delayed(_timed)(*tasks[name]) for name in names
+            )
+    return dict(zip(names, results))
+
+
+def train_candidates(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    groups: np.ndarray = None,
+    tune_hyperparams: bool = False,
+    include_ensemble: bool = False,
+    n_jobs: int = -1,
+    base_estimators: Optional[dict] = None,
+    search: str = "grid",
+) -> Tuple[dict, Dict[str, float]]:
+    """후보 모델들을 코어 예산(n_jobs) 안에서 동시에 학습 → (models, 후보별 학습 시간)
+
+    1단계: LR, HGB, (앙상블이면) Stacking out-of-fold fold 학습을 모두 동시에 실행
+    2단계: 학습된 LR/HGB를 재사용해 Voting/Stacking 조립 (base 재학습 없음)
+    튜닝하면 fold 학습은 튜닝된 설정을 알아야 하므로 1단계 뒤에 돈다.
+    base_estimators({"logistic_regression": ..., "hist_gradient_boosting": ...})를 주면
+    튜닝 없이 그 설정으로 학습한다 (전체 train 재학습용).
+    """
+    budget = joblib.cpu_count() if n_jobs is None or n_jobs < 1 else n_jobs
+    tune = tune_hyperparams and groups is not None and base_estimators is None
+    specs = base_estimators or {}
+    reuse = include_ensemble and FrozenEstimator is not None
+    folds = list(StratifiedKFold(n_splits=STACKING_FOLDS).split(X_train, y_train)) if reuse else []
+    
+    def fold_tasks(estimators) -> Dict[str, tuple]:
+        return {
+            f"stacking_fold{k}_{name}": (fit_oof_fold, estimator, X_train, y_train, train_idx, test_idx)
+            for name, estimator in estimators
+            for k, (train_idx, test_idx) in enumerate(folds)
+        }
+    
+    def schedule(tasks: Dict[str, tuple]) -> Dict[str, tuple]:
+        workers = min(budget, len(tasks))
+        print(f"\nTraining {len(tasks)} tasks on {workers} workers x {max(1, budget // workers)} threads: "
+              f"{', '.join(tasks)}")
+        return run_tasks(tasks, workers, max(1, budget // workers))
+    
+    inner_jobs = max(1, budget // (2 + len(folds) * 2))
+    tasks = {
+        "logistic_regression": (
+            fit_logistic_regression,
+            X_train, y_train, groups, tune, inner_jobs, specs.get("logistic_regression"), search,
+        ),
+        "hist_gradient_boosting": (
+            fit_hist_gradient_boosting,
+            X_train, y_train, groups, tune, inner_jobs, specs.get("hist_gradient_boosting"), search,
+        ),
+    }
+    if include_ensemble and not reuse:
+        # FrozenEstimator가 없으면 앙상블이 base를 직접 학습한다 (그래도 다른 후보와 동시에)
+        tasks["voting_soft"] = (fit_voting_refit, X_train, y_train, base_estimators)
+        tasks["stacking"] = (fit_stacking_refit, X_train, y_train, base_estimators)
+    if not tune:
+        tasks.update(fold_tasks(_unfitted_base_estimators(base_estimators)))
+    results = schedule(tasks)
+    models = {name: result for name, (result, _) in results.items() if not name.startswith("stacking_fold")}
+    seconds = {name: elapsed for name, (_, elapsed) in results.items()}
+    
+    if reuse:
+        if tune:
+            base = [(name, _raw_input_estimator(models[key]))
+                    for name, key in zip(("lr", "hgb"), BASE_MODELS)]
+            fold_results = schedule(fold_tasks(base))
+            results.update(fold_results)
+            seconds.update({name: elapsed for name, (_, elapsed) in fold_results.items()})
+        oof = np.zeros((len(y_train), 2))
+        for column, name in enumerate(("lr", "hgb")):
+            for k, (_, test_idx) in enumerate(folds):
+                oof[test_idx, column] = results[f"stacking_fold{k}_{name}"][0]
+        models["voting_soft"], seconds["voting_soft"] = _timed(build_voting, models, X_train, y_train)
+        models["stacking"], seconds["stacking"] = _timed(build_stacking, models, oof, X_train, y_train)
+    
+    print(f"\n{'task':>28} {'fit s':>8}")
+    for name, elapsed in seconds.items():
+        print(f"{name:>28} {elapsed:>8.2f}")
+    return models, seconds
+
+
+# Threshold sweep 범위 (양 끝 포함, 간격은 --sweep-step)
+SWEEP_RANGE = (0.1, 0.9)
+PRECISION_TARGET = 0.6
+PRECISION_AT_K = (10, 20)
+
+
+def sweep_thresholds(step: float = 0.05) -> np.ndarray:
+    """SWEEP_RANGE를 step 간격으로 나눈 오름차순 threshold 격자"""
+    low, high = SWEEP_RANGE
+    return np.round(np.arange(low, high + step / 2, step), 10)
+
+
+class RankedScores:
+    """예측 확률을 한 번 내림차순 정렬해 둔 누적 TP
+
+    threshold t 이상을 알림으로 볼 때의 알림 수는 searchsorted로, TP는 누적합 조회로 구하므로
+    threshold 개수와 상관없이 검증 세트를 다시 훑지 않는다.
+    """
+
+    def __init__(self, y_true: np.ndarray, proba: np.ndarray) -> None:
+        order = np.argsort(-proba, kind="stable")
+        self.scores = proba[order]
+        self._negated = -self.scores  # 오름차순 (searchsorted용)
+        self.tp = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(np.asarray(y_true)[order] == 1, out=self.tp[1:])
+        self.positives = int(self.tp[-1])
+
+    def alerts(self, thresholds) -> np.ndarray:
+        """threshold별 확률 >= t 인 표본 수"""
+        return np.searchsorted(self._negated, -np.asarray(thresholds, dtype=np.float64), side="right")
+
+    def counts(self, alerts: np.ndarray) -> Dict[str, np.ndarray]:
+        """상위 alerts개를 알림으로 볼 때의 precision/recall/f1 (zero_division=0)"""
+        tp = self.tp[alerts].astype(np.float64)
+        alerts = np.asarray(alerts, dtype=np.float64)
+        return {
+            "precision": np.divide(tp, alerts, out=np.zeros_like(tp), where=alerts > 0),
+            "recall": tp / self.positives if self.positives else np.zeros_like(tp),
+            "f1": np.divide(2 * tp, alerts + self.positives, out=np.zeros_like(tp), where=alerts + self.positives > 0),
+        }
+
+    def curve_cuts(self) -> np.ndarray:
+        """precision_recall_curve의 점들에 해당하는 알림 수 (서로 다른 확률값 경계마다, 끝점 제외)
+
+        scikit-learn >= 1.3처럼 전체 recall에 도달한 뒤의 점도 남긴다.
+        """
+        return np.append(np.flatnonzero(np.diff(self.scores)) + 1, len(self.scores))
+
+    def precision_at(self, k: int) -> float:
+        return float(self.tp[k] / k) if len(self.scores) >= k else 0.0
+
+
+def alerts_by_game(proba: np.ndarray, game_ids: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """(경기 수, threshold 수) 알림 수 행렬 (thresholds는 오름차순)
+
+    표본마다 넘는 threshold 개수를 구간 번호로 잡아 경기×구간 bincount를 한 번 하고,
+    구간 축 역누적합으로 모든 threshold의 경기별 알림 수를 얻는다.
+    """
+    _, game_codes = np.unique(game_ids, return_inverse=True)
+    n_bins = len(thresholds) + 1
+    bins = np.searchsorted(thresholds, proba, side="right")
+    hist = np.bincount(game_codes.ravel() * n_bins + bins, minlength=(game_codes.max() + 1) * n_bins)
+    hist = hist.reshape(-1, n_bins)
+    return np.cumsum(hist[:, ::-1], axis=1)[:, ::-1][:, 1:]
+
+
+def threshold_sweep(
+    ranked: RankedScores,
+    proba: np.ndarray,
+    thresholds: np.ndarray,
+    n_games: Optional[int] = None,
+    game_ids: Optional[np.ndarray] = None,
+) -> list:
+    """threshold 격자별 precision/recall/f1 (+ 경기당 알림 수). 알림이 없는 threshold는 뺀다"""
+    alerts = ranked.alerts(thresholds)
+    table = ranked.counts(alerts)
+    per_game = alerts_by_game(proba, game_ids, thresholds) if game_ids is not None and len(game_ids) else None
+    sweep = []
+    for i in np.flatnonzero(alerts > 0):
+        row = {"threshold": float(thresholds[i]), **{name: float(values[i]) for name, values in table.items()}}
+        if n_games:
+            row["alerts_per_game"] = float(alerts[i] / n_games)
+        if per_game is not None:
+            row["max_alerts_per_game"] = int(per_game[:, i].max())
+            row["median_alerts_per_game"] = float(np.median(per_game[:, i]))
+        sweep.append(row)
+    return sweep
+
+
+def score_predictions(
+    y_val: np.ndarray,
+    y_val_pred_proba: np.ndarray,
+    val_games: list = None,
+    val_game_ids: Optional[np.ndarray] = None,
+    thresholds: Optional[np.ndarray] = None,
+) -> Tuple[dict, float, float]:
+    """예측 확률 → val 지표, F1 최대 threshold, Precision 우선 threshold
+
+    threshold 관련 지표는 모두 RankedScores 한 번의 정렬에서 계산한다.
+    """
+    val_roc_auc = roc_auc_score(y_val, y_val_pred_proba)
+    val_pr_auc = average_precision_score(y_val, y_val_pred_proba)
+    
+    ranked = RankedScores(y_val, y_val_pred_proba)
+    
+    # Threshold 선택 (val에서 F1 최대화, PR curve 점들 중에서)
+    cuts = ranked.curve_cuts()
+    curve = ranked.counts(cuts)
+    curve_thresholds = ranked.scores[cuts - 1]
+    best_f1_idx = len(cuts) - 1 - int(np.argmax(curve["f1"][::-1]))  # 동률이면 낮은 threshold
+    best_threshold = curve_thresholds[best_f1_idx] if ranked.positives else 0.5
+    
+    # Precision 우선 threshold (P >= 0.6을 만족하는 가장 낮은 threshold)
+    precision_above_target = np.flatnonzero(curve["precision"] >= PRECISION_TARGET)
+    if precision_above_target.size:
+        precision_threshold = curve_thresholds[precision_above_target[-1]]
+    else:
+        # precision_recall_curve의 끝점(P=1, R=0)만 목표를 넘는 경우: 기존과 같이 0.5
+        precision_threshold = 0.5
+    
+    # 선택된 threshold로 평가
+    at_best, at_precision = (
+        {name: float(values[0]) for name, values in ranked.counts(ranked.alerts([threshold])).items()}
+        for threshold in (best_threshold, precision_threshold)
+    )
+    
+    # 경기당 알림 수 계산 (val_games가 제공된 경우)
+    n_games = len(val_games) if val_games is not None and len(val_games) > 0 else None
+    alerts_per_game_at_best = None
+    if n_games:
+        alerts_per_game_at_best = float(ranked.alerts([best_threshold])[0] / n_games)
+    
+    # Threshold sweep (기본 0.1 ~ 0.9, 0.05 간격)
+    if thresholds is None:
+        thresholds = sweep_thresholds()
+    sweep = threshold_sweep(ranked, y_val_pred_proba, np.sort(thresholds), n_games, val_game_ids)
+    
+    metrics = {
+        "val_roc_auc": float(val_roc_auc),
+        "val_pr_auc": float(val_pr_auc),  # 1순위 지표
+        "best_threshold_f1": float(best_threshold),
+        "best_threshold_precision": float(precision_threshold),
+        "val_f1_at_best": at_best["f1"],
+        "val_precision_at_best": at_best["precision"],
+        "val_recall_at_best": at_best["recall"],
+        "val_f1_at_precision": at_precision["f1"],
+        "val_precision_at_precision": at_precision["precision"],
+        "val_recall_at_precision": at_precision["recall"],
+        **{f"precision_at_{k}": ranked.precision_at(k) for k in PRECISION_AT_K},
+        "threshold_sweep": sweep,
     }
     
-    return models
+    if alerts_per_game_at_best is not None:
+        metrics["alerts_per_game_at_best_threshold"] = alerts_per_game_at_best
+    
+    return metrics, best_threshold, precision_threshold
 
 
 def evaluate_model(
@@ -301,7 +767,9 @@ def evaluate_model(
     X_val: np.ndarray,
     y_val: np.ndarray,
     val_games: list = None,
-) -> dict:
+    val_game_ids: Optional[np.ndarray] = None,
+    thresholds: Optional[np.ndarray] = None,
+) -> Tuple[dict, float, float]:
     """모델 평가"""
     model = model_dict["model"]
     scaler = model_dict["scaler"]
@@ -316,85 +784,314 @@ def evaluate_model(
         y_train_pred_proba = model.predict_proba(X_train)[:, 1]
         y_val_pred_proba = model.predict_proba(X_val)[:, 1]
     
-    # 평가 지표
-    train_roc_auc = roc_auc_score(y_train, y_train_pred_proba)
-    val_roc_auc = roc_auc_score(y_val, y_val_pred_proba)
+    metrics, best_threshold, precision_threshold = score_predictions(
+        y_val, y_val_pred_proba, val_games, val_game_ids, thresholds
+    )
+    metrics = {
+        "train_roc_auc": float(roc_auc_score(y_train, y_train_pred_proba)),
+        "train_pr_auc": float(average_precision_score(y_train, y_train_pred_proba)),
+        **metrics,
+    }
+    return metrics, best_threshold, precision_threshold
+
+
+def save_best_model(
+    best_model_name: str,
+    best_model_dict: dict,
+    feature_columns: list,
+    all_metrics: dict,
+    test_metrics: dict,
+    test_f1_threshold: float,
+    test_precision_threshold: float,
+    train_games: list,
+    test_games: list,
+    positive_ratio: float,
+) -> None:
+    """test 성능 출력 + 모델/메트릭 artifacts 저장 (일반·스트리밍 학습 공통)"""
+    print(f"\nTest set performance:")
+    print(f"  Test PR-AUC (1순위): {test_metrics['val_pr_auc']:.4f}")
+    print(f"  Test ROC-AUC: {test_metrics['val_roc_auc']:.4f}")
+    print(f"  Test F1 (F1 최대 threshold): {test_metrics['val_f1_at_best']:.4f}")
+    print(f"  Test Precision (F1 최대 threshold): {test_metrics['val_precision_at_best']:.4f}")
+    print(f"  Test Recall (F1 최대 threshold): {test_metrics['val_recall_at_best']:.4f}")
+    print(f"  Test F1 (Precision≥0.6 threshold): {test_metrics['val_f1_at_precision']:.4f}")
+    print(f"  Test Precision (Precision≥0.6 threshold): {test_metrics['val_precision_at_precision']:.4f}")
+    print(f"  Test Recall (Precision≥0.6 threshold): {test_metrics['val_recall_at_precision']:.4f}")
+    print(f"  Test Precision@10: {test_metrics['precision_at_10']:.4f}")
+    print(f"  Test Precision@20: {test_metrics['precision_at_20']:.4f}")
+    if 'alerts_per_game_at_best_threshold' in test_metrics:
+        print(f"  Test Alerts per game (F1 최대 threshold): {test_metrics['alerts_per_game_at_best_threshold']:.2f}")
     
-    train_pr_auc = average_precision_score(y_train, y_train_pred_proba)
-    val_pr_auc = average_precision_score(y_val, y_val_pred_proba)
+    # 모델 저장
+    artifacts_dir = project_root / "artifacts"
+    artifacts_dir.mkdir(exist_ok=True)
+    
+    model_data = {
+        "model": best_model_dict["model"],
+        "scaler": best_model_dict["scaler"],
+        "feature_columns": feature_columns,
+        "threshold_f1": float(test_f1_threshold),
+        "threshold_precision": float(test_precision_threshold),
+        "window_sec": 45.0,
+        "lookahead_sec": 10.0,
+        "stride_sec": 5.0,
+        "train_games": train_games,
+        "test_games": test_games,
+        "metrics": {
+            "all_models": all_metrics,
+            "best_model": test_metrics,
+            "test_pr_auc": float(test_metrics["val_pr_auc"]),
+            "test_roc_auc": float(test_metrics["val_roc_auc"]),
+            "test_precision_at_precision_threshold": float(test_metrics["val_precision_at_precision"]),
+            "test_recall_at_precision_threshold": float(test_metrics["val_recall_at_precision"]),
+            "test_f1_at_precision_threshold": float(test_metrics["val_f1_at_precision"]),
+        },
+    }
+    
+    model_path = artifacts_dir / "will_have_shot_model.joblib"
+    joblib.dump(model_data, model_path)
+    print(f"\nSaved model to: {model_path}")
     
-    # Threshold 선택 (val에서 F1 최대화)
-    precision, recall, thresholds = precision_recall_curve(y_val, y_val_pred_proba)
-    f1_scores = 2 * (precision * recall) / (precision + recall + 1e-10)
-    best_f1_idx = np.argmax(f1_scores)
-    best_threshold = thresholds[best_f1_idx] if len(thresholds) > best_f1_idx else 0.5
-    
-    # Precision 우선 threshold (P >= 0.6)
-    precision_target = 0.6
-    precision_above_target = precision >= precision_target
-    if precision_above_target.any():
-        precision_threshold_idx = np.where(precision_above_target)[0][0]
-        precision_threshold = (
-            thresholds[precision_threshold_idx]
-            if precision_threshold_idx < len(thresholds)
-            else 0.5
+    # 서버용 배열 모델 (scikit-learn 없이 로드). 지원하지 않는 모델이면 이전 .npz를 지운다
+    compiled_path = model_path.with_suffix(".npz")
+    try:
+        arrays = export_model(best_model_dict["model"], best_model_dict["scaler"])
+    except ValueError as e:
+        compiled_path.unlink(missing_ok=True)
+        print(f"Skipped compiled model ({e}); the server will use the joblib model")
+    else:
+        meta = {key: model_data[key] for key in ("feature_columns", "threshold_f1", "threshold_precision")}
+        save_compiled(compiled_path, arrays, meta)
+        print(f"Saved compiled model to: {compiled_path}")
+    
+    # 메트릭 저장 (운영 지표 포함)
+    metrics_path = artifacts_dir / "will_have_shot_metrics.json"
+    with open(metrics_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "best_model": best_model_name,
+                "all_models": all_metrics,
+                "test_metrics": test_metrics,
+                "positive_ratio": positive_ratio,
+                # 운영 지표 (발표용)
+                "operational_metrics": {
+                    "threshold_sweep": test_metrics.get("threshold_sweep", []),
+                    "precision_at_10": test_metrics.get("precision_at_10", 0.0),
+                    "precision_at_20": test_metrics.get("precision_at_20", 0.0),
+                    "alerts_per_game_at_best_threshold": test_metrics.get("alerts_per_game_at_best_threshold"),
+                },
+            },
+            f,
+            indent=2,
         )
+    print(f"Saved metrics to: {metrics_path}")
+
+
+# 스트리밍 학습 (--streaming): 데이터셋을 배치로만 읽어 메모리 사용량을 배치 크기에 묶는다
+STREAM_BATCH_ROWS = 65_536
+STREAMING_MODELS = ("sgd_logistic_regression", "hist_gradient_boosting_binned")
+BIN_SAMPLE_ROWS = 100_000  # 분위수 bin 경계 추정용 표본 상한
+HGB_BINS = 255  # bin 번호가 uint8에 들어가는 최대값
+
+
+def iter_dataset_frames(dataset_path: str, columns: list, batch_rows: int = STREAM_BATCH_ROWS):
+    """Parquet는 row group 단위 배치로, CSV는 chunksize로 필요한 컬럼만 읽는다"""
+    if not os.path.exists(dataset_path):
+        raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
+    if dataset_path.endswith(".parquet"):
+        import pyarrow.parquet as pq  # pandas read_parquet 엔진
+        
+        for batch in pq.ParquetFile(dataset_path).iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
     else:
-        precision_threshold = best_threshold
+        yield from pd.read_csv(dataset_path, usecols=columns, chunksize=batch_rows)
+
+
+def scan_games(dataset_path: str, batch_rows: int = STREAM_BATCH_ROWS) -> Dict:
+    """game_id 컬럼만 훑어 경기별 샘플 수를 센다"""
+    rows_per_game: Dict = {}
+    for frame in iter_dataset_frames(dataset_path, ["game_id"], batch_rows):
+        games, counts = np.unique(_game_ids(frame), return_counts=True)
+        for game, count in zip(games.tolist(), counts.tolist()):
+            rows_per_game[game] = rows_per_game.get(game, 0) + count
+    return rows_per_game
+
+
+def split_games(games: list, test_size: float = 0.2, random_state: int = 42) -> Tuple[list, list]:
+    """split_by_game_id와 같은 game 분할 (GroupShuffleSplit은 고유 game 목록만으로 나눈다)"""
+    games = np.asarray(sorted(games))
+    splitter = GroupShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+    train_idx, test_idx = next(splitter.split(games, groups=games))
+    return games[train_idx].tolist(), games[test_idx].tolist()
+
+
+def iter_split_batches(dataset_path: str, feature_columns: list, games: list, batch_rows: int = STREAM_BATCH_ROWS):
+    """games에 속한 행만 (X float32, y int8, game_id) 배치로 (prepare_features와 같은 전처리)"""
+    columns = [*feature_columns, "will_have_shot", "game_id"]
+    wanted = np.asarray(games)
+    for frame in iter_dataset_frames(dataset_path, columns, batch_rows):
+        frame = frame[np.isin(_game_ids(frame), wanted)]
+        if len(frame):
+            yield (*prepare_features(frame, feature_columns), _game_ids(frame))
+
+
+def fit_streaming_candidates(
+    dataset_path: str,
+    feature_columns: list,
+    games: list,
+    n_rows: int,
+    names: Sequence[str] = STREAMING_MODELS,
+    batch_rows: int = STREAM_BATCH_ROWS,
+    epochs: int = 3,
+    hgb_max_rows: int = 500_000,
+    random_state: int = 42,
+) -> Tuple[dict, Dict[str, float]]:
+    """games의 행을 배치로 여러 번 읽어 스트리밍 후보를 학습 → (models, 후보별 학습 시간)
+
+    - 1회차: StandardScaler.partial_fit, 클래스 수, bin 경계용 표본 수집
+    - sgd_logistic_regression: 표준화한 배치를 섞어 SGDClassifier(log_loss).partial_fit,
+      epochs회 반복. class_weight="balanced"와 같은 가중치를 sample_weight로 준다.
+    - hist_gradient_boosting_binned: 분위수 bin(KBinsDiscretizer)으로 uint8 행렬을 만들며
+      최대 hgb_max_rows행을 표본으로 모아 HGB 학습. 저장되는 "scaler"가 binner라서
+      추론 시 같은 bin 번호로 바뀐다.
+    """
+    rng = np.random.default_rng(random_state)
+    seconds = dict.fromkeys(names, 0.0)
+    scaler = StandardScaler()
+    class_counts = np.zeros(2, dtype=np.int64)
+    bin_sample = []
+    sample_rate = min(1.0, BIN_SAMPLE_ROWS / max(n_rows, 1))
     
-    # 선택된 threshold로 평가
-    y_val_pred_f1 = (y_val_pred_proba >= best_threshold).astype(int)
-    y_val_pred_precision = (y_val_pred_proba >= precision_threshold).astype(int)
+    started = time.perf_counter()
+    for X, y, _ in tqdm(iter_split_batches(dataset_path, feature_columns, games, batch_rows), desc="  Pass 1 (stats)"):
+        scaler.partial_fit(X)
+        class_counts += np.bincount(y, minlength=2)
+        bin_sample.append(X[rng.random(len(y)) < sample_rate])
+    stats_seconds = time.perf_counter() - started
+    class_weight = class_counts.sum() / (2 * np.maximum(class_counts, 1))
     
-    # Precision@K 계산 (K=10, 20)
-    sorted_indices = np.argsort(y_val_pred_proba)[::-1]
-    precision_at_10 = float(y_val[sorted_indices[:10]].sum() / 10) if len(y_val) >= 10 else 0.0
-    precision_at_20 = float(y_val[sorted_indices[:20]].sum() / 20) if len(y_val) >= 20 else 0.0
+    models = {}
+    sgd = binner = None
+    if "sgd_logistic_regression" in names:
+        sgd = SGDClassifier(loss="log_loss", alpha=1e-4, random_state=random_state)
+        seconds["sgd_logistic_regression"] += stats_seconds
+    if "hist_gradient_boosting_binned" in names:
+        started = time.perf_counter()
+        binner = KBinsDiscretizer(n_bins=HGB_BINS, encode="ordinal", strategy="quantile", subsample=None)
+        with warnings.catch_warnings():
+            # 값이 몰린 피처는 겹치는 bin을 지운다는 경고가 피처마다 나온다
+            warnings.simplefilter("ignore", UserWarning)
+            binner.fit(np.concatenate(bin_sample))
+        seconds["hist_gradient_boosting_binned"] += time.perf_counter() - started
+    del bin_sample
     
-    # 경기당 알림 수 계산 (val_games가 제공된 경우)
-    alerts_per_game_at_best = None
-    if val_games is not None and len(val_games) > 0:
-        total_alerts = y_val_pred_f1.sum()
-        alerts_per_game_at_best = float(total_alerts / len(val_games))
-    
-    # Threshold sweep (0.1 ~ 0.9, 0.05 간격)
-    threshold_sweep = []
-    thresholds = np.arange(0.1, 0.95, 0.05)
-    for thresh in tqdm(thresholds, desc="  Threshold sweep", unit="threshold"):
-        y_pred = (y_val_pred_proba >= thresh).astype(int)
-        if y_pred.sum() > 0:  # 최소 1개 이상 예측이 있을 때만
-            sweep_metrics = {
-                "threshold": float(thresh),
-                "precision": float(precision_score(y_val, y_pred, zero_division=0)),
-                "recall": float(recall_score(y_val, y_pred, zero_division=0)),
-                "f1": float(f1_score(y_val, y_pred, zero_division=0)),
-            }
-            if val_games is not None and len(val_games) > 0:
-                sweep_metrics["alerts_per_game"] = float(y_pred.sum() / len(val_games))
-            threshold_sweep.append(sweep_metrics)
+    hgb_rate = min(1.0, hgb_max_rows / max(n_rows, 1))
+    binned, binned_y = [], []
+    for epoch in range(epochs if sgd is not None else 1):
+        batches = iter_split_batches(dataset_path, feature_columns, games, batch_rows)
+        for X, y, _ in tqdm(batches, desc=f"  Pass {epoch + 2} (fit)"):
+            if sgd is not None:
+                started = time.perf_counter()
+                order = rng.permutation(len(y))  # 배치 안 행은 경기·시간순이라 섞는다
+                # 추론(predict_streaming, CompiledModel, 서버)과 같은 입력: 클리핑 없이 표준화만
+                X_scaled = scaler.transform(X[order])
+                sgd.partial_fit(X_scaled, y[order], classes=np.array([0, 1]), sample_weight=class_weight[y[order]])
+                seconds["sgd_logistic_regression"] += time.perf_counter() - started
+            if binner is not None and epoch == 0:
+                started = time.perf_counter()
+                keep = rng.random(len(y)) < hgb_rate
+                binned.append(binner.transform(X[keep]).astype(np.uint8))
+                binned_y.append(y[keep])
+                seconds["hist_gradient_boosting_binned"] += time.perf_counter() - started
     
-    metrics = {
-        "train_roc_auc": float(train_roc_auc),
-        "val_roc_auc": float(val_roc_auc),
-        "train_pr_auc": float(train_pr_auc),
-        "val_pr_auc": float(val_pr_auc),  # 1순위 지표
-        "best_threshold_f1": float(best_threshold),
-        "best_threshold_precision": float(precision_threshold),
-        "val_f1_at_best": float(f1_score(y_val, y_val_pred_f1)),
-        "val_precision_at_best": float(precision_score(y_val, y_val_pred_f1)),
-        "val_recall_at_best": float(recall_score(y_val, y_val_pred_f1)),
-        "val_f1_at_precision": float(f1_score(y_val, y_val_pred_precision)),
-        "val_precision_at_precision": float(precision_score(y_val, y_val_pred_precision)),
-        "val_recall_at_precision": float(recall_score(y_val, y_val_pred_precision)),
-        "precision_at_10": precision_at_10,
-        "precision_at_20": precision_at_20,
-        "threshold_sweep": threshold_sweep,
+    if sgd is not None:
+        models["sgd_logistic_regression"] = {
+            "model": sgd, "scaler": scaler, "name": "SGD LogisticRegression (streaming)",
+        }
+    if binner is not None:
+        started = time.perf_counter()
+        hgb = _hist_gradient_boosting()
+        hgb.fit(np.concatenate(binned), np.concatenate(binned_y))
+        seconds["hist_gradient_boosting_binned"] += time.perf_counter() - started
+        models["hist_gradient_boosting_binned"] = {
+            "model": hgb, "scaler": binner, "name": "HistGradientBoosting (binned sample)",
+        }
+    return models, seconds
+
+
+def predict_streaming(
+    dataset_path: str, feature_columns: list, games: list, model_dict: dict, batch_rows: int = STREAM_BATCH_ROWS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """games의 행을 배치로 예측 → (y, 확률, game_id). 행마다 남는 건 이 세 값뿐이다"""
+    model, scaler = model_dict["model"], model_dict["scaler"]
+    ys, probas, game_ids = [], [], []
+    for X, y, groups in iter_split_batches(dataset_path, feature_columns, games, batch_rows):
+        probas.append(model.predict_proba(scaler.transform(X) if scaler else X)[:, 1])
+        ys.append(y)
+        game_ids.append(groups)
+    return np.concatenate(ys), np.concatenate(probas), np.concatenate(game_ids)
+
+
+def train_streaming(args, feature_columns: list) -> None:
+    """--streaming: game split → train_train 학습/train_val 선택 → train 재학습 → test 평가 (모두 배치 단위)"""
+    print(f"Scanning games in: {args.dataset_path}")
+    rows_per_game = scan_games(args.dataset_path, args.batch_rows)
+    train_games, test_games = split_games(list(rows_per_game), args.test_size, args.split_seed)
+    train_train_games, train_val_games = split_games(train_games, 0.2, args.split_seed)
+    n_rows = {
+        name: sum(rows_per_game[game] for game in games)
+        for name, games in (("train", train_games), ("test", test_games), ("train_train", train_train_games))
     }
+    print(f"  Train: {n_rows['train']:,} samples from {len(train_games)} games")
+    print(f"  Test: {n_rows['test']:,} samples from {len(test_games)} games")
     
-    if alerts_per_game_at_best is not None:
-        metrics["alerts_per_game_at_best_threshold"] = alerts_per_game_at_best
+    options = {
+        "batch_rows": args.batch_rows,
+        "epochs": args.sgd_epochs,
+        "hgb_max_rows": args.hgb_max_rows,
+        "random_state": args.split_seed,
+    }
+    thresholds = sweep_thresholds(args.sweep_step)
+    models, fit_seconds = fit_streaming_candidates(
+        args.dataset_path, feature_columns, train_train_games, n_rows["train_train"], **options
+    )
     
-    return metrics, best_threshold, precision_threshold
+    print(f"\nEvaluating models (PR-AUC priority)...")
+    all_metrics = {}
+    for model_name, model_dict in models.items():
+        y_val, proba, _ = predict_streaming(
+            args.dataset_path, feature_columns, train_val_games, model_dict, args.batch_rows
+        )
+        metrics, _, _ = score_predictions(y_val, proba, thresholds=thresholds)
+        metrics["fit_seconds"] = float(fit_seconds[model_name])
+        all_metrics[model_name] = metrics
+        print(f"  {model_dict['name']}: Val PR-AUC {metrics['val_pr_auc']:.4f}, ROC-AUC {metrics['val_roc_auc']:.4f}")
+    best_model_name = max(all_metrics, key=lambda name: all_metrics[name]["val_pr_auc"])
+    
+    print(f"\nRetraining best model ({models[best_model_name]['name']}) on full train set...")
+    retrained, _ = fit_streaming_candidates(
+        args.dataset_path, feature_columns, train_games, n_rows["train"], names=(best_model_name,), **options
+    )
+    best_model_dict = retrained[best_model_name]
+    
+    y_test, proba, test_game_ids = predict_streaming(
+        args.dataset_path, feature_columns, test_games, best_model_dict, args.batch_rows
+    )
+    test_metrics, test_f1_threshold, test_precision_threshold = score_predictions(
+        y_test, proba, test_games, test_game_ids, thresholds
+    )
+    save_best_model(
+        best_model_name,
+        best_model_dict,
+        feature_columns,
+        all_metrics,
+        test_metrics,
+        test_f1_threshold,
+        test_precision_threshold,
+        train_games,
+        test_games,
+        positive_ratio=float(y_test.mean()),
+    )
 
 
 def main():
@@ -432,7 +1129,14 @@ def main():
     parser.add_argument(
         "--tune-hyperparams",
         action="store_true",
-        help="하이퍼파라미터 튜닝 수행 (GridSearchCV/RandomizedSearchCV)",
+        help="하이퍼파라미터 튜닝 수행 (--search 참고)",
+    )
+    parser.add_argument(
+        "--search",
+        type=str,
+        choices=["grid", "halving"],
+        default="grid",
+        help="튜닝 방식: grid(GridSearchCV/RandomizedSearchCV) 또는 halving(successive halving + HGB early stopping)",
     )
     parser.add_argument(
         "--include-ensemble",
@@ -445,10 +1149,63 @@ def main():
         default=None,
         help="선택된 피처 목록 파일 경로 (JSON, 선택된 피처만 사용)",
     )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=-1,
+        help="후보 모델 동시 학습에 쓸 코어 예산 (-1: 모든 코어)",
+    )
+    parser.add_argument(
+        "--sweep-step",
+        type=float,
+        default=0.05,
+        help="threshold sweep 간격 (0.1 ~ 0.9, 양 끝 포함)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="데이터셋을 배치로만 읽는 스트리밍 학습 (SGD LogisticRegression + bin 표본 HGB, 튜닝/앙상블 없음)",
+    )
+    parser.add_argument(
+        "--batch-rows",
+        type=int,
+        default=STREAM_BATCH_ROWS,
+        help="스트리밍 학습의 배치 행 수",
+    )
+    parser.add_argument(
+        "--sgd-epochs",
+        type=int,
+        default=3,
+        help="스트리밍 학습에서 SGD가 train을 훑는 횟수",
+    )
+    parser.add_argument(
+        "--hgb-max-rows",
+        type=int,
+        default=500_000,
+        help="스트리밍 학습에서 HGB가 쓰는 uint8 bin 표본 행 수 상한",
+    )
+    parser.add_argument(
+        "--split-seed",
+        type=int,
+        default=42,
+        help="game_id split random_state (train/test, train 내부 train/val 모두)",
+    )
+    parser.add_argument(
+        "--matrix-cache-dir",
+        type=str,
+        default="artifacts/will_have_shot_matrices",
+        help="전처리된 split 행렬(.npy) 캐시 디렉토리",
+    )
+    parser.add_argument(
+        "--no-matrix-cache",
+        action="store_true",
+        help="split 행렬 캐시를 읽지도 쓰지도 않음",
+    )
     args = parser.parse_args()
     
     # 데이터 로드
-    df = load_dataset(args.dataset_path)
+    if not os.path.exists(args.dataset_path):
+        raise FileNotFoundError(f"Dataset file not found: {args.dataset_path}")
     feature_columns = load_feature_columns(args.feature_columns_path)
     
     # 선택된 피처 필터링 (옵션)
@@ -464,49 +1221,42 @@ def main():
             print("Warning: No features matched! Using all features.")
             feature_columns = load_feature_columns(args.feature_columns_path)
     
-    # Split
-    train_df, test_df, train_games, test_games = split_by_game_id(
-        df, test_size=args.test_size
-    )
+    if args.streaming:
+        if args.tune_hyperparams or args.include_ensemble:
+            print("Note: --streaming은 튜닝/앙상블을 지원하지 않아 무시합니다.")
+        train_streaming(args, feature_columns)
+        print("\nTraining complete!")
+        return
     
-    # 피처 준비
-    X_train, y_train = prepare_features(train_df, feature_columns)
-    X_test, y_test = prepare_features(test_df, feature_columns)
-    
-    # Validation split (train에서)
-    train_train_df, train_val_df, _, _ = split_by_game_id(
-        train_df, test_size=0.2, random_state=42
+    # Split + 피처 준비 (train/test, train 안에서 다시 train/val)
+    splits, train_games, test_games = load_split_matrices(
+        args.dataset_path,
+        feature_columns,
+        test_size=args.test_size,
+        random_state=args.split_seed,
+        cache_dir=None if args.no_matrix_cache else args.matrix_cache_dir,
     )
-    X_train_train, y_train_train = prepare_features(train_train_df, feature_columns)
-    X_train_val, y_train_val = prepare_features(train_val_df, feature_columns)
+    X_train, y_train, _ = splits["train"]
+    X_test, y_test, test_game_ids = splits["test"]
+    X_train_train, y_train_train, train_train_game_ids = splits["train_train"]
+    X_train_val, y_train_val, _ = splits["train_val"]
     
     # 그룹 정보 (하이퍼파라미터 튜닝용)
-    train_train_groups = train_train_df["game_id"].values if args.tune_hyperparams else None
+    train_train_groups = train_train_game_ids if args.tune_hyperparams else None
     
-    # 모델 학습
-    models = train_models(
+    # 모델 학습 (독립 후보는 코어 예산 안에서 동시에, 앙상블은 학습된 base 재사용)
+    models, fit_seconds = train_candidates(
         X_train_train,
         y_train_train,
         groups=train_train_groups,
         tune_hyperparams=args.tune_hyperparams,
+        include_ensemble=args.include_ensemble,
+        n_jobs=args.n_jobs,
+        search=args.search,
     )
     
-    # 앙상블 모델 학습 (옵션)
-    if args.include_ensemble:
-        print("\n" + "=" * 60)
-        print("Training ensemble models...")
-        print("=" * 60)
-        # Base 모델을 앙상블용으로 준비
-        base_models_for_ensemble = {
-            "logistic_regression": models["logistic_regression"],
-            "hist_gradient_boosting": models["hist_gradient_boosting"],
-        }
-        ensemble_models = train_ensemble_models(
-            X_train_train, y_train_train, base_models_for_ensemble
-        )
-        models.update(ensemble_models)
-    
     # 모델 평가 및 선택 (PR-AUC 우선)
+    thresholds = sweep_thresholds(args.sweep_step)
     print(f"\nEvaluating models (PR-AUC priority)...")
     best_model_name = None
     best_val_pr_auc = -1
@@ -519,7 +1269,9 @@ def main():
             y_train_train,
             X_train_val,
             y_train_val,
+            thresholds=thresholds,
         )
+        metrics["fit_seconds"] = float(fit_seconds[model_name])
         all_metrics[model_name] = metrics
         
         print(f"\n{model_dict['name']}:")
@@ -540,7 +1292,14 @@ def main():
     print(f"\nRetraining best model ({models[best_model_name]['name']}) on full train set...")
     best_model_dict = models[best_model_name]
     
-    if best_model_dict["scaler"]:
+    if best_model_name in ENSEMBLE_MODELS:
+        # 고정된 base는 fit이 무시되므로 base 설정 그대로 전체 train에서 다시 학습해 조립한다
+        base_estimators = {name: models[name]["model"] for name in BASE_MODELS}
+        retrained, _ = train_candidates(
+            X_train, y_train, include_ensemble=True, n_jobs=args.n_jobs, base_estimators=base_estimators
+        )
+        best_model_dict = retrained[best_model_name]
+    elif best_model_dict["scaler"]:
         scaler = StandardScaler()
         with tqdm(total=2, desc="  Scaling & Training", unit="step") as pbar:
             X_train_scaled = scaler.fit_transform(X_train)
@@ -561,79 +1320,26 @@ def main():
         X_test,
         y_test,
         val_games=test_games,
+        val_game_ids=test_game_ids,
+        thresholds=thresholds,
     )
     
-    print(f"\nTest set performance:")
-    print(f"  Test PR-AUC (1순위): {test_metrics['val_pr_auc']:.4f}")
-    print(f"  Test ROC-AUC: {test_metrics['val_roc_auc']:.4f}")
-    print(f"  Test F1 (F1 최대 threshold): {test_metrics['val_f1_at_best']:.4f}")
-    print(f"  Test Precision (F1 최대 threshold): {test_metrics['val_precision_at_best']:.4f}")
-    print(f"  Test Recall (F1 최대 threshold): {test_metrics['val_recall_at_best']:.4f}")
-    print(f"  Test F1 (Precision≥0.6 threshold): {test_metrics['val_f1_at_precision']:.4f}")
-    print(f"  Test Precision (Precision≥0.6 threshold): {test_metrics['val_precision_at_precision']:.4f}")
-    print(f"  Test Recall (Precision≥0.6 threshold): {test_metrics['val_recall_at_precision']:.4f}")
-    print(f"  Test Precision@10: {test_metrics['precision_at_10']:.4f}")
-    print(f"  Test Precision@20: {test_metrics['precision_at_20']:.4f}")
-    if 'alerts_per_game_at_best_threshold' in test_metrics:
-        print(f"  Test Alerts per game (F1 최대 threshold): {test_metrics['alerts_per_game_at_best_threshold']:.2f}")
-    
-    # 모델 저장
-    artifacts_dir = project_root / "artifacts"
-    artifacts_dir.mkdir(exist_ok=True)
-    
-    model_data = {
-        "model": best_model_dict["model"],
-        "scaler": best_model_dict["scaler"],
-        "feature_columns": feature_columns,
-        "threshold_f1": float(test_f1_threshold),
-        "threshold_precision": float(test_precision_threshold),
-        "window_sec": 45.0,
-        "lookahead_sec": 10.0,
-        "stride_sec": 5.0,
-        "train_games": train_games,
-        "test_games": test_games,
-        "metrics": {
-            "all_models": all_metrics,
-            "best_model": test_metrics,
-            "test_pr_auc": float(test_metrics["val_pr_auc"]),
-            "test_roc_auc": float(test_metrics["val_roc_auc"]),
-            "test_precision_at_precision_threshold": float(test_metrics["val_precision_at_precision"]),
-            "test_recall_at_precision_threshold": float(test_metrics["val_recall_at_precision"]),
-            "test_f1_at_precision_threshold": float(test_metrics["val_f1_at_precision"]),
-        },
-    }
-    
-    model_path = artifacts_dir / "will_have_shot_model.joblib"
-    joblib.dump(model_data, model_path)
-    print(f"\nSaved model to: {model_path}")
-    
-    # 메트릭 저장 (운영 지표 포함)
-    metrics_path = artifacts_dir / "will_have_shot_metrics.json"
-    with open(metrics_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "best_model": best_model_name,
-                "all_models": all_metrics,
-                "test_metrics": test_metrics,
-                "positive_ratio": float(y_test.mean()),
-                # 운영 지표 (발표용)
-                "operational_metrics": {
-                    "threshold_sweep": test_metrics.get("threshold_sweep", []),
-                    "precision_at_10": test_metrics.get("precision_at_10", 0.0),
-                    "precision_at_20": test_metrics.get("precision_at_20", 0.0),
-                    "alerts_per_game_at_best_threshold": test_metrics.get("alerts_per_game_at_best_threshold"),
-                },
-            },
-            f,
-            indent=2,
-        )
-    print(f"Saved metrics to: {metrics_path}")
+    save_best_model(
+        best_model_name,
+        best_model_dict,
+        feature_columns,
+        all_metrics,
+        test_metrics,
+        test_f1_threshold,
+        test_precision_threshold,
+        train_games,
+        test_games,
+        positive_ratio=float(y_test.mean()),
+    )
     
     print("\nTraining complete!")
 
 
 if __name__ == "__main__":
-    from sklearn.metrics import recall_score  # noqa: F401
-    
     main()
 